@@ -3,9 +3,22 @@ Analyzer module for the dashboard
 대시보드 분석 모듈
 """
 
-from .recommend_analyzer import analyze_selected_area, analyze_selected_category
+from .recommend_analyzer import (
+    analyze_selected_area,
+    analyze_selected_category,
+    load_area_demographics,
+    load_area_population,
+    load_category_demographics,
+    load_category_time_patterns,
+    load_category_ranking_page
+)
 
 __all__ = [
     'analyze_selected_area',
-    'analyze_selected_category'
+    'analyze_selected_category',
+    'load_area_demographics',
+    'load_area_population',
+    'load_category_demographics',
+    'load_category_time_patterns',
+    'load_category_ranking_page'
 ]
@@ -5,52 +5,113 @@ Recommendation analysis functions
 
 import streamlit as st
 from data.query import (
-    fetch_commercial_area_analysis,
-    fetch_business_category_analysis,
     fetch_customer_demographics,
     fetch_category_demographics,
     fetch_population_patterns,
     fetch_time_patterns,
-    fetch_category_time_patterns
+    fetch_category_time_patterns,
+    fetch_category_area_ranking
 )
+from data.planner import FetchPlan
+from data.areas import get_area_registry
+from data.context import DataContext
+from analyzer.scoring import get_score_index
+from analyzer.similarity import get_similarity_index
+from config import SIMILAR_RADIUS_KM, CATEGORY_RANKING_PAGE_SIZE
 
 
-def analyze_selected_area(area_name, df_areas):
-    """선택된 상권을 분석합니다."""
-    
-    # 상권 코드 찾기
-    area_info = df_areas[df_areas['area_name'] == area_name].iloc[0]
-    area_code = area_info['commercial_area_code']
-    
-    # 분석 데이터 로드
-    with st.spinner("분석 데이터를 불러오는 중..."):
-        # 상권별 분석 데이터
-        area_analysis = fetch_commercial_area_analysis(area_code)
-        
-        # 고객 인구통계
-        demographics = fetch_customer_demographics(area_code)
-        
-        # 인구 패턴
-        population_patterns = fetch_population_patterns(area_code)
-        
-        # 시간대별 패턴
-        time_patterns = fetch_time_patterns(area_code)
-    
-    return area_name, area_info, area_analysis, demographics, population_patterns, time_patterns
-
-
-def analyze_selected_category(category_name):
-    """선택된 업종을 분석합니다."""
-
-    # 분석 데이터 로드
-    with st.spinner("분석 데이터를 불러오는 중..."):
-        # 업종별 분석 데이터
-        category_analysis = fetch_business_category_analysis(category_name)
-        
-        # 업종별 고객 특성
-        category_demographics = fetch_category_demographics(category_name)
-        
-        # 업종별 시간대별 유동인구 패턴
-        category_time_patterns = fetch_category_time_patterns(category_name)
-    
-    return category_name, category_analysis, category_demographics, category_time_patterns
+def analyze_selected_area(area_code, ctx=None):
+    """
+    선택된 상권을 분석합니다. (메모리 색인만 사용 — 추천 업종, 유사 상권)
+    인구통계/인구 패턴은 해당 섹션을 열 때 load_area_demographics / load_area_population 으로 조회합니다.
+
+    Returns:
+        tuple: (상권명, 상권 레코드, 추천 업종, 유사 상권 {"all", "nearby"})
+    """
+    # 상권 레코드 찾기 (코드 색인, O(1))
+    area_info = get_area_registry().get(area_code)
+    area_name = area_info.name
+    area_code = area_info.code  # int (warm-up 과 같은 캐시 키)
+
+    # 추천 업종: 메모리의 점수 색인에서 상위 k 개 (SQL 없음)
+    area_analysis = get_score_index().top_categories(area_code)
+    # 유사 상권: 메모리의 특성 행렬 내적 (서울 전체 / 반경 이내)
+    similarity = get_similarity_index()
+    similar_areas = {
+        "all": similarity.similar_areas(area_code),
+        "nearby": similarity.similar_areas(area_code, radius_km=SIMILAR_RADIUS_KM),
+    }
+    return area_name, area_info, area_analysis, similar_areas
+
+
+def load_area_demographics(area_code, ctx=None):
+    """상권의 고객 인구통계를 조회합니다. (고객 인구통계 섹션용)"""
+    ctx = ctx or DataContext()
+    return ctx.resolve("demographics", fetch_customer_demographics, int(area_code), consumer="load_area_demographics")
+
+
+def load_area_population(area_code, ctx=None):
+    """
+    상권의 인구 패턴과 시간대별 패턴을 조회합니다. (인구 패턴 섹션용, 두 조회는 병렬 실행)
+
+    Returns:
+        tuple: (인구 패턴, 시간대별 패턴)
+    """
+    ctx = ctx or DataContext()
+    by = "load_area_population"
+    area_code = int(area_code)
+
+    plan = FetchPlan("area_population")
+    plan.add("population_patterns", ctx.resolve, "population_patterns", fetch_population_patterns, area_code, consumer=by)     # 인구 패턴
+    plan.add("time_patterns", ctx.resolve, "time_patterns", fetch_time_patterns, area_code, consumer=by)                       # 시간대별 패턴
+
+    with st.spinner("인구 패턴 데이터를 불러오는 중..."):
+        r = plan.run()
+    return r["population_patterns"], r["time_patterns"]
+
+
+def analyze_selected_category(category_name, ctx=None):
+    """
+    선택된 업종을 분석합니다. (메모리 점수 색인만 사용 — 추천 상권)
+    고객 특성/시간대 패턴은 해당 섹션을 열 때 load_category_demographics / load_category_time_patterns 로 조회합니다.
+
+    Returns:
+        tuple: (업종명, 추천 상권)
+    """
+    # 추천 상권: 메모리의 점수 색인에서 상위 k 개 (SQL 없음)
+    category_analysis = get_score_index().top_areas(category_name)
+    return category_name, category_analysis
+
+
+def load_category_demographics(category_name, ctx=None):
+    """업종별 고객 특성을 조회합니다. (업종별 고객 특성 섹션용)"""
+    ctx = ctx or DataContext()
+    return ctx.resolve("category_demographics", fetch_category_demographics, category_name,
+                       consumer="load_category_demographics")
+
+
+def load_category_time_patterns(category_name, ctx=None):
+    """업종 매출 상위 상권의 시간대별 유동인구를 조회합니다. (시간대별 유동인구 섹션용)"""
+    ctx = ctx or DataContext()
+    with st.spinner("시간대별 유동인구를 불러오는 중..."):
+        return ctx.resolve("category_time_patterns", fetch_category_time_patterns, category_name,
+                           consumer="load_category_time_patterns")
+
+
+def load_category_ranking_page(category_name, cursor=None, ctx=None):
+    """
+    업종의 전체 상권 순위(점포당 매출 순)를 한 페이지 조회합니다. (전체 상권 순위 섹션용)
+    다음 페이지 유무는 한 행을 더 조회해 판단합니다. (마지막 페이지가 동순위로 끝나도 정확)
+
+    Args:
+        category_name: 업종명
+        cursor: 이전 페이지 마지막 행의 (sales_rank, commercial_area_code) — None 이면 첫 페이지
+        ctx: 데이터 컨텍스트
+
+    Returns:
+        tuple: (순위 페이지 — fetch_category_area_ranking 결과 최대 CATEGORY_RANKING_PAGE_SIZE 행, 다음 페이지 유무)
+    """
+    ctx = ctx or DataContext()
+    page = ctx.resolve("category_ranking", fetch_category_area_ranking, category_name, cursor,
+                       CATEGORY_RANKING_PAGE_SIZE + 1, consumer="load_category_ranking_page")
+    return page.head(CATEGORY_RANKING_PAGE_SIZE), len(page) > CATEGORY_RANKING_PAGE_SIZE
@@ -0,0 +1,193 @@
+"""
+Multi-factor recommendation scoring
+상권 × 업종 다요인 추천 점수 (전체 조합을 한 번에 계산해 메모리에 순위 색인으로 보관)
+
+요인 (RECOMMEND_WEIGHTS):
+- avg_sales: 점포당 매출 — 업종 내 백분위
+- density: 점포 밀도(유동인구 1만 명당 점포 수) — 업종 내 백분위, 낮을수록 유리
+- floating: 유동인구 — 상권 간 백분위
+- worker_ratio: 직장인구 비중 (직장 / (상주 + 직장)) — 상권 간 백분위
+- food_expenditure: 소속 행정동 음식 지출 — 상권 간 백분위
+
+점수 = 요인 백분위의 가중 평균 × 100 (값이 없는 요인은 중간값 0.5)
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from config import CURRENT_YQ, RECOMMEND_WEIGHTS, RECOMMEND_TOP_K
+from data.cube import get_period_cube
+from data.geo import get_area_dong_index
+from data.partition import expand_quarters
+from data.query import (
+    fetch_areas_and_categories,
+    fetch_floating_by_area_2024,
+    fetch_population_ga_2024,
+    fetch_income_2024
+)
+
+FACTORS = ("avg_sales", "density", "floating", "worker_ratio", "food_expenditure")
+LOWER_IS_BETTER = {"density"}
+
+
+def _pct_rank(x: np.ndarray) -> np.ndarray:
+    """열(axis=0) 단위 백분위 순위 (0~1, 동점 평균, NaN 유지)"""
+    return pd.DataFrame(x).rank(axis=0, pct=True, method="average").to_numpy()
+
+
+class ScoreIndex:
+    """
+    상권 × 업종 추천 점수와 순위 색인.
+
+    Attributes:
+        area_codes: 상권 코드 축 (매출 큐브와 동일)
+        categories: 업종명 축
+        features: {요인명: (A, C) 원값}
+        scores: 추천 점수 (A, C), 점포/매출이 없는 조합은 NaN
+        area_order: 업종별 상권 순위 (C, A) — 점수 내림차순 상권 인덱스
+        cat_order: 상권별 업종 순위 (A, C) — 점수 내림차순 업종 인덱스
+    """
+
+    def __init__(self, cube, sales, stores, present, area_features: pd.DataFrame, weights=RECOMMEND_WEIGHTS):
+        self.area_codes = cube.area_codes
+        self.categories = list(cube.categories)
+        self.area_index = cube.area_index
+        self.cat_index = cube.cat_index
+        self.areas = cube.areas
+        self.sales = sales
+        self.stores = stores
+        self.present = present
+
+        f = area_features.reindex(self.area_codes)
+        floating = f["floating"].to_numpy(dtype=float)
+        n_cats = len(self.categories)
+
+        # --- (A, C) 요인 행렬 ---
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_sales = np.where(present & (stores > 0), sales / stores, np.nan)
+            density = np.where(present, stores / (floating[:, None] / 10_000), np.nan)
+        density[~np.isfinite(density)] = np.nan
+        self.features = {
+            "avg_sales": avg_sales,
+            "density": density,
+            "floating": np.repeat(floating[:, None], n_cats, axis=1),
+            "worker_ratio": np.repeat(f["worker_ratio"].to_numpy(dtype=float)[:, None], n_cats, axis=1),
+            "food_expenditure": np.repeat(f["food_expenditure"].to_numpy(dtype=float)[:, None], n_cats, axis=1),
+        }
+
+        # --- 백분위 → 가중 평균 (전 조합 한 번에) ---
+        total_w = sum(weights.get(k, 0) for k in FACTORS) or 1.0
+        score = np.zeros(present.shape)
+        for k in FACTORS:
+            w = weights.get(k, 0)
+            if not w:
+                continue
+            x = np.where(present, self.features[k], np.nan)  # 업종별로 실제 점포가 있는 상권끼리 비교
+            p = _pct_rank(x)
+            if k in LOWER_IS_BETTER:
+                p = 1.0 - p
+            score += w * np.nan_to_num(p, nan=0.5)
+        self.scores = np.where(present, 100.0 * score / total_w, np.nan)
+
+        # --- 순위 색인 (NaN 은 마지막) ---
+        keyed = np.where(present, -self.scores, np.inf)
+        self.area_order = np.argsort(keyed, axis=0, kind="stable").T
+        self.cat_order = np.argsort(keyed, axis=1, kind="stable")
+        self.n_areas_per_cat = present.sum(axis=0)
+        self.n_cats_per_area = present.sum(axis=1)
+
+    def top_categories(self, area_code, k: int = RECOMMEND_TOP_K) -> pd.DataFrame:
+        """
+        상권의 추천 업종 상위 k 개를 반환합니다.
+
+        Args:
+            area_code: 상권 코드
+            k: 개수
+
+        Returns:
+            pd.DataFrame: commercial_area_name, service_category_name, total_sales, shop_count, avg_sales, score
+        """
+        ai = self.area_index.get(int(area_code))
+        if ai is None:
+            return pd.DataFrame(columns=["commercial_area_name", "service_category_name", "total_sales",
+                                         "shop_count", "avg_sales", "score"])
+        ci = self.cat_order[ai, :min(k, self.n_cats_per_area[ai])]
+        return pd.DataFrame({
+            "commercial_area_name": self.areas.at[ai, "area_name"],
+            "service_category_name": np.array(self.categories, dtype=object)[ci],
+            "total_sales": self.sales[ai, ci],
+            "shop_count": self.stores[ai, ci],
+            "avg_sales": np.nan_to_num(self.features["avg_sales"][ai, ci]).astype(np.int64),
+            "score": self.scores[ai, ci].round(1),
+        })
+
+    def top_areas(self, category_name, k: int = RECOMMEND_TOP_K) -> pd.DataFrame:
+        """
+        업종의 추천 상권 상위 k 개를 반환합니다.
+
+        Args:
+            category_name: 업종명
+            k: 개수
+
+        Returns:
+            pd.DataFrame: commercial_area_code, commercial_area_name, gu, dong, service_category_name,
+                total_sales, shop_count, avg_sales, score
+        """
+        ci = self.cat_index.get(category_name)
+        if ci is None:
+            return pd.DataFrame(columns=["commercial_area_code", "commercial_area_name", "gu", "dong",
+                                         "service_category_name", "total_sales", "shop_count", "avg_sales", "score"])
+        ai = self.area_order[ci, :min(k, self.n_areas_per_cat[ci])]
+        areas = self.areas.iloc[ai]
+        return pd.DataFrame({
+            "commercial_area_code": self.area_codes[ai],
+            "commercial_area_name": areas["area_name"].to_numpy(),
+            "gu": areas["gu"].to_numpy(),
+            "dong": areas["dong"].to_numpy(),
+            "service_category_name": category_name,
+            "total_sales": self.sales[ai, ci],
+            "shop_count": self.stores[ai, ci],
+            "avg_sales": np.nan_to_num(self.features["avg_sales"][ai, ci]).astype(np.int64),
+            "score": self.scores[ai, ci].round(1),
+        })
+
+
+def build_area_features(quarters=CURRENT_YQ) -> pd.DataFrame:
+    """
+    상권 단위 요인(유동인구, 직장인구 비중, 소속 동 음식 지출)을 만듭니다.
+
+    Returns:
+        pd.DataFrame: index=commercial_area_code, columns=floating, worker_ratio, food_expenditure
+    """
+    df_areas, _ = fetch_areas_and_categories()
+    fpop = fetch_floating_by_area_2024(None, quarters=quarters)
+    pga = fetch_population_ga_2024(None, quarters=quarters)
+    income = fetch_income_2024(quarters=quarters)
+
+    f = df_areas[["commercial_area_code"]].copy()
+    # 소속 동은 좌표 공간 조인 결과 (DB dong_code 가 비었거나 오래된 상권 보정)
+    f["dong_code"] = f["commercial_area_code"].map(get_area_dong_index().areas["dong_code"])
+    f = f.merge(fpop[["commercial_area_code", "male", "female"]], on="commercial_area_code", how="left")
+    f = f.merge(pga[["commercial_area_code", "resident", "worker"]], on="commercial_area_code", how="left")
+    f = f.merge(income[["dong_code", "food_expenditure"]], on="dong_code", how="left")
+
+    f["floating"] = f["male"] + f["female"]
+    pop = f["resident"] + f["worker"]
+    f["worker_ratio"] = (f["worker"] / pop.where(pop > 0)).astype(float)
+    return f.set_index("commercial_area_code")[["floating", "worker_ratio", "food_expenditure"]]
+
+
+@st.cache_resource(show_spinner=False)
+def get_score_index(quarters=CURRENT_YQ) -> ScoreIndex:
+    """
+    추천 점수 색인을 프로세스당 한 번 생성합니다.
+
+    Args:
+        quarters: 분기 범위 (시작, 끝)
+
+    Returns:
+        ScoreIndex: 추천 점수 색인
+    """
+    cube = get_period_cube(quarters)
+    sales, stores, present = cube.period(expand_quarters(quarters))
+    return ScoreIndex(cube, sales, stores, present, build_area_features(quarters))
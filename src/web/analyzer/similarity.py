@@ -0,0 +1,169 @@
+"""
+Similar commercial areas
+상권 특성 벡터 기반 유사 상권 검색 (정규화 행렬을 한 번 만들어 메모리에서 내적으로 조회)
+
+특성 블록 (SIMILAR_FEATURE_WEIGHTS):
+- day: 요일별 유동인구 비중 (7)
+- time: 시간대별 유동인구 비중 (6)
+- gender: 남성 유동인구 비중 (1)
+- population: 상주/직장 인구 (log 스케일, 2)
+- sales_mix: 외식 업종별 매출 비중 (업종 수)
+
+각 열을 표준화한 뒤 블록마다 가중치 / 열 수 로 배율을 맞춰(열이 많은 블록이 지배하지 않도록)
+행을 단위 벡터로 정규화합니다. 유사도 = 코사인 유사도(-1~1)를 (s + 1) / 2 로 옮긴 0~100 점
+(50 = 무관, 100 = 같은 방향).
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from config import (
+    CURRENT_YQ, DAY_COLUMNS, TIME_PERIODS,
+    SIMILAR_FEATURE_WEIGHTS, SIMILAR_TOP_K
+)
+from data.cube import get_period_cube
+from data.partition import expand_quarters
+from data.query import fetch_areas_and_categories, fetch_floating_by_area_2024, fetch_population_ga_2024
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def build_feature_blocks(quarters=CURRENT_YQ) -> tuple[pd.DataFrame, dict]:
+    """
+    상권별 특성 원값을 블록 단위로 만듭니다.
+
+    Args:
+        quarters: 분기 범위 (시작, 끝)
+
+    Returns:
+        tuple: (상권 정보 — commercial_area_code, area_name, gu, dong, lat, lon,
+                {블록명: (A, d) 원값 배열 — 값 없음 NaN})
+    """
+    df_areas, _ = fetch_areas_and_categories()
+    areas = df_areas.drop_duplicates("commercial_area_code").reset_index(drop=True)
+    codes = areas["commercial_area_code"]
+
+    fpop = fetch_floating_by_area_2024(None, quarters=quarters).set_index("commercial_area_code").reindex(codes)
+    pga = fetch_population_ga_2024(None, quarters=quarters).set_index("commercial_area_code").reindex(codes)
+
+    def shares(frame: pd.DataFrame) -> np.ndarray:
+        x = frame.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        total = x.sum(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(total > 0, x / total, np.nan)
+
+    cube = get_period_cube(quarters)
+    sales, _, _ = cube.period(expand_quarters(quarters))
+    ai = np.array([cube.area_index.get(int(c), -1) for c in codes])
+    mix = np.full((len(codes), len(cube.categories)), np.nan)
+    mix[ai >= 0] = sales[ai[ai >= 0]]
+
+    blocks = {
+        "day": shares(fpop[DAY_COLUMNS]),
+        "time": shares(fpop[TIME_PERIODS]),
+        "gender": shares(fpop[["male", "female"]])[:, :1],
+        "population": np.log1p(pga[["resident", "worker"]].apply(pd.to_numeric, errors="coerce")
+                               .clip(lower=0).to_numpy(dtype=float)),
+        "sales_mix": shares(pd.DataFrame(mix)),
+    }
+    info = areas[["commercial_area_code", "area_name", "gu", "dong"]].copy()
+    info["lat"] = pd.to_numeric(areas["lat"], errors="coerce")
+    info["lon"] = pd.to_numeric(areas["lon"], errors="coerce")
+    return info, blocks
+
+
+class SimilarityIndex:
+    """
+    상권 유사도 색인.
+
+    Attributes:
+        areas: 상권 정보 (commercial_area_code, area_name, gu, dong, lat, lon)
+        area_index: {상권 코드: 행 위치}
+        matrix: 단위 행 벡터 행렬 (A, d), float32
+        valid: 특성이 하나라도 있는 상권 (A,)
+        coords: 위도/경도 라디안 (A, 2)
+    """
+
+    def __init__(self, areas: pd.DataFrame, blocks: dict, weights=SIMILAR_FEATURE_WEIGHTS):
+        self.areas = areas.reset_index(drop=True)
+        self.area_codes = self.areas["commercial_area_code"].to_numpy(dtype=np.int64)
+        self.area_index = {int(c): i for i, c in enumerate(self.area_codes)}
+
+        # --- 열 표준화 → 블록 배율 → 결측 0 (평균) ---
+        cols = []
+        for name, x in blocks.items():
+            w = weights.get(name, 0)
+            if not w or x.shape[1] == 0:
+                continue
+            with np.errstate(invalid="ignore"):
+                mean, std = np.nanmean(x, axis=0), np.nanstd(x, axis=0)
+            std = np.where(np.isfinite(std) & (std > 0), std, 1.0)
+            z = (x - np.nan_to_num(mean)) / std
+            cols.append(np.nan_to_num(z, nan=0.0) * np.sqrt(w / x.shape[1]))
+        m = np.hstack(cols) if cols else np.zeros((len(self.areas), 0))
+
+        # --- 행 정규화 (코사인 유사도 = 내적) ---
+        norm = np.linalg.norm(m, axis=1, keepdims=True)
+        self.valid = norm[:, 0] > 0
+        self.matrix = np.divide(m, norm, out=np.zeros_like(m), where=norm > 0).astype(np.float32)
+        self.coords = np.radians(self.areas[["lat", "lon"]].to_numpy(dtype=float))
+
+    def distances_km(self, ai: int) -> np.ndarray:
+        """기준 상권에서 모든 상권까지의 대원 거리 (km, 좌표 없으면 NaN)"""
+        lat0, lon0 = self.coords[ai]
+        lat, lon = self.coords[:, 0], self.coords[:, 1]
+        a = np.sin((lat - lat0) / 2) ** 2 + np.cos(lat0) * np.cos(lat) * np.sin((lon - lon0) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+    def similar_areas(self, area_code, k: int = SIMILAR_TOP_K, radius_km: float | None = None) -> pd.DataFrame:
+        """
+        특성이 가장 비슷한 상권 상위 k 개를 반환합니다. (기준 상권 제외)
+
+        Args:
+            area_code: 기준 상권 코드
+            k: 개수
+            radius_km: 기준 상권 반경 제한 (km, None 이면 서울 전체)
+
+        Returns:
+            pd.DataFrame: commercial_area_code, commercial_area_name, gu, dong,
+                similarity (0~100), distance_km
+        """
+        ai = self.area_index.get(int(area_code))
+        if ai is None or not self.valid[ai]:
+            return pd.DataFrame(columns=["commercial_area_code", "commercial_area_name", "gu", "dong",
+                                         "similarity", "distance_km"])
+        sims = self.matrix @ self.matrix[ai]
+        dist = self.distances_km(ai)
+        mask = self.valid.copy()
+        mask[ai] = False
+        if radius_km is not None:
+            mask &= dist <= radius_km
+
+        cand = np.flatnonzero(mask)
+        if len(cand) > k > 0:
+            cand = cand[np.argpartition(-sims[cand], k - 1)[:k]]
+        top = cand[np.argsort(-sims[cand], kind="stable")][:max(k, 0)]
+        areas = self.areas.iloc[top]
+        return pd.DataFrame({
+            "commercial_area_code": self.area_codes[top],
+            "commercial_area_name": areas["area_name"].to_numpy(),
+            "gu": areas["gu"].to_numpy(),
+            "dong": areas["dong"].to_numpy(),
+            "similarity": (50.0 * (sims[top].astype(float) + 1.0)).clip(0, 100).round(1),
+            "distance_km": dist[top].round(2),
+        })
+
+
+@st.cache_resource(show_spinner=False)
+def get_similarity_index(quarters=CURRENT_YQ) -> SimilarityIndex:
+    """
+    유사 상권 색인을 프로세스당 한 번 생성합니다.
+
+    Args:
+        quarters: 분기 범위 (시작, 끝)
+
+    Returns:
+        SimilarityIndex: 유사 상권 색인
+    """
+    areas, blocks = build_feature_blocks(quarters)
+    return SimilarityIndex(areas, blocks)
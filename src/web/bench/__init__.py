@@ -0,0 +1,4 @@
+"""
+Benchmarks for the dashboard data and chart layers
+대시보드 데이터/차트 계층 벤치마크
+"""
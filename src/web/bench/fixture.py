@@ -0,0 +1,182 @@
+"""
+Benchmark fixture database
+프로젝트 스키마와 서울시 규모의 행 수를 갖는 SQLite 벤치마크 DB 생성
+
+scale=1 은 실제 서울시 데이터 규모(상권 1,650개, 행정동 424개, 서비스 업종 100종, 4개 분기)이며,
+scale 배수만큼 상권/행정동 수를 늘립니다. 값은 재현 가능한 난수입니다.
+
+사용법 (src/web 에서 실행):
+    python -m bench.fixture --scale 1 --out bench_x1.db
+"""
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+import numpy as np
+from config import FOOD10, ALL_YQ
+from data.partition import expand_quarters
+from data.migrations import all_indexes, index_ddl
+
+# 서울시 1배 규모
+BASE_AREAS = 1650
+BASE_DONGS = 424
+N_CATEGORIES = 100
+SHOP_DENSITY = 0.6  # 상권 × 업종 조합 중 점포가 있는 비율
+GU_NAMES = [
+    "종로구", "중구", "용산구", "성동구", "광진구", "동대문구", "중랑구", "성북구", "강북구", "도봉구",
+    "노원구", "은평구", "서대문구", "마포구", "양천구", "강서구", "구로구", "금천구", "영등포구", "동작구",
+    "관악구", "서초구", "강남구", "송파구", "강동구",
+]
+AGE_GROUPS = ["10", "20", "30", "40", "50", "60"]
+CHUNK_AREAS = 2000
+_FPOP_COLS = [
+    "mon_pop", "tue_pop", "wed_pop", "thu_pop", "fri_pop", "sat_pop", "sun_pop",
+    "t00_06_pop", "t06_11_pop", "t11_14_pop", "t14_17_pop", "t17_21_pop", "t21_24_pop",
+    "male_pop", "female_pop",
+]
+_PGA_KEYS = [(t, s) for t in ("RESIDENT", "WORKING") for s in ("M", "F")]
+
+SCHEMA = """
+CREATE TABLE Dong(code INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE Commercial_Area(code INTEGER PRIMARY KEY, name TEXT, gu TEXT, dong TEXT, dong_code INTEGER,
+                             lon REAL, lat REAL);
+CREATE TABLE Service_Category(code TEXT PRIMARY KEY, name TEXT);
+CREATE TABLE Shop_Count(id INTEGER PRIMARY KEY, year_quarter INTEGER, commercial_area_code INTEGER,
+                        service_category_code TEXT, shop_count INTEGER, similar_shop_count INTEGER);
+CREATE TABLE Sales_Daytype(id INTEGER PRIMARY KEY, store_id INTEGER, day_type TEXT, sales INTEGER);
+CREATE TABLE Sales_Sex(id INTEGER PRIMARY KEY, store_id INTEGER, sex TEXT, sales INTEGER);
+CREATE TABLE Sales_Age(id INTEGER PRIMARY KEY, store_id INTEGER, age TEXT, sales INTEGER);
+CREATE TABLE Floating_Population(id INTEGER PRIMARY KEY, year_quarter INTEGER, commercial_area_code INTEGER,
+    mon_pop REAL, tue_pop REAL, wed_pop REAL, thu_pop REAL, fri_pop REAL, sat_pop REAL, sun_pop REAL,
+    t00_06_pop REAL, t06_11_pop REAL, t11_14_pop REAL, t14_17_pop REAL, t17_21_pop REAL, t21_24_pop REAL,
+    male_pop REAL, female_pop REAL);
+CREATE TABLE Population_GA(id INTEGER PRIMARY KEY, year_quarter INTEGER, commercial_area_code INTEGER,
+                           pop_type TEXT, sex TEXT, population INTEGER);
+CREATE TABLE Income(id INTEGER PRIMARY KEY, year_quarter INTEGER, dong_code INTEGER,
+                    total_expenditure INTEGER, food_expenditure INTEGER);
+"""
+
+
+def _category_rows() -> list[tuple]:
+    """외식 10종 + 기타 서비스 업종"""
+    rows = [(f"CS1000{i + 1:02d}", name) for i, name in enumerate(FOOD10)]
+    rows += [(f"CS2{i:05d}", f"기타업종{i:02d}") for i in range(N_CATEGORIES - len(FOOD10))]
+    return rows
+
+
+def build_fixture(path, scale: float = 1.0, seed: int = 0) -> dict:
+    """
+    벤치마크용 SQLite DB 를 생성합니다.
+
+    Args:
+        path: 출력 파일 경로 (이미 있으면 덮어씀)
+        scale: 서울시 대비 배수
+        seed: 난수 시드
+
+    Returns:
+        dict: {테이블명: 행 수}
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    rng = np.random.default_rng(seed)
+    quarters = expand_quarters(ALL_YQ)
+    n_areas = max(1, int(BASE_AREAS * scale))
+    n_dongs = max(1, int(BASE_DONGS * scale))
+
+    con = sqlite3.connect(path)
+    con.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF;" + SCHEMA)
+
+    categories = _category_rows()
+    con.executemany("INSERT INTO Service_Category VALUES(?, ?)", categories)
+    cat_codes = np.array([c for c, _ in categories], dtype=object)
+
+    dong_codes = 11000000 + np.arange(n_dongs) * 10
+    dong_gu = np.array(GU_NAMES, dtype=object)[np.arange(n_dongs) % len(GU_NAMES)]
+    dong_names = np.array([f"동{i:04d}" for i in range(n_dongs)], dtype=object)
+    con.executemany("INSERT INTO Dong VALUES(?, ?)", zip(dong_codes.tolist(), dong_names.tolist()))
+
+    store_id = 0
+    for start in range(0, n_areas, CHUNK_AREAS):
+        codes = 3110000 + np.arange(start, min(start + CHUNK_AREAS, n_areas))
+        n = len(codes)
+        di = rng.integers(0, n_dongs, n)
+        con.executemany(
+            "INSERT INTO Commercial_Area VALUES(?, ?, ?, ?, ?, ?, ?)",
+            zip(codes.tolist(), [f"상권{c}" for c in codes.tolist()], dong_gu[di].tolist(),
+                dong_names[di].tolist(), dong_codes[di].tolist(),
+                rng.uniform(126.8, 127.2, n).round(6).tolist(), rng.uniform(37.45, 37.70, n).round(6).tolist())
+        )
+
+        for yq in quarters:
+            # 유동인구 (요일 7 + 시간대 6 + 성별 2)
+            pops = rng.integers(1_000, 200_000, (n, 15)).astype(float)
+            con.executemany(
+                f"INSERT INTO Floating_Population(year_quarter, commercial_area_code, {', '.join(_FPOP_COLS)}) "
+                f"VALUES({', '.join('?' * (len(_FPOP_COLS) + 2))})",
+                ((yq, c, *p) for c, p in zip(codes.tolist(), pops.tolist()))
+            )
+            # 상주/직장 인구 (유형 2 × 성별 2)
+            pga_vals = rng.integers(100, 20_000, (n, len(_PGA_KEYS))).tolist()
+            pga = [(yq, c, t, s, v[k]) for c, v in zip(codes.tolist(), pga_vals) for k, (t, s) in enumerate(_PGA_KEYS)]
+            con.executemany("INSERT INTO Population_GA(year_quarter, commercial_area_code, pop_type, sex, population) "
+                            "VALUES(?, ?, ?, ?, ?)", pga)
+
+            # 점포 수: 상권 × 업종 중 SHOP_DENSITY 비율
+            ai, ci = np.nonzero(rng.random((n, len(cat_codes))) < SHOP_DENSITY)
+            m = len(ai)
+            ids = np.arange(store_id + 1, store_id + m + 1)
+            store_id += m
+            shops = rng.integers(0, 60, m)
+            con.executemany(
+                "INSERT INTO Shop_Count VALUES(?, ?, ?, ?, ?, ?)",
+                zip(ids.tolist(), [yq] * m, codes[ai].tolist(), cat_codes[ci].tolist(),
+                    shops.tolist(), (shops + rng.integers(0, 10, m)).tolist())
+            )
+            base = rng.lognormal(18, 1.2, m)
+            ids_l = ids.tolist()
+            con.executemany("INSERT INTO Sales_Daytype(store_id, day_type, sales) VALUES(?, ?, ?)",
+                            ((i, d, int(b * w)) for d, w in (("WEEKDAY", 0.7), ("WEEKEND", 0.3))
+                             for i, b in zip(ids_l, base.tolist())))
+            con.executemany("INSERT INTO Sales_Sex(store_id, sex, sales) VALUES(?, ?, ?)",
+                            ((i, s, int(b * w)) for s, w in (("M", 0.52), ("F", 0.48))
+                             for i, b in zip(ids_l, base.tolist())))
+            age_w = rng.dirichlet(np.ones(len(AGE_GROUPS)), m)
+            con.executemany("INSERT INTO Sales_Age(store_id, age, sales) VALUES(?, ?, ?)",
+                            ((i, a, int(b * w[k])) for k, a in enumerate(AGE_GROUPS)
+                             for i, b, w in zip(ids_l, base.tolist(), age_w.tolist())))
+
+    income = [(yq, d, int(t), int(t * f)) for yq in quarters
+              for d, t, f in zip(dong_codes.tolist(), rng.integers(10**9, 10**11, n_dongs).tolist(),
+                                 rng.uniform(0.1, 0.3, n_dongs).tolist())]
+    con.executemany("INSERT INTO Income(year_quarter, dong_code, total_expenditure, food_expenditure) "
+                    "VALUES(?, ?, ?, ?)", income)
+
+    for index, (table, columns) in all_indexes().items():
+        con.execute(index_ddl(index, table, columns))
+    con.commit()
+    tables = [r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    counts = {t: con.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in tables}
+    con.close()
+    return counts
+
+
+def main(argv=None):
+    """fixture 생성 CLI 진입점"""
+    parser = argparse.ArgumentParser(description="벤치마크 fixture DB 생성")
+    parser.add_argument("--scale", type=float, default=1.0, help="서울시 대비 배수")
+    parser.add_argument("--out", required=True, help="출력 SQLite 파일")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    counts = build_fixture(args.out, args.scale, args.seed)
+    for t, n in counts.items():
+        print(f"{t:<20} {n:>12,}")
+    print(f"✅ fixture 생성 완료: {args.out} ({time.perf_counter() - t0:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
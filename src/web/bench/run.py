@@ -0,0 +1,243 @@
+"""
+Benchmark runner for the data and chart layers
+데이터/차트 계층 벤치마크 — fetch_*, prepare_sales_data, load_geojson, 차트 생성 함수의
+p50/p95 지연 시간과 최대 메모리 측정
+
+scale 마다 fixture DB(bench.fixture)를 만들고, 별도 프로세스에서 해당 DB 를 DB_URL 로 지정해 실행합니다.
+기본은 cold 측정(매 반복 전 st.cache_data 와 차트 스펙 캐시 비움)이며 --warm 은 캐시 hit 경로를 측정합니다.
+매출 큐브와 분기별 인구통계 집계는 프로세스당 한 번 만드는 자원이므로 build_* 항목으로 따로 측정합니다.
+
+사용법 (src/web 에서 실행):
+    python -m bench.run --scale 1 10 100 [--repeat 5] [--only fetch_sales] [--warm] [--csv out.csv]
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_DB_DIR = Path(__file__).parent.parent.parent / "data" / "bench"
+CATEGORY = "한식음식점"
+
+
+def build_cases():
+    """
+    측정 대상 목록을 만듭니다. (DB_URL 이 fixture 로 설정된 프로세스에서 호출)
+
+    Returns:
+        list[tuple]: (그룹, 이름, 호출 함수)
+    """
+    from config import FOOD10, CURRENT_YQ, GEOJSON_PATH
+    from data import query as q
+    from data import prepare_sales_data
+    from data.cube import get_sales_cube
+    from utils import load_geojson
+    from data.geo import get_area_dong_index
+    from charts import create_sales_comparison_chart, create_population_chart, create_expenditure_chart
+    from charts.choropleth import create_dong_choropleth
+    from charts.population import create_gender_day_chart, create_time_population_chart as create_fpop_time_chart
+    from ui import recommend_ui as rui
+    from analyzer.scoring import get_score_index
+    from analyzer.similarity import get_similarity_index
+    from data.demographics import get_demographic_aggregates, clear_demographic_aggregates
+    from data.areas import get_area_registry, get_area_search_index
+    from data.reference import get_reference_data
+
+    # 입력 데이터 준비 (측정 제외)
+    df_areas, categories = q.fetch_areas_and_categories()
+    cube = get_sales_cube()
+    area = int(cube.area_totals(FOOD10).nlargest(1, "sales_sum_2024")["commercial_area_code"].iloc[0])
+    df_sales_all = q.fetch_sales_2024(None, FOOD10)
+    df_sales_area = q.fetch_sales_2024([area], FOOD10)
+    df_fpop = q.fetch_floating_by_area_2024(None)
+    df_pga = q.fetch_population_ga_2024(None)
+    df_income = q.fetch_income_2024()
+    demographics = q.fetch_customer_demographics(area)
+    patterns = q.fetch_population_patterns(area)
+    time_patterns = q.fetch_time_patterns(area)
+    gender_sales = demographics.groupby("sex")["sales_by_gender"].sum()
+    age_sales = demographics.groupby("age")["sales_by_age"].sum()
+    first_page = q.fetch_category_area_ranking(CATEGORY)
+    page2_cursor = tuple(first_page[["sales_rank", "commercial_area_code"]].iloc[-1]) if len(first_page) else None
+
+    cases = [
+        ("cube", "build_sales_cube", lambda: get_sales_cube.clear() or get_sales_cube()),
+        ("cube", "build_demographic_aggregates",
+         lambda: clear_demographic_aggregates() or get_demographic_aggregates(CURRENT_YQ[1])),
+        ("scoring", "build_score_index", lambda: get_score_index.clear() or get_score_index()),
+        ("scoring", "score_index.top_categories", lambda: get_score_index().top_categories(area)),
+        ("scoring", "score_index.top_areas", lambda: get_score_index().top_areas(CATEGORY)),
+        ("scoring", "build_similarity_index", lambda: get_similarity_index.clear() or get_similarity_index()),
+        ("scoring", "similarity_index.similar_areas", lambda: get_similarity_index().similar_areas(area)),
+        ("scoring", "similarity_index.similar_areas[radius]",
+         lambda: get_similarity_index().similar_areas(area, radius_km=3.0)),
+        ("fetch", "fetch_areas_and_categories", q.fetch_areas_and_categories),
+        ("reference", "build_reference_data", lambda: get_reference_data.clear() or get_reference_data()),
+        ("areas", "build_area_registry", lambda: get_area_registry.clear() or get_area_registry()),
+        ("areas", "area_registry.labels[all]",
+         lambda: [get_area_registry().label_of(c) for c in get_area_registry().codes.tolist()]),
+        ("areas", "build_area_search_index", lambda: get_area_search_index.clear() or get_area_search_index()),
+        ("areas", "area_search_index.search[prefix]", lambda: get_area_search_index().search("강남")),
+        ("areas", "area_search_index.search[chosung]", lambda: get_area_search_index().search("ㄱ")),
+        ("fetch", "fetch_sales_2024[all]", lambda: q.fetch_sales_2024(None, FOOD10)),
+        ("fetch", "fetch_sales_2024[area]", lambda: q.fetch_sales_2024([area], FOOD10)),
+        ("fetch", "fetch_floating_by_area_2024", lambda: q.fetch_floating_by_area_2024(None)),
+        ("fetch", "fetch_population_ga_2024", lambda: q.fetch_population_ga_2024(None)),
+        ("fetch", "fetch_income_2024", q.fetch_income_2024),
+        ("fetch", "fetch_dong_map_for_areas", q.fetch_dong_map_for_areas),
+        ("fetch", "fetch_commercial_area_analysis", lambda: q.fetch_commercial_area_analysis(area)),
+        ("fetch", "fetch_business_category_analysis", lambda: q.fetch_business_category_analysis(CATEGORY)),
+        ("fetch", "fetch_category_area_ranking[page2]",
+         lambda: q.fetch_category_area_ranking(CATEGORY, page2_cursor, 50)),
+        ("fetch", "fetch_customer_demographics", lambda: q.fetch_customer_demographics(area)),
+        ("fetch", "fetch_category_demographics", lambda: q.fetch_category_demographics(CATEGORY)),
+        ("fetch", "fetch_population_patterns", lambda: q.fetch_population_patterns(area)),
+        ("fetch", "fetch_time_patterns", lambda: q.fetch_time_patterns(area)),
+        ("fetch", "fetch_category_time_patterns", lambda: q.fetch_category_time_patterns(CATEGORY)),
+        ("prepare", "prepare_sales_data[all]", lambda: prepare_sales_data(df_sales_all, df_areas, [])),
+        ("prepare", "prepare_sales_data[area]", lambda: prepare_sales_data(df_sales_area, df_areas, [area])),
+        ("chart", "create_sales_comparison_chart[area]",
+         lambda: create_sales_comparison_chart([area], FOOD10, categories)),
+        ("chart", "create_sales_comparison_chart[category]",
+         lambda: create_sales_comparison_chart([], [CATEGORY], categories)),
+        ("chart", "create_population_chart", lambda: create_population_chart(df_pga, [], df_sales_all)),
+        ("chart", "create_gender_day_chart", lambda: create_gender_day_chart(df_fpop, [], df_sales_all)),
+        ("chart", "create_time_population_chart", lambda: create_fpop_time_chart(df_fpop, [area])),
+        ("chart", "create_expenditure_chart", lambda: create_expenditure_chart(df_income, [area], df_areas)),
+        ("chart", "recommend_ui.create_gender_sales_chart", lambda: rui.create_gender_sales_chart(gender_sales)),
+        ("chart", "recommend_ui.create_age_sales_chart", lambda: rui.create_age_sales_chart(age_sales)),
+        ("chart", "recommend_ui.create_gender_population_chart",
+         lambda: rui.create_gender_population_chart(patterns[["male", "female"]].iloc[0])),
+        ("chart", "recommend_ui.create_day_pattern_chart",
+         lambda: rui.create_day_pattern_chart(patterns[["mon", "tue", "wed", "thu", "fri", "sat", "sun"]].iloc[0])),
+        ("chart", "recommend_ui.create_time_population_chart",
+         lambda: rui.create_time_population_chart(time_patterns)),
+    ]
+    if Path(GEOJSON_PATH).is_file():
+        cases.append(("geo", "load_geojson", lambda: load_geojson(str(GEOJSON_PATH))))
+        cases.append(("geo", "load_geojson[low]", lambda: load_geojson(str(GEOJSON_PATH), "low")))
+        cases.append(("geo", "build_area_dong_index", lambda: get_area_dong_index.clear() or get_area_dong_index()))
+        cases.append(("chart", "create_dong_choropleth",
+                      lambda: create_dong_choropleth.clear() or create_dong_choropleth()))
+    return cases
+
+
+def measure(fn, repeat: int, warm: bool) -> dict:
+    """
+    한 항목의 지연 시간 분포와 최대 메모리를 측정합니다.
+    시간은 tracemalloc 없이, 메모리는 별도 1회 실행에서 측정합니다.
+
+    Returns:
+        dict: p50_ms, p95_ms, mean_ms, peak_mb
+    """
+    import streamlit as st
+    from charts.figure_cache import get_figure_cache
+
+    def _prepare():
+        if not warm:
+            st.cache_data.clear()
+            get_figure_cache().clear()
+        gc.collect()
+
+    fn()  # 연결/임포트 등 1회성 비용 제외
+    times = []
+    for _ in range(repeat):
+        _prepare()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+
+    _prepare()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    ms = np.array(times) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "mean_ms": round(float(ms.mean()), 2),
+        "peak_mb": round(peak / 1024 / 1024, 2),
+    }
+
+
+def run_suite(repeat: int, warm: bool, only: list[str]) -> list[dict]:
+    """현재 프로세스의 DB 로 모든 항목을 측정합니다."""
+    results = []
+    for group, name, fn in build_cases():
+        if only and not any(o in name for o in only):
+            continue
+        results.append({"group": group, "name": name, **measure(fn, repeat, warm)})
+    return results
+
+
+def _child_env(db_path: Path) -> dict:
+    """fixture DB 를 쓰도록 설정한 자식 프로세스 환경변수"""
+    env = dict(os.environ)
+    env.update({
+        "DB_URL": f"sqlite:///{db_path}",
+        "DATA_BACKEND": "db",
+        "RESULT_CACHE_ENABLED": "0",   # 디스크 공유 캐시는 측정에서 제외
+        "WARMUP_ON_START": "0",
+        "METRICS_EXPORT_PATH": "",
+        "STREAMLIT_LOGGER_LEVEL": "error",
+    })
+    return env
+
+
+def main(argv=None):
+    """벤치마크 CLI 진입점"""
+    parser = argparse.ArgumentParser(description="데이터/차트 계층 벤치마크")
+    parser.add_argument("--scale", type=float, nargs="+", default=[1.0], help="서울시 대비 배수 (예: 1 10 100)")
+    parser.add_argument("--repeat", type=int, default=5, help="항목별 반복 횟수")
+    parser.add_argument("--only", nargs="*", default=[], help="이름에 포함된 문자열로 항목 필터")
+    parser.add_argument("--warm", action="store_true", help="캐시를 비우지 않고 측정 (cache hit 경로)")
+    parser.add_argument("--db-dir", default=str(DEFAULT_DB_DIR), help="fixture DB 저장 디렉터리")
+    parser.add_argument("--rebuild", action="store_true", help="fixture DB 를 다시 생성")
+    parser.add_argument("--csv", help="결과 CSV 저장 경로")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        # 자식 프로세스: 결과를 JSON 으로 출력
+        print(json.dumps(run_suite(args.repeat, args.warm, args.only), ensure_ascii=False))
+        return
+
+    os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+    from bench.fixture import build_fixture
+
+    rows = []
+    for scale in args.scale:
+        db_path = Path(args.db_dir) / f"fixture_x{scale:g}.db"
+        if args.rebuild or not db_path.is_file():
+            print(f"🏗️  fixture 생성 중: {db_path}")
+            build_fixture(db_path, scale)
+        cmd = [sys.executable, "-m", "bench.run", "--child", "--repeat", str(args.repeat)]
+        cmd += ["--warm"] if args.warm else []
+        cmd += ["--only", *args.only] if args.only else []
+        out = subprocess.run(cmd, env=_child_env(db_path.resolve()), cwd=Path(__file__).parent.parent,
+                             capture_output=True, text=True, check=True)
+        for r in json.loads(out.stdout.strip().splitlines()[-1]):
+            rows.append({"scale": f"x{scale:g}", **r})
+
+    df = pd.DataFrame(rows)
+    with pd.option_context("display.max_rows", None, "display.width", 160):
+        print(df.to_string(index=False))
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+        print(f"✅ 결과 저장: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
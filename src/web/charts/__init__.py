@@ -11,6 +11,7 @@ from .population import (
 )
 from .expenditure import create_expenditure_chart
 from .map import create_kakao_map
+from .choropleth import create_dong_choropleth
 
 __all__ = [
     'create_sales_comparison_chart',
@@ -18,5 +19,6 @@ __all__ = [
     'create_time_population_chart',
     'create_population_chart',
     'create_expenditure_chart',
-    'create_kakao_map'
+    'create_kakao_map',
+    'create_dong_choropleth'
 ]
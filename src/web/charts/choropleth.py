@@ -0,0 +1,180 @@
+"""
+Dong choropleth map
+서울시 행정동 단계구분도 (외식업 매출 / 음식 지출 / 유동인구)
+
+- 지표·분기별 구간(make_safe_bins), 색, 호버 텍스트는 한 번 계산해 캐시합니다. (get_choropleth_layer)
+- 단순화한 경계(GEO_SIMPLIFY_LEVELS)는 지도 HTML 에 한 번만 싣고, 지표 전환은 Plotly 버튼(restyle)이
+  브라우저에서 처리합니다 → 전환 시 Streamlit 재실행, 분위수 재계산, 폴리곤 재직렬화가 없습니다.
+- 완성된 HTML 도 분기/경계 단계별로 캐시합니다. (create_dong_choropleth)
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import shapely
+import streamlit as st
+from config import (
+    FOOD10, CURRENT_YQ, GEOJSON_PATH, CHART_TEMPLATE,
+    CHOROPLETH_METRICS, CHOROPLETH_BINS, CHOROPLETH_COLORS,
+    CHOROPLETH_NODATA_COLOR, CHOROPLETH_GEO_LEVEL
+)
+from charts.utils import make_safe_bins
+from data.geo import load_boundaries, get_area_dong_index
+from data.query import fetch_sales_2024, fetch_floating_by_area_2024, fetch_income_2024
+
+MAP_HEIGHT = 560
+
+
+def dong_metric_values(metric: str, quarters=CURRENT_YQ) -> pd.Series:
+    """
+    행정동 경계별 지표 값을 계산합니다.
+    상권 지표는 공간 조인으로 배정된 동으로 합산하고, 음식 지출은 경계의 DB 행정동 코드로 연결합니다.
+
+    Args:
+        metric: CHOROPLETH_METRICS 키
+        quarters: 분기 범위 (시작, 끝)
+
+    Returns:
+        pd.Series: index=adm_cd, 지표 값
+    """
+    dong_index = get_area_dong_index()
+    if metric == "food_expenditure":
+        income = fetch_income_2024(quarters=quarters).groupby("dong_code")["food_expenditure"].sum()
+        return dong_index.dongs["dong_code"].map(income).astype(float)
+
+    if metric == "sales":
+        area = fetch_sales_2024(None, FOOD10, quarters=quarters).set_index("commercial_area_code")["sales_sum_2024"]
+    elif metric == "floating":
+        area = fetch_floating_by_area_2024(None, quarters=quarters).set_index("commercial_area_code")
+        area = area["male"] + area["female"]
+    else:
+        raise ValueError(f"알 수 없는 지표: {metric}")
+    adm_cd = dong_index.areas["adm_cd"].reindex(area.index)
+    values = pd.to_numeric(area, errors="coerce")
+    return values.groupby(adm_cd.to_numpy()).sum(min_count=1)
+
+
+def _fmt(x: float, unit: str, scale: float) -> str:
+    v = x / scale
+    return f"{v:,.1f}{unit}" if scale > 1 and abs(v) < 100 else f"{v:,.0f}{unit}"
+
+
+def _class_colors(k: int) -> list[str]:
+    """k 구간에 쓸 색 (팔레트에서 고르게 선택)"""
+    idx = np.linspace(0, len(CHOROPLETH_COLORS) - 1, k).round().astype(int)
+    return [CHOROPLETH_COLORS[i] for i in idx]
+
+
+@st.cache_data(show_spinner=False)
+def get_choropleth_layer(metric: str, quarters=CURRENT_YQ) -> dict:
+    """
+    지표 하나의 단계구분도 레이어(구간, 색, feature 별 구간 번호, 호버 텍스트)를 계산합니다.
+    z 는 구간 번호(0 ~ k-1, 값 없음 = -1)이며 불연속 colorscale 로 칠합니다.
+
+    Args:
+        metric: CHOROPLETH_METRICS 키
+        quarters: 분기 범위 (시작, 끝)
+
+    Returns:
+        dict: z, text, colorscale, zmin, zmax, tickvals, ticktext, bins, matched
+    """
+    label, unit, scale = CHOROPLETH_METRICS[metric]
+    boundaries = load_boundaries(GEOJSON_PATH, "full")
+    values = dong_metric_values(metric, quarters).reindex(boundaries["adm_cd"]).to_numpy(dtype=float)
+
+    bins = make_safe_bins(pd.Series(values), target_bins=CHOROPLETH_BINS)
+    k = len(bins) - 1
+    valid = ~np.isnan(values)
+    z = np.full(len(values), -1, dtype=int)
+    z[valid] = np.clip(np.searchsorted(bins[1:-1], values[valid], side="left"), 0, k - 1)
+
+    colors = [CHOROPLETH_NODATA_COLOR] + _class_colors(k)
+    colorscale = []
+    for j, c in enumerate(colors):
+        colorscale += [[j / len(colors), c], [(j + 1) / len(colors), c]]
+
+    names = (boundaries["gu"].fillna("") + " " + boundaries["dong_geo"].fillna("")).to_numpy()
+    shown = np.where(valid, [_fmt(x, unit, scale) if ok else "" for x, ok in zip(values, valid)], "데이터 없음")
+    return {
+        "z": z.tolist(),
+        "text": [f"{n}<br>{label}: {s}" for n, s in zip(names, shown)],
+        "colorscale": colorscale,
+        "zmin": -1.5,
+        "zmax": k - 0.5,
+        "tickvals": list(range(-1, k)),
+        "ticktext": ["데이터 없음"] + [f"{_fmt(a, '', scale)} ~ {_fmt(b, unit, scale)}" for a, b in zip(bins[:-1], bins[1:])],
+        "bins": bins,
+        "matched": int(valid.sum()),
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def get_choropleth_geometry(level: str = CHOROPLETH_GEO_LEVEL) -> dict:
+    """
+    단순화한 행정동 경계를 Plotly 용 GeoJSON 으로 한 번 만듭니다. (속성 없이 id = adm_cd, 좌표 소수 6자리)
+
+    Args:
+        level: 경계 단순화 단계
+
+    Returns:
+        dict: GeoJSON FeatureCollection
+    """
+    gdf = load_boundaries(GEOJSON_PATH, level)
+    geoms = shapely.transform(gdf.geometry.values, lambda c: np.round(c, 6))
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "id": code, "geometry": shapely.geometry.mapping(g)}
+            for code, g in zip(gdf["adm_cd"], geoms)
+        ],
+    }
+
+
+def _restyle_args(layer: dict, label: str) -> dict:
+    return {
+        "z": [layer["z"]],
+        "text": [layer["text"]],
+        "colorscale": [layer["colorscale"]],
+        "zmin": [layer["zmin"]],
+        "zmax": [layer["zmax"]],
+        "colorbar.tickvals": [layer["tickvals"]],
+        "colorbar.ticktext": [layer["ticktext"]],
+        "colorbar.title.text": [label],
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def create_dong_choropleth(quarters=CURRENT_YQ, level: str = CHOROPLETH_GEO_LEVEL) -> str:
+    """
+    서울시 행정동 단계구분도 HTML 을 생성합니다. 지표는 지도 위 버튼으로 전환합니다.
+
+    Args:
+        quarters: 분기 범위 (시작, 끝)
+        level: 경계 단순화 단계
+
+    Returns:
+        str: components.html 로 표시할 HTML
+    """
+    geojson = get_choropleth_geometry(level)
+    locations = [f["id"] for f in geojson["features"]]
+    layers = {m: get_choropleth_layer(m, quarters) for m in CHOROPLETH_METRICS}
+
+    first = next(iter(CHOROPLETH_METRICS))
+    first_label = CHOROPLETH_METRICS[first][0]
+    fig = go.Figure(go.Choropleth(
+        geojson=geojson, locations=locations, z=layers[first]["z"],
+        text=layers[first]["text"], hoverinfo="text",
+        colorscale=layers[first]["colorscale"], zmin=layers[first]["zmin"], zmax=layers[first]["zmax"],
+        marker_line_color="white", marker_line_width=0.5,
+        colorbar=dict(title=dict(text=first_label), tickvals=layers[first]["tickvals"],
+                      ticktext=layers[first]["ticktext"], thickness=12),
+    ))
+    buttons = [dict(label=label, method="restyle", args=[_restyle_args(layers[m], label)])
+               for m, (label, _, _) in CHOROPLETH_METRICS.items()]
+    fig.update_geos(fitbounds="locations", visible=False)
+    fig.update_layout(
+        template=CHART_TEMPLATE, height=MAP_HEIGHT, margin=dict(l=0, r=0, t=40, b=0),
+        updatemenus=[dict(type="buttons", direction="right", buttons=buttons, x=0, y=1.08,
+                          xanchor="left", yanchor="top", showactive=True)],
+    )
+    return fig.to_html(include_plotlyjs="cdn", full_html=False, config={"displayModeBar": False})
@@ -3,60 +3,51 @@ Expenditure chart generation functions
 지출 차트 생성 함수들
 """
 
+import pandas as pd
 import plotly.graph_objects as go
-import streamlit as st
 from config import CHART_HEIGHT, CHART_TEMPLATE, EXPENDITURE_COLORS, EXPENDITURE_TYPES
+from data.geo import get_area_dong_index
+from charts.figure_cache import cached_figure
 
 
 def create_expenditure_chart(df_income, selected_area_codes, df_areas):
     """
     지출 차트를 생성합니다.
+    상권 → 행정동 배정은 호출마다 조회하고, figure 는 (항목, 값, 제목) 으로 스펙 캐시에서 재사용합니다.
     
     Args:
         df_income: 소득/지출 데이터
-        selected_area_codes: 선택된 상권 코드 리스트
+        selected_area_codes: 선택된 상권 코드 리스트 (여러 개면 첫 번째 상권 — 고르는 UI 는 호출자가 표시)
         df_areas: 상권 데이터
         
     Returns:
         tuple: (차트, 제목) 또는 (None, None)
     """
+    # 상권 → 행정동은 좌표 공간 조인 결과 사용 (dong_code 가 비었거나 오래된 상권 포함)
+    dong_index = get_area_dong_index()
     if selected_area_codes:
         # Use the first selected area's dong_code (or combine if multiple)
         pick = df_areas[df_areas["commercial_area_code"].isin(selected_area_codes)]
         if pick.empty:
             return None, None
         else:
-            # If multiple areas, show top 1 by sales or list selector
-            if len(pick) > 1:
-                pick_name = st.selectbox("어느 상권의 소속 동을 보시겠습니까?", options=pick["area_name"].tolist())
-                pick = pick[pick["area_name"] == pick_name]
             row = pick.iloc[0]
-            dcode, dname = row["dong_code"], row["dong"]
+            assigned = dong_index.lookup([row["commercial_area_code"]]).iloc[0]
+            dcode = dong_index.dong_code_of(row["commercial_area_code"])
+            dname = assigned["dong"] if pd.notna(assigned["dong"]) else row["dong"]
             di = df_income[df_income["dong_code"] == dcode]
             if di.empty:
                 return None, None
             else:
                 total = float(di["total_expenditure"].sum())
                 food  = float(di["food_expenditure"].sum())
-                fig = go.Figure()
-                fig.add_bar(
-                    x=EXPENDITURE_TYPES, 
-                    y=[total, food], 
-                    marker_color=EXPENDITURE_COLORS,
-                    hovertemplate="%{x}: %{y:,}<extra></extra>"
-                )
-                fig.update_layout(
-                    title=f"{dname} — 2024 지출", 
-                    template=CHART_TEMPLATE, 
-                    height=CHART_HEIGHT,
-                    yaxis=dict(title="금액(원)")
-                )
-                return fig, f"{dname} — 2024 지출"
+                title = f"{dname} — 2024 지출"
+                return _expenditure_bar_figure(tuple(EXPENDITURE_TYPES), (total, food), title), title
     else:
         # Only category selected → 평균(해당 업종 보유 상권들의 소속 동 기준 평균)
         # 1) 상권 풀
         area_pool = df_areas["commercial_area_code"].unique().tolist()
-        dpool = df_areas[df_areas["commercial_area_code"].isin(area_pool)]["dong_code"].unique().tolist()
+        dpool = dong_index.dong_codes(area_pool)
         di = df_income[df_income["dong_code"].isin(dpool)]
         if di.empty:
             return None, None
@@ -68,19 +59,26 @@ def create_expenditure_chart(df_income, selected_area_codes, df_areas):
             )
             total_avg = float(agg["total"].mean())
             food_avg  = float(agg["food"].mean())
-            fig = go.Figure()
-            fig.add_bar(
-                x=["총지출(평균)","음식지출(평균)"], 
-                y=[total_avg, food_avg],
-                marker_color=EXPENDITURE_COLORS,
-                hovertemplate="%{x}: %{y:,}<extra></extra>"
-            )
-            fig.update_layout(
-                title="해당 업종 보유 상권의 소속 동 평균 지출 (2024)",
-                template=CHART_TEMPLATE, 
-                height=CHART_HEIGHT,
-                yaxis=dict(title="금액(원)")
-            )
-            return fig, "해당 업종 보유 상권의 소속 동 평균 지출 (2024)"
+            title = "해당 업종 보유 상권의 소속 동 평균 지출 (2024)"
+            return _expenditure_bar_figure(("총지출(평균)", "음식지출(평균)"), (total_avg, food_avg), title), title
     
     return None, None
+
+
+@cached_figure
+def _expenditure_bar_figure(labels: tuple, values: tuple, title: str):
+    """총지출/음식지출 막대 figure (입력만으로 결정)"""
+    fig = go.Figure()
+    fig.add_bar(
+        x=list(labels),
+        y=list(values),
+        marker_color=EXPENDITURE_COLORS,
+        hovertemplate="%{x}: %{y:,}<extra></extra>"
+    )
+    fig.update_layout(
+        title=title,
+        template=CHART_TEMPLATE,
+        height=CHART_HEIGHT,
+        yaxis=dict(title="금액(원)")
+    )
+    return fig
@@ -0,0 +1,223 @@
+"""
+Plotly figure spec cache
+차트 빌더 결과(Plotly figure)를 입력 해시 → 직렬화된 JSON 으로 보관하는 프로세스 공유 LRU 캐시
+
+- 키: 빌더 이름 + 논리 입력(DataFrame 은 값/컬럼/dtype 해시, 그 밖은 repr) 해시
+- 값: figure.to_json() 문자열 (빌더가 (figure, 제목) 등 튜플을 반환하면 나머지 값도 함께)
+- hit 이면 검증을 건너뛰고 스펙에서 figure 를 복원합니다. (캐시된 스펙은 이미 검증된 figure 에서 나옴)
+- 항목 수(FIGURE_CACHE_MAX_ENTRIES)와 크기(FIGURE_CACHE_MAX_BYTES)를 넘으면 가장 오래 안 쓴 항목부터 제거
+- 계측: hit/miss, 빌드 시간, hit 으로 아낀 빌드 시간과 hit 처리 비용(해시 + 복원)
+"""
+
+import functools
+import hashlib
+import json
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from config import FIGURE_CACHE_ENABLED, FIGURE_CACHE_MAX_ENTRIES, FIGURE_CACHE_MAX_BYTES
+
+
+def _feed(h, obj):
+    """입력 값 하나를 해시에 넣습니다. (DataFrame/Series/ndarray 는 값 해시, 컨테이너는 재귀)"""
+    if isinstance(obj, pd.DataFrame):
+        h.update(repr((list(obj.columns), [str(t) for t in obj.dtypes])).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, pd.Series):
+        h.update(repr((obj.name, str(obj.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(repr((obj.dtype.str, obj.shape)).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}[{len(obj)}]".encode())
+        for x in obj:
+            _feed(h, x)
+    elif isinstance(obj, dict):
+        h.update(f"dict[{len(obj)}]".encode())
+        for k in sorted(obj, key=repr):
+            _feed(h, k)
+            _feed(h, obj[k])
+    elif obj is None or isinstance(obj, (str, int, float, bool, np.generic)):
+        h.update(repr(obj).encode())
+    else:
+        h.update(pickle.dumps(obj))
+    h.update(b"|")
+
+
+def input_key(name: str, args: tuple, kwargs: dict) -> str:
+    """
+    빌더 이름과 논리 입력으로 캐시 키를 만듭니다.
+
+    Args:
+        name: 빌더 이름 (모듈.함수)
+        args, kwargs: 빌더 인자
+
+    Returns:
+        str: 키 (blake2b hex)
+    """
+    h = hashlib.blake2b(name.encode(), digest_size=16)
+    _feed(h, args)
+    _feed(h, kwargs)
+    return h.hexdigest()
+
+
+def _dump(value):
+    """빌더 결과 → (스펙, 크기) — figure 는 JSON 문자열로, 튜플은 원소별로"""
+    if isinstance(value, go.Figure):
+        spec = value.to_json()
+        return ("figure", spec), len(spec)
+    if isinstance(value, tuple):
+        parts = [_dump(v) for v in value]
+        return ("tuple", tuple(p for p, _ in parts)), sum(n for _, n in parts)
+    return ("value", value), 64
+
+
+def _load(spec):
+    """스펙 → 빌더 결과 (figure 는 검증 없이 복원 — 스펙은 검증된 figure 의 직렬화 결과)"""
+    kind, payload = spec
+    if kind == "figure":
+        return go.Figure(json.loads(payload), _validate=False)
+    if kind == "tuple":
+        return tuple(_load(p) for p in payload)
+    return payload
+
+
+class FigureCache:
+    """
+    프로세스 공유 figure 스펙 LRU 캐시 (스레드 안전).
+
+    Attributes:
+        entries: {키: (스펙, 크기, 빌드 시간 초)} — 최근 사용이 뒤
+        stats: {빌더 이름: 누적 통계}
+    """
+
+    FIELDS = ("hits", "misses", "build", "saved", "overhead", "evictions")
+
+    def __init__(self, max_entries: int = FIGURE_CACHE_MAX_ENTRIES, max_bytes: int = FIGURE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.stats = {}
+
+    def _stat(self, name: str) -> dict:
+        return self.stats.setdefault(name, dict.fromkeys(self.FIELDS, 0))
+
+    def get(self, key: str):
+        """(hit 여부, 스펙, 빌드 시간) — hit 이면 최근 사용으로 옮김"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False, None, 0.0
+            self.entries.move_to_end(key)
+            return True, entry[0], entry[2]
+
+    def put(self, name: str, key: str, spec, size: int, build: float):
+        """스펙을 저장하고 한도를 넘는 만큼 오래된 항목을 제거합니다."""
+        with self._lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            self.entries[key] = (spec, size, build)
+            self.nbytes += size
+            while self.entries and (len(self.entries) > self.max_entries or self.nbytes > self.max_bytes):
+                _, (_, n, _) = self.entries.popitem(last=False)
+                self.nbytes -= n
+                self._stat(name)["evictions"] += 1
+
+    def record(self, name: str, hit: bool, build: float, overhead: float):
+        """
+        호출 한 건을 누적합니다.
+
+        Args:
+            name: 빌더 이름
+            hit: 캐시 hit 여부
+            build: miss 면 실제 빌드 시간, hit 면 저장 당시 빌드 시간 (= 아낀 시간)
+            overhead: 키 해시 + 복원(hit) 또는 직렬화(miss) 시간
+        """
+        with self._lock:
+            s = self._stat(name)
+            s["hits" if hit else "misses"] += 1
+            s["saved" if hit else "build"] += build
+            s["overhead"] += overhead
+
+    def clear(self):
+        """항목과 통계를 모두 비웁니다."""
+        with self._lock:
+            self.entries.clear()
+            self.nbytes = 0
+            self.stats.clear()
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        빌더별 통계표.
+
+        Returns:
+            pd.DataFrame: builder, hits, misses, hit_rate, build_ms, saved_ms, overhead_ms, net_saved_ms, evictions
+        """
+        with self._lock:
+            rows = [{"builder": k, **v} for k, v in self.stats.items()]
+        df = pd.DataFrame(rows, columns=["builder", *self.FIELDS])
+        calls = df["hits"] + df["misses"]
+        df["hit_rate"] = (df["hits"] / calls.where(calls > 0)).astype(float).round(3)
+        for c in ("build", "saved", "overhead"):
+            df[f"{c}_ms"] = (df.pop(c).astype(float) * 1000).round(1)
+        df["net_saved_ms"] = df["saved_ms"] - df["overhead_ms"]
+        return df.sort_values("net_saved_ms", ascending=False).reset_index(drop=True)[
+            ["builder", "hits", "misses", "hit_rate", "build_ms", "saved_ms", "overhead_ms", "net_saved_ms",
+             "evictions"]]
+
+    def summary(self) -> dict:
+        """전체 합계 (entries, bytes, hits, misses, saved_s, overhead_s)"""
+        with self._lock:
+            total = {k: sum(s[k] for s in self.stats.values()) for k in ("hits", "misses", "saved", "overhead")}
+            return {"entries": len(self.entries), "bytes": self.nbytes, "hits": total["hits"],
+                    "misses": total["misses"], "saved_s": total["saved"], "overhead_s": total["overhead"]}
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache() -> FigureCache:
+    """프로세스 공유 figure 스펙 캐시"""
+    return FigureCache()
+
+
+def cached_figure(fn):
+    """
+    차트 빌더 결과를 figure 스펙 캐시에 저장하는 데코레이터.
+    빌더는 인자만으로 결과가 정해져야 합니다. 내부에서 데이터를 조회하거나 위젯을 그리는 함수에는 붙이지 않고,
+    조회는 호출자에서 한 뒤 값을 인자로 넘기는 figure 빌더에 붙입니다. (charts/sales.py _sales_bar_figure 참고)
+    반환값은 호출마다 새 figure 이므로 호출자가 수정해도 캐시에는 영향이 없습니다.
+    """
+    name = f"{fn.__module__}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not FIGURE_CACHE_ENABLED:
+            return fn(*args, **kwargs)
+        cache = get_figure_cache()
+        t0 = time.perf_counter()
+        key = input_key(name, args, kwargs)
+        hit, spec, build = cache.get(key)
+        if hit:
+            value = _load(spec)
+            cache.record(name, True, build, time.perf_counter() - t0)
+            return value
+
+        t1 = time.perf_counter()
+        value = fn(*args, **kwargs)
+        t2 = time.perf_counter()
+        # 스펙은 문자열로 저장하므로 호출자가 반환된 figure 를 수정해도 캐시와 무관
+        spec, size = _dump(value)
+        cache.put(name, key, spec, size, t2 - t1)
+        cache.record(name, False, t2 - t1, (t1 - t0) + (time.perf_counter() - t2))
+        return value
+
+    return wrapper
@@ -3,20 +3,20 @@ Map generation functions
 지도 생성 함수들
 """
 
-import pandas as pd
+import math
+
 from config import (
     CHART_HEIGHT, KAKAO_JS_KEY, DEFAULT_MAP_LEVEL,
     KOREA_LAT_RANGE, KOREA_LON_RANGE
 )
 
 
-def create_kakao_map(selected_area_codes, df_areas):
+def create_kakao_map(area):
     """
     카카오 맵을 생성합니다.
     
     Args:
-        selected_area_codes: 선택된 상권 코드 리스트
-        df_areas: 상권 데이터
+        area: 상권 레코드 (data.areas.AreaRecord, 상권 색인에서 조회)
         
     Returns:
         str: HTML 코드 또는 None
@@ -24,19 +24,11 @@ def create_kakao_map(selected_area_codes, df_areas):
     if not KAKAO_JS_KEY:
         return None
 
-    if not selected_area_codes:
-        return None
-
-    row = df_areas.loc[df_areas["commercial_area_code"] == selected_area_codes[0]].head(1)
-    if row.empty or pd.isna(row.iloc[0]["lat"]) or pd.isna(row.iloc[0]["lon"]):
+    if area is None or math.isnan(area.lat) or math.isnan(area.lon):
         return None
 
-    lat = float(row.iloc[0]["lat"])
-    lon = float(row.iloc[0]["lon"])
-    area_name = str(row.iloc[0]["area_name"])
-    gu = str(row.iloc[0]["gu"]) if pd.notna(row.iloc[0]["gu"]) else ""
-    dong = str(row.iloc[0]["dong"]) if pd.notna(row.iloc[0]["dong"]) else ""
-    label = f"{area_name} ({gu} {dong})".strip()
+    lat, lon = area.lat, area.lon
+    label = area.full_label.strip()
 
     # 좌표 유효성(대략 대한민국 범위) 체크
     if not (KOREA_LAT_RANGE[0] <= lat <= KOREA_LAT_RANGE[1] and KOREA_LON_RANGE[0] <= lon <= KOREA_LON_RANGE[1]):
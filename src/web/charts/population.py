@@ -9,8 +9,10 @@ from config import (
     TIME_PERIODS, TIME_LABELS, TIME_X_VALS, DAY_LABELS, DAY_COLUMNS,
     GENDER_LABELS, GENDER_COLUMNS, POPULATION_TYPES, POPULATION_COLUMNS
 )
+from charts.figure_cache import cached_figure
 
 
+@cached_figure
 def create_gender_day_chart(df_fpop, selected_area_codes, df_sales):
     """
     성별·요일별 유동인구 구성비 차트를 생성합니다.
@@ -69,6 +71,7 @@ def create_gender_day_chart(df_fpop, selected_area_codes, df_sales):
     return fig
 
 
+@cached_figure
 def create_time_population_chart(df_fpop, selected_area_codes):
     """
     시간대별 유동인구 차트를 생성합니다.
@@ -114,6 +117,7 @@ def create_time_population_chart(df_fpop, selected_area_codes):
     return fig
 
 
+@cached_figure
 def create_population_chart(df_pga, selected_area_codes, df_sales):
     """
     상주·직장 인구 차트를 생성합니다.
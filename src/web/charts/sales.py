@@ -4,13 +4,16 @@ Sales chart generation functions
 """
 
 import plotly.graph_objects as go
-from config import CHART_HEIGHT, CHART_TEMPLATE, BASE_COLORS
+from config import CHART_HEIGHT, CHART_TEMPLATE, BASE_COLORS, SALES_CUBE_ENABLED
 from data.query import fetch_sales_2024
+from data.cube import get_sales_cube
+from charts.figure_cache import cached_figure
 
 
 def create_sales_comparison_chart(selected_area_codes, sel_cats, all_categories):
     """
     매출 비교 차트를 생성합니다.
+    막대 값은 호출마다 조회하고, figure 는 (라벨, 값) 으로 스펙 캐시에서 재사용합니다.
     
     Args:
         selected_area_codes: 선택된 상권 코드 리스트
@@ -24,15 +27,19 @@ def create_sales_comparison_chart(selected_area_codes, sel_cats, all_categories)
     is_area_selected = len(selected_area_codes) == 1
     is_cats_all = set(sel_cats) == set(all_categories)  # 업종 전체 선택인지 여부
 
-    # 헬퍼
+    # 헬퍼 — 매출 큐브 사용 시 배열 축소 연산으로 계산
     def get_city_avg(cats: list[str]) -> float:
-        df_all = fetch_sales_2024(selected_areas=None, selected_cats=cats, cache_key=("avg", tuple(sorted(cats))))
+        if SALES_CUBE_ENABLED:
+            return get_sales_cube().city_avg(cats)
+        df_all = fetch_sales_2024(selected_areas=None, selected_cats=cats)
         if df_all.empty:
             return 0.0
         return float(df_all["sales_sum_2024"].mean())
 
     def get_area_sum(area_codes: list[int], cats: list[str]) -> float:
-        df_area = fetch_sales_2024(selected_areas=area_codes, selected_cats=cats, cache_key=("area", tuple(area_codes), tuple(sorted(cats))))
+        if SALES_CUBE_ENABLED:
+            return get_sales_cube().area_sum(area_codes, cats)
+        df_area = fetch_sales_2024(selected_areas=area_codes, selected_cats=cats)
         if df_area.empty:
             return 0.0
         # 단일 상권만 선택하므로 하나면 충분
@@ -66,20 +73,26 @@ def create_sales_comparison_chart(selected_area_codes, sel_cats, all_categories)
         return None
 
     if bars:
-        fig = go.Figure()
-        # 두 번째만 빨간색(#EF553B)
-        fig.add_bar(
-            x=labels,
-            y=bars,
-            marker_color=BASE_COLORS[:len(bars)],
-            hovertemplate="%{x}: %{y:,.0f}원<extra></extra>"
-        )
-        fig.update_layout(
-            template=CHART_TEMPLATE,
-            height=CHART_HEIGHT,
-            yaxis=dict(title="매출(원)"),
-            xaxis=dict(title=None)
-        )
-        return fig
-    
+        return _sales_bar_figure(tuple(labels), tuple(bars))
+
     return None
+
+
+@cached_figure
+def _sales_bar_figure(labels: tuple, bars: tuple):
+    """매출 비교 막대 figure (입력만으로 결정)"""
+    fig = go.Figure()
+    # 두 번째만 빨간색(#EF553B)
+    fig.add_bar(
+        x=list(labels),
+        y=list(bars),
+        marker_color=BASE_COLORS[:len(bars)],
+        hovertemplate="%{x}: %{y:,.0f}원<extra></extra>"
+    )
+    fig.update_layout(
+        template=CHART_TEMPLATE,
+        height=CHART_HEIGHT,
+        yaxis=dict(title="매출(원)"),
+        xaxis=dict(title=None)
+    )
+    return fig
@@ -19,7 +19,40 @@ PAGE_TITLE = "서울시 상권별 외식업 분석 대시보드"
 PAGE_LAYOUT = "wide"
 
 # Database configuration
+# MySQL 서버 또는 로컬 임베디드 파일 (sqlite:///path, duckdb:///path) — data/dialect.py 참고
 DB_URL = os.getenv("DB_URL")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+# Data backend: "auto" | "db" | "snapshot"
+# - auto: 스냅샷(manifest.json)이 있으면 스냅샷, 없으면 DB
+DATA_BACKEND = os.getenv("DATA_BACKEND", "auto")
+SNAPSHOT_DIR = Path(os.getenv("SNAPSHOT_DIR", Path(__file__).parent.parent / "data" / "snapshot"))
+
+# 병렬 조회 스레드 수 (0 이면 DB 커넥션 풀 크기)
+FETCH_MAX_WORKERS = int(os.getenv("FETCH_MAX_WORKERS", "0"))
+
+# 프로세스 간 공유 결과 캐시 (로컬 디스크 SQLite)
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "1") == "1"
+RESULT_CACHE_PATH = Path(os.getenv("RESULT_CACHE_PATH", Path(__file__).parent.parent / "data" / "cache" / "results.sqlite"))
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", str(24 * 3600)))  # 초
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+# 같은 키를 채우는 다른 프로세스를 기다리는 최대 시간(초) — 넘으면 채우던 프로세스가 죽은 것으로 보고 직접 조회
+RESULT_CACHE_FILL_TIMEOUT = int(os.getenv("RESULT_CACHE_FILL_TIMEOUT", "120"))
+# hit 시각(LRU)과 hit/miss 카운터를 모아서 기록하는 주기(초) — hit 경로는 읽기만 수행
+RESULT_CACHE_FLUSH_INTERVAL = float(os.getenv("RESULT_CACHE_FLUSH_INTERVAL", "5"))
+# 분기별 사전 집계 버전 파일 디렉터리 — 갱신(CLI) 시 파일을 바꾸면 실행 중인 프로세스가 다음 조회 때 다시 만듦
+AGGREGATE_VERSION_DIR = Path(os.getenv("AGGREGATE_VERSION_DIR", RESULT_CACHE_PATH.parent / "versions"))
+
+# 캐시 warm-up: 시작 시 백그라운드 실행 여부, 대상 상권(쉼표 구분 코드, 비우면 매출 상위 N), 동시 조회 수
+WARMUP_ON_START = os.getenv("WARMUP_ON_START", "0") == "1"
+WARMUP_TOP_AREAS = [int(c) for c in os.getenv("WARMUP_TOP_AREAS", "").split(",") if c.strip()]
+WARMUP_TOP_N = int(os.getenv("WARMUP_TOP_N", "20"))
+WARMUP_MAX_WORKERS = int(os.getenv("WARMUP_MAX_WORKERS", "2"))
+
+# 조회 계측 내보내기: 경로(.prom = Prometheus 텍스트, .jsonl = JSONL 추가, 비우면 비활성), 주기(초)
+METRICS_EXPORT_PATH = os.getenv("METRICS_EXPORT_PATH", "")
+METRICS_EXPORT_INTERVAL = int(os.getenv("METRICS_EXPORT_INTERVAL", "60"))
 
 # External API keys - Streamlit secrets 우선, 환경변수 fallback
 def get_kakao_js_key():
@@ -41,14 +74,58 @@ FOOD10 = [
 
 # Year-Quarter range for 2024
 ALL_YQ = (20241, 20244)  # 2024 Q1~Q4
+# 기본 조회 분기 범위 (시작, 끝) — 연간 조회는 ALL_YQ
+CURRENT_YQ = (20244, 20244)  # 2024 Q4
+
+# 매출 큐브(상권×업종×분기 사전 집계) 사용 여부 — "0" 이면 매 요청 SQL 집계
+SALES_CUBE_ENABLED = os.getenv("SALES_CUBE_ENABLED", "1") == "1"
+
+# 추천 점수 요인 가중치 (analyzer/scoring.py) — 요인별 백분위의 가중 평균, 0~100점
+RECOMMEND_WEIGHTS = {
+    "avg_sales": 0.40,         # 점포당 매출
+    "density": 0.15,           # 유동인구 대비 점포 밀도 (낮을수록 유리)
+    "floating": 0.20,          # 유동인구
+    "worker_ratio": 0.10,      # 직장인구 비중
+    "food_expenditure": 0.15,  # 소속 동 음식 지출
+}
+RECOMMEND_TOP_K = 5
+# 업종 분석의 시간대별 유동인구 패턴에 쓰는 매출 상위 상권 수
+CATEGORY_TIME_TOP_N = int(os.getenv("CATEGORY_TIME_TOP_N", "10"))
+# 업종 분석의 전체 상권 순위 페이지 크기 (점포당 매출 순, keyset 페이지)
+CATEGORY_RANKING_PAGE_SIZE = 20
+
+# 유사 상권 특성 블록 가중치 (analyzer/similarity.py) — 블록 안에서는 열 수로 나눠 균등 배분
+SIMILAR_FEATURE_WEIGHTS = {
+    "day": 1.0,         # 요일별 유동인구 비중
+    "time": 1.0,        # 시간대별 유동인구 비중
+    "gender": 0.5,      # 남성 유동인구 비중
+    "population": 1.0,  # 상주/직장 인구 (log)
+    "sales_mix": 1.5,   # 외식 업종별 매출 비중
+}
+SIMILAR_TOP_K = 5
+SIMILAR_RADIUS_KM = 3.0  # 상권 분석 화면의 "가까운 유사 상권" 반경
+
+# 사이드바 상권 검색 결과 수 (data/areas.py AreaSearchIndex — 빈 검색어면 매출 상위 상권)
+AREA_SEARCH_TOP_K = 20
 
 # --- GeoJSON 경로 (고정 사용) ---
-GEOJSON_PATH = Path(__file__).parent / "../../data/서울_행정동_경계_2017.geojson"
+GEOJSON_PATH = Path(__file__).parent.parent / "data" / "서울_행정동_경계_2017.geojson"
+# 전처리된 행정동 경계 (GeoParquet, data/geo.py) — 원본보다 오래되면 자동 재생성
+GEO_PARQUET_PATH = Path(os.getenv("GEO_PARQUET_PATH", Path(__file__).parent.parent / "data" / "cache" / "dong_boundaries.parquet"))
+# 경계 단순화 단계별 허용 오차 (도 단위, 0 = 원본) — 서울 전체 단계구분도는 CHOROPLETH_GEO_LEVEL 사용
+GEO_SIMPLIFY_LEVELS = {"full": 0.0, "medium": 0.0001, "low": 0.0005}
+# 상권 → 행정동 공간 조인: 경계 밖 좌표를 가장 가까운 동에 배정하는 최대 거리 (도 단위, 약 500m)
+GEO_NEAREST_MAX_DEG = 0.005
 
 # Chart configuration
 CHART_HEIGHT = 350
 CHART_TEMPLATE = "plotly_white"
 
+# Plotly 차트 스펙 캐시 (charts/figure_cache.py): 빌더 입력 해시 → 직렬화된 figure JSON, LRU
+FIGURE_CACHE_ENABLED = os.getenv("FIGURE_CACHE_ENABLED", "1") == "1"
+FIGURE_CACHE_MAX_ENTRIES = int(os.getenv("FIGURE_CACHE_MAX_ENTRIES", "512"))
+FIGURE_CACHE_MAX_BYTES = int(os.getenv("FIGURE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
 # Color schemes
 BASE_COLORS = ["#636EFA", "#EF553B"]  # 1st: 파랑, 2nd: 빨강
 POPULATION_COLORS = ["#1f77b4", "#2ca02c"]  # 상주, 직장인구
@@ -59,6 +136,17 @@ DEFAULT_MAP_LEVEL = 5
 KOREA_LAT_RANGE = (33, 39)
 KOREA_LON_RANGE = (124, 132)
 
+# 행정동 단계구분도 (charts/choropleth.py): 지표별 (표시명, 단위, 표시 배율)
+CHOROPLETH_METRICS = {
+    "sales": ("외식업 매출", "억원", 1e8),
+    "food_expenditure": ("음식 지출", "억원", 1e8),
+    "floating": ("유동인구", "명", 1),
+}
+CHOROPLETH_BINS = 7
+CHOROPLETH_COLORS = ["#ffffb2", "#fed976", "#feb24c", "#fd8d3c", "#fc4e2a", "#e31a1c", "#b10026"]  # ColorBrewer YlOrRd
+CHOROPLETH_NODATA_COLOR = "#e5e5e5"
+CHOROPLETH_GEO_LEVEL = "medium"  # GEO_SIMPLIFY_LEVELS 단계
+
 # Time periods for analysis
 TIME_PERIODS = ["t00_06", "t06_11", "t11_14", "t14_17", "t17_21", "t21_24"]
 TIME_LABELS = ["00-06", "06-11", "11-14", "14-17", "17-21", "21-24"]
@@ -3,12 +3,22 @@ Main dashboard application
 메인 대시보드 애플리케이션
 """
 import streamlit as st
-from config import PAGE_TITLE, PAGE_LAYOUT
-from ui import render_sidebar_for_recommand, display_area_analysis_results, display_category_analysis_results
-from analyzer import analyze_selected_area, analyze_selected_category
-from data.query import fetch_time_patterns, fetch_areas_and_categories
+from config import PAGE_TITLE, PAGE_LAYOUT, WARMUP_ON_START
+from ui import (
+    render_sidebar_for_recommand, display_area_analysis_results, display_category_analysis_results,
+    display_demographics, display_population_patterns, display_category_time_patterns, display_category_ranking,
+    render_lazy_sections,
+    render_dong_choropleth
+)
+from analyzer import (
+    analyze_selected_area, analyze_selected_category, load_area_demographics, load_area_population,
+    load_category_demographics, load_category_time_patterns, load_category_ranking_page
+)
 from charts import create_sales_comparison_chart, create_population_chart, create_expenditure_chart
 from data import load_dashboard_data, prepare_sales_data
+from data.context import DataContext
+from data.warmup import start_background_warmup
+from data.metrics import start_metrics_exporter
 
 
 
@@ -16,56 +26,60 @@ def main():
     st.set_page_config(layout="wide")
     
     st.title("🏪 상권 추천 시스템")
+
+    # 조회 계측 주기적 내보내기 (METRICS_EXPORT_PATH 설정 시)
+    start_metrics_exporter()
+
+    # 프로세스당 한 번 업종/주요 상권 분석 캐시를 백그라운드로 채움
+    if WARMUP_ON_START:
+        start_background_warmup()
+
+    # 전체 실행 단위 데이터 컨텍스트 — 분석 결과 화면이 같은 데이터셋을 한 번만 조회
+    # (사이드바와 지연 섹션은 fragment 실행마다 자기 컨텍스트를 만듦)
+    ctx = DataContext()
     
     # 사이드바 렌더링
     recommend_type, selected_area, selected_category, df_areas, categories = render_sidebar_for_recommand()
     
-    if st.session_state.get('analyze_area', False):
-        st.session_state['analyze_area'] = False
-        # 상권 분석
-        area_name, area_info, area_analysis, demographics, population_patterns, time_patterns = analyze_selected_area(
-            st.session_state['selected_area'], df_areas
-        )
-        
-        area_code = area_info['commercial_area_code']
-        additional_time_patterns = fetch_time_patterns(area_code)
-        
-        # 데이터 로딩 (상주/직장인구 차트용)
-        _, all_categories = fetch_areas_and_categories()
-        
-        df_sales_chart, df_fpop_chart, df_pga_chart, df_income_chart = load_dashboard_data(
-            [area_code], all_categories, f"area_{area_code}", "all_categories"
-        )
-        df_sales_chart = prepare_sales_data(df_sales_chart, df_areas, [area_code])
-        
-        # 상주/직장인구 차트 생성 (2. 상주/직장인구와 동일)
-        population_chart = create_population_chart(df_pga_chart, [area_code], df_sales_chart)
-        
+    # 분석 시작 버튼은 한 번만 True — 이후 rerun(섹션 선택 등)에도 결과 화면을 유지하도록 기억
+    if st.session_state.pop('analyze_area', False):
+        st.session_state['active_analysis'] = ("area", st.session_state['selected_area'])
+    elif st.session_state.pop('analyze_category', False):
+        st.session_state['active_analysis'] = ("category", st.session_state['selected_category'])
+    kind, target = st.session_state.get('active_analysis', (None, None))
+
+    if kind == "area":
+        # 상권 분석 (메모리 색인만 사용 — 무거운 섹션은 선택 시 조회)
+        area_name, area_info, area_analysis, similar_areas = analyze_selected_area(target, ctx)
+        area_code = area_info.code
+
         # 결과 표시
-        display_area_analysis_results(area_name, area_info, area_analysis, demographics, population_patterns, time_patterns, population_chart)
-        
-        # 대시보드 차트들 추가
+        display_area_analysis_results(area_name, area_info, area_analysis, similar_areas)
+
+        # 무거운 섹션: 선택한 섹션만 조회/렌더링 (fragment — 섹션 전환은 이 영역만 다시 실행,
+        # 렌더링 함수는 fragment 실행마다 만든 새 DataContext 를 마지막 인자로 받음)
         st.markdown("---")
-        st.subheader("📊 상권 상세 분석")
-        
-        # 상권명 기반 분석 차트들
-        _render_area_based_charts(area_code, df_areas)
-        
-    elif st.session_state.get('analyze_category', False):
-        st.session_state['analyze_category'] = False
-        # 업종 분석
-        category_name, category_analysis, category_demographics, category_time_patterns = analyze_selected_category(
-            st.session_state['selected_category']
-        )
+        render_lazy_sections(f"area_sections_{area_code}", {
+            "👥 고객 인구통계": (_render_area_demographics, (area_code,)),
+            "📈 인구 패턴 분석": (_render_area_population, (area_code, df_areas, categories)),
+            "📊 상권 상세 분석": (_render_area_based_charts, (area_code, df_areas)),
+        })
+
+    elif kind == "category":
+        # 업종 분석 (메모리 색인만 사용 — 무거운 섹션은 선택 시 조회)
+        category_name, category_analysis = analyze_selected_category(target, ctx)
+
         # 결과 표시
-        display_category_analysis_results(category_name, category_analysis, category_demographics, category_time_patterns)
-        
-        # 대시보드 차트들 추가
+        display_category_analysis_results(category_name, category_analysis)
+
+        # 무거운 섹션: 선택한 섹션만 조회/렌더링
         st.markdown("---")
-        st.subheader("상세 분석")
-        
-        # 업종 기반 분석 차트들
-        _render_category_based_charts(category_name)
+        render_lazy_sections(f"category_sections_{category_name}", {
+            "👥 고객 특성 분석": (_render_category_demographics, (category_name,)),
+            "⏰ 시간대별 유동인구": (_render_category_time_patterns, (category_name,)),
+            "📋 전체 상권 순위": (_render_category_ranking, (category_name,)),
+            "📊 상세 분석": (_render_category_based_charts, (category_name,)),
+        })
 
     else:
         from streamlit_lottie import st_lottie
@@ -80,17 +94,57 @@ def main():
             key="welcome_lottie"
         )
 
-def _render_area_based_charts(area_code, df_areas):
+    ctx.publish()
+
+def _render_area_demographics(area_code, ctx):
+    """상권 고객 인구통계 섹션을 렌더링합니다."""
+    display_demographics(load_area_demographics(area_code, ctx))
+
+
+def _render_area_population(area_code, df_areas, categories, ctx):
+    """상권 인구 패턴 섹션을 렌더링합니다. (상주/직장인구 차트 포함)"""
+    population_patterns, time_patterns = load_area_population(area_code, ctx)
+
+    # 데이터 로딩 (상주/직장인구 차트용)
+    df_sales_chart, df_fpop_chart, df_pga_chart, df_income_chart = ctx.resolve(
+        "dashboard_data", load_dashboard_data,
+        [area_code], categories, f"area_{area_code}", "all_categories", consumer="_render_area_population"
+    )
+    df_sales_chart = prepare_sales_data(df_sales_chart, df_areas, [area_code])
+
+    # 상주/직장인구 차트 생성 (2. 상주/직장인구와 동일)
+    population_chart = create_population_chart(df_pga_chart, [area_code], df_sales_chart)
+    display_population_patterns(population_patterns, time_patterns, population_chart)
+
+
+def _render_category_demographics(category_name, ctx):
+    """업종 고객 특성 섹션을 렌더링합니다."""
+    display_demographics(load_category_demographics(category_name, ctx))
+
+
+def _render_category_time_patterns(category_name, ctx):
+    """업종 시간대별 유동인구 섹션을 렌더링합니다."""
+    display_category_time_patterns(load_category_time_patterns(category_name, ctx))
+
+
+def _render_category_ranking(category_name, ctx):
+    """업종 전체 상권 순위 섹션을 렌더링합니다. (keyset 페이지)"""
+    display_category_ranking(category_name, lambda cursor: load_category_ranking_page(category_name, cursor, ctx))
+
+
+def _render_area_based_charts(area_code, df_areas, ctx):
     """상권 기반 분석 차트들을 렌더링합니다."""
+    by = "_render_area_based_charts"
     
     # 카테고리 정보 가져오기
     from data.query import fetch_areas_and_categories
-    _, all_categories = fetch_areas_and_categories()
+    _, all_categories = ctx.resolve("areas_and_categories", fetch_areas_and_categories, consumer=by)
     
     # 데이터 로딩
     with st.spinner("상권 분석 데이터 로딩 중..."):
-        df_sales, df_fpop, df_pga, df_income = load_dashboard_data(
-            [area_code], all_categories, f"area_{area_code}", "all_categories"
+        df_sales, df_fpop, df_pga, df_income = ctx.resolve(
+            "dashboard_data", load_dashboard_data,
+            [area_code], all_categories, f"area_{area_code}", "all_categories", consumer=by
         )
         
         # 매출 데이터 전처리
@@ -116,17 +170,19 @@ def _render_area_based_charts(area_code, df_areas):
             st.info("지출 데이터를 불러올 수 없습니다.")
 
 
-def _render_category_based_charts(category_name):
+def _render_category_based_charts(category_name, ctx):
     """업종 기반 분석 차트들을 렌더링합니다."""
+    by = "_render_category_based_charts"
     
     # 카테고리 정보 가져오기
     from data.query import fetch_areas_and_categories
-    _, all_categories = fetch_areas_and_categories()
+    _, all_categories = ctx.resolve("areas_and_categories", fetch_areas_and_categories, consumer=by)
     
     # 데이터 로딩
     with st.spinner("업종 분석 데이터 로딩 중..."):
-        df_sales, df_fpop, df_pga, df_income = load_dashboard_data(
-            [], [category_name], "all_areas", f"category_{category_name}"
+        df_sales, df_fpop, df_pga, df_income = ctx.resolve(
+            "dashboard_data", load_dashboard_data,
+            [], [category_name], "all_areas", f"category_{category_name}", consumer=by
         )
     
         st.subheader("전체 외식업 평균 매출액 & 업종의 서울시 평균 매출액")
@@ -136,6 +192,8 @@ def _render_category_based_charts(category_name):
         else:
             st.info("매출 데이터를 불러올 수 없습니다.")
 
+    # 서울 전체 행정동 지도 (캐시된 HTML — 지표 전환은 브라우저에서 처리)
+    render_dong_choropleth()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,265 @@
+"""
+Commercial area registry
+상권 조회 색인 (코드/표시명 → 상권 레코드, O(1))
+
+상권 목록(fetch_areas_and_categories)을 프로세스당 한 번 __slots__ 레코드로 바꾸고,
+코드/표시명 dict 와 축 배열, 표시명(미리 계산)을 함께 보관합니다.
+사이드바 format_func, 상권 분석, 지도에서 DataFrame 불리언 스캔 대신 사용합니다.
+
+상권 선택 검색(AreaSearchIndex)은 상권명/구/동의 접두, 부분, 초성 일치를 정렬된 접미사 색인으로 찾습니다.
+(공백으로 나눈 토큰마다 찾아 교집합 — "강남구 역삼" 처럼 필드를 섞어 검색 가능)
+"""
+
+import bisect
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from config import FOOD10, SALES_CUBE_ENABLED
+from data.query import fetch_areas_and_categories, fetch_sales_2024
+
+
+class AreaRecord:
+    """
+    상권 한 개 (읽기 전용으로 사용).
+
+    Attributes:
+        code: 상권 코드
+        name: 상권명
+        gu, dong: 구/동 이름 (없으면 "")
+        dong_code: DB 행정동 코드 (없으면 None)
+        lon, lat: 좌표
+        label: "상권명 (동)" — 추천 사이드바 표시명
+        full_label: "상권명 (구 동)" — 대시보드 사이드바 표시명
+    """
+
+    __slots__ = ("code", "name", "gu", "dong", "dong_code", "lon", "lat", "label", "full_label")
+
+    def __init__(self, code, name, gu, dong, dong_code, lon, lat, label=None, full_label=None):
+        self.code = code
+        self.name = name
+        self.gu = gu
+        self.dong = dong
+        self.dong_code = dong_code
+        self.lon = lon
+        self.lat = lat
+        self.label = label if label is not None else f"{name} ({dong})"
+        self.full_label = full_label if full_label is not None else f"{name} ({gu} {dong})"
+
+    def __repr__(self):
+        return f"AreaRecord({self.code}, {self.full_label!r})"
+
+
+def _text(x) -> str:
+    return "" if x is None or pd.isna(x) else str(x)
+
+
+class AreaRegistry:
+    """
+    상권 레코드 색인.
+
+    Attributes:
+        records: 상권 레코드 (fetch_areas_and_categories 순서 — 구, 동, 상권명)
+        codes: 상권 코드 축 (records 순서, int64)
+        by_code: {상권 코드: 레코드}
+        by_label: {full_label: 레코드}
+    """
+
+    def __init__(self, df_areas: pd.DataFrame):
+        # 표시명은 참조 데이터(data/reference.py)에서 미리 계산된 컬럼을 쓰고, 없으면 레코드에서 만듭니다.
+        labels = ["display_name", "area_label"] if {"display_name", "area_label"} <= set(df_areas.columns) else []
+        records = []
+        for code, name, gu, dong, dong_code, lon, lat, *label in df_areas[
+                ["commercial_area_code", "area_name", "gu", "dong", "dong_code", "lon", "lat", *labels]
+        ].itertuples(index=False):
+            records.append(AreaRecord(
+                int(code), _text(name), _text(gu), _text(dong),
+                None if pd.isna(dong_code) else int(dong_code),
+                float(lon), float(lat), *label,
+            ))
+        self.records = tuple(records)
+        self.codes = np.array([r.code for r in records], dtype=np.int64)
+        self.by_code = {}
+        self.by_label = {}
+        self._by_name = {}
+        for r in records:
+            # 중복 코드/이름은 먼저 나온 상권 (기존 .iloc[0] 과 동일)
+            self.by_code.setdefault(r.code, r)
+            self.by_label.setdefault(r.full_label, r)
+            self._by_name.setdefault(r.name, r)
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, code) -> AreaRecord | None:
+        """상권 코드로 레코드를 찾습니다. (없으면 None)"""
+        try:
+            return self.by_code.get(int(code))
+        except (TypeError, ValueError):
+            return None
+
+    def by_name(self, name: str) -> AreaRecord | None:
+        """상권명으로 레코드를 찾습니다. (같은 이름이 여럿이면 첫 번째)"""
+        return self._by_name.get(name)
+
+    def label_of(self, code) -> str:
+        """추천 사이드바 표시명 (selectbox format_func 용)"""
+        r = self.get(code)
+        return r.label if r else str(code)
+
+
+@st.cache_resource(show_spinner=False)
+def get_area_registry() -> AreaRegistry:
+    """
+    상권 조회 색인을 프로세스당 한 번 생성합니다. (데이터 소스/스냅샷이 바뀌면 재시작 또는 .clear())
+
+    Returns:
+        AreaRegistry: 상권 조회 색인
+    """
+    df_areas, _ = fetch_areas_and_categories()
+    return AreaRegistry(df_areas)
+
+
+# ===============================
+# 🔎 TYPE-AHEAD SEARCH
+# ===============================
+
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_HANGUL_FIRST, _HANGUL_LAST = 0xAC00, 0xD7A3
+_SYLLABLES_PER_CHOSUNG = 21 * 28
+_NO_SPACE = str.maketrans("", "", " \t()-")
+
+# 필드별 (접두 일치 순위, 부분 일치 순위) — 작을수록 위 (상권명 완전 일치 = 0)
+_FIELD_RANKS = {"name": (1, 2), "gu": (3, 4), "dong": (3, 4)}
+
+
+def normalize_query(text: str) -> str:
+    """검색 키 정규화: 공백/괄호/하이픈 제거, 소문자"""
+    return (text or "").translate(_NO_SPACE).lower()
+
+
+def to_chosung(text: str) -> str:
+    """한글 음절을 초성으로 바꿉니다. (그 밖의 문자는 그대로) 예: "강남" → "ㄱㄴ" """
+    return "".join(
+        CHOSUNG[(ord(ch) - _HANGUL_FIRST) // _SYLLABLES_PER_CHOSUNG]
+        if _HANGUL_FIRST <= ord(ch) <= _HANGUL_LAST else ch
+        for ch in text
+    )
+
+
+_NO_MATCH = np.iinfo(np.int64).max
+
+
+def _is_syllable(ch: str) -> bool:
+    return _HANGUL_FIRST <= ord(ch) <= _HANGUL_LAST
+
+
+class AreaSearchIndex:
+    """
+    상권명/구/동 검색 색인 (접두, 부분, 초성 일치).
+
+    필드 문자열의 모든 접미사를 정렬해 두고(접미사가 검색어로 시작 ⇔ 검색어가 부분 문자열),
+    검색어 범위를 이분 탐색으로 찾습니다. 일반/초성 색인을 따로 둡니다.
+    검색어는 공백으로 나눠 토큰마다 찾고 모든 토큰이 (어느 필드에서든) 일치한 상권만 남깁니다.
+    같은 순위 안에서는 외식업 매출이 큰 상권이 먼저입니다.
+
+    Attributes:
+        registry: 상권 색인
+        order: 레코드별 기본 순서 (매출 내림차순 → 상권명), 빈 검색어 결과 순서
+    """
+
+    def __init__(self, registry: AreaRegistry, sales: dict | None = None):
+        self.registry = registry
+        sales = sales or {}
+        n = len(registry.records)
+        ranked = sorted(range(n), key=lambda i: (-sales.get(registry.records[i].code, 0), registry.records[i].name))
+        self.order = np.empty(n, dtype=np.int64)
+        self.order[ranked] = np.arange(n)
+        self._default = ranked
+        self._tables = {
+            "text": self._build(chosung=False),
+            "chosung": self._build(chosung=True),
+        }
+
+    def _build(self, chosung: bool) -> tuple:
+        """
+        (정렬된 접미사, 원문 접미사, 레코드 위치, 순위, 상권명 길이 — 상권명 접두 항목만, 그 밖 -1) 색인
+        초성 색인의 원문 접미사는 음절이 섞인 검색어("ㄱ남")의 음절 위치 확인에 씁니다.
+        """
+        rows = []
+        for i, r in enumerate(self.registry.records):
+            for field, (prefix_rank, sub_rank) in _FIELD_RANKS.items():
+                text = normalize_query(getattr(r, field))
+                s = to_chosung(text) if chosung else text
+                rows.extend((s[j:], text[j:], i, sub_rank if j else prefix_rank,
+                             len(s) if field == "name" and not j else -1)
+                            for j in range(len(s)))
+        rows.sort(key=lambda x: x[0])
+        keys, texts, ids, ranks, name_len = zip(*rows) if rows else ((), (), (), (), ())
+        return (list(keys), list(texts) if chosung else None, np.array(ids, dtype=np.int64),
+                np.array(ranks, dtype=np.int64), np.array(name_len, dtype=np.int64))
+
+    def _match(self, q: str) -> np.ndarray:
+        """
+        정규화된 검색어 토큰 하나의 상권별 최고 순위를 반환합니다. (일치 없으면 _NO_MATCH)
+        초성이 하나라도 있으면 초성 색인에서 찾고, 섞인 음절은 원문의 같은 위치와 비교합니다.
+        """
+        chosung = any(ch in CHOSUNG for ch in q)
+        keys, texts, ids, ranks, name_len = self._tables["chosung" if chosung else "text"]
+        key = to_chosung(q) if chosung else q
+        lo = bisect.bisect_left(keys, key)
+        hi = bisect.bisect_left(keys, key + "\uffff", lo)
+        ids = ids[lo:hi]
+        rank = np.where(name_len[lo:hi] == len(q), 0, ranks[lo:hi])
+        fixed = [(j, ch) for j, ch in enumerate(q) if _is_syllable(ch)] if chosung else []
+        if fixed:
+            ok = np.fromiter((all(t[j] == ch for j, ch in fixed) for t in texts[lo:hi]), dtype=bool, count=hi - lo)
+            ids, rank = ids[ok], rank[ok]
+        best = np.full(len(self.registry.records), _NO_MATCH, dtype=np.int64)
+        np.minimum.at(best, ids, rank)
+        return best
+
+    def search(self, query: str, k: int = 20) -> list[AreaRecord]:
+        """
+        검색어와 일치하는 상권을 순위대로 최대 k 개 반환합니다.
+        순위: 상권명 완전 일치 → 상권명 접두 → 상권명 부분 → 구/동 접두 → 구/동 부분 (초성 검색도 동일)
+        여러 토큰이면 모든 토큰이 일치한 상권만, 토큰 중 가장 좋은 순위로 정렬합니다.
+
+        Args:
+            query: 검색어 (상권명, 구, 동 일부 또는 초성 — 예: "ㄱㄴ", "ㄱ남", "강남구 역삼")
+            k: 최대 개수
+
+        Returns:
+            list[AreaRecord]: 상권 레코드 (빈 검색어면 매출 상위 k 개)
+        """
+        records = self.registry.records
+        tokens = [t for t in map(normalize_query, (query or "").split()) if t]
+        if not tokens:
+            return [records[i] for i in self._default[:k]]
+
+        best, alive = None, None
+        for q in tokens:
+            rank = self._match(q)
+            hit = rank != _NO_MATCH
+            best = rank if best is None else np.minimum(best, rank)
+            alive = hit if alive is None else alive & hit
+        cand = np.flatnonzero(alive)
+        cand = cand[np.lexsort((self.order[cand], best[cand]))]
+        return [records[i] for i in cand[:max(k, 0)]]
+
+
+@st.cache_resource(show_spinner=False)
+def get_area_search_index() -> AreaSearchIndex:
+    """
+    상권 검색 색인을 프로세스당 한 번 생성합니다. (동순위 정렬에 외식업 매출 사용)
+
+    Returns:
+        AreaSearchIndex: 상권 검색 색인
+    """
+    if SALES_CUBE_ENABLED:
+        from data.cube import get_sales_cube
+        totals = get_sales_cube().area_totals(FOOD10)
+    else:
+        totals = fetch_sales_2024(None, FOOD10)
+    sales = dict(zip(totals["commercial_area_code"].tolist(), totals["sales_sum_2024"].tolist()))
+    return AreaSearchIndex(get_area_registry(), sales)
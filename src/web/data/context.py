@@ -0,0 +1,188 @@
+"""
+Request-scoped data context
+한 번의 rerun 동안 각 데이터셋을 한 번만 조회하도록 공유하는 데이터 컨텍스트
+
+전체 실행과 fragment 실행(사이드바, 지연 섹션)은 각자 새 컨텍스트를 만들고 끝날 때 범위별로 기록을 남깁니다.
+(fragment 만 다시 실행될 때 이전 전체 실행의 컨텍스트가 메모리에 남거나 재사용되지 않음)
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from pandas.arrays import ArrowExtensionArray
+from pandas.core.arrays.masked import BaseMaskedArray
+
+LOG_KEY = "data_context_log"  # 세션 상태 키: {범위: (기록 시각, 요청 기록)}
+MAIN_SCOPE = "main"
+
+
+def _freeze(x):
+    """캐시 키로 쓸 수 있도록 리스트/딕셔너리를 튜플로 변환"""
+    if isinstance(x, (list, tuple)):
+        return tuple(_freeze(v) for v in x)
+    if isinstance(x, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in x.items()))
+    if hasattr(x, "item"):
+        return x.item()
+    return x
+
+
+def _seal_array(arr):
+    """
+    컬럼 배열을 제자리 수정이 불가능한 배열로 바꿉니다. (데이터 복사 없음)
+    numpy/nullable 정수/category 코드는 읽기 전용 플래그, Arrow 배열은 뷰마다 새로 감쌈(_view_array)
+    """
+    if isinstance(arr, pd.arrays.NumpyExtensionArray):
+        arr = arr.to_numpy()
+    if isinstance(arr, np.ndarray):
+        arr = arr.view()
+        arr.flags.writeable = False
+        return arr
+    if isinstance(arr, pd.Categorical):
+        # codes 속성은 읽기 전용 뷰
+        return pd.Categorical.from_codes(arr.codes, dtype=arr.dtype, validate=False)
+    if isinstance(arr, BaseMaskedArray):
+        data, mask = arr._data.view(), arr._mask.view()
+        data.flags.writeable = False
+        mask.flags.writeable = False
+        return type(arr)(data, mask)
+    return arr
+
+
+def _view_array(arr):
+    """공유 배열의 뷰별 래퍼 (Arrow 배열은 제자리 수정 시 래퍼 안의 버퍼를 교체하므로 새로 감쌈)"""
+    if isinstance(arr, ArrowExtensionArray):
+        return type(arr)(arr._pa_array)
+    return arr
+
+
+def _seal(value):
+    """
+    컨텍스트에 보관할 값을 만듭니다. DataFrame/Series 는 모든 컬럼 배열을 읽기 전용으로 바꾼 새 객체
+    (데이터 복사 없음 — 조회 함수가 반환한 배열을 그대로 공유)
+    """
+    if isinstance(value, pd.DataFrame):
+        cols = {i: _seal_array(value.iloc[:, i].array) for i in range(value.shape[1])}
+        sealed = pd.DataFrame(cols, index=value.index, copy=False)
+        sealed.columns = value.columns
+        return sealed
+    if isinstance(value, pd.Series):
+        return pd.Series(_seal_array(value.array), index=value.index, name=value.name, copy=False)
+    if isinstance(value, tuple):
+        return tuple(_seal(v) for v in value)
+    return value
+
+
+def _read_only(value):
+    """
+    소비자에게 넘길 뷰를 만듭니다. (_seal 로 보관한 값 → 데이터 복사 없는 새 DataFrame)
+    제자리 수정(view.loc[i, c] = x)은 ValueError("assignment destination is read-only"),
+    컬럼 추가/교체는 뷰에만 반영되어 다른 소비자가 받는 공유 값은 바뀌지 않음
+    """
+    if isinstance(value, pd.DataFrame):
+        cols = {i: _view_array(value.iloc[:, i].array) for i in range(value.shape[1])}
+        view = pd.DataFrame(cols, index=value.index, copy=False)
+        view.columns = value.columns
+        return view
+    if isinstance(value, pd.Series):
+        return pd.Series(_view_array(value.array), index=value.index, name=value.name, copy=False)
+    if isinstance(value, tuple):
+        return tuple(_read_only(v) for v in value)
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+class DataContext:
+    """
+    rerun 단위 데이터 컨텍스트.
+
+    차트/분석 함수들은 fetch_* 를 직접 호출하는 대신 resolve() 로 데이터셋을 요청합니다.
+    같은 (데이터셋, 인자) 조합은 rerun 동안 한 번만 조회되며, 이후 요청은 메모리에서 바로 반환됩니다.
+    다른 스레드(FetchPlan)가 같은 키를 조회 중이면 새로 조회하지 않고 그 결과를 기다립니다.
+
+    Attributes:
+        scope: 기록 범위 ("main" = 전체 실행, 그 밖은 fragment 이름)
+        requests: [(소비자, 데이터셋, 재사용 여부)] 요청 기록
+    """
+
+    def __init__(self, scope: str = MAIN_SCOPE):
+        self.scope = scope
+        self.started = time.monotonic()
+        self._values = {}
+        self._pending = {}   # {키: Future} — 조회 중인 키
+        self._lock = threading.Lock()
+        self.requests = []
+
+    def resolve(self, dataset: str, fn, *args, consumer: str = "-", **kwargs):
+        """
+        데이터셋을 조회하거나 이미 조회한 값을 반환합니다.
+
+        Args:
+            dataset: 논리 데이터셋 이름
+            fn: 조회 함수
+            *args, **kwargs: 조회 함수 인자
+            consumer: 요청한 소비자 이름 (기록용)
+
+        Returns:
+            조회 결과의 읽기 전용 뷰
+        """
+        key = (dataset, _freeze(args), _freeze(kwargs))
+        with self._lock:
+            hit = key in self._values
+            pending = None if hit else self._pending.get(key)
+            owner = not hit and pending is None
+            if owner:
+                pending = self._pending[key] = Future()
+            self.requests.append((consumer, dataset, not owner))
+        if hit:
+            return _read_only(self._values[key])
+        if not owner:
+            # 다른 스레드가 조회 중 — 결과(또는 예외)를 기다림
+            return _read_only(pending.result())
+
+        try:
+            value = _seal(fn(*args, **kwargs))
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            self._values[key] = value
+            del self._pending[key]
+        pending.set_result(value)
+        return _read_only(value)
+
+    def summary(self) -> pd.DataFrame:
+        """소비자별 요청 기록"""
+        return pd.DataFrame(self.requests, columns=["consumer", "dataset", "reused"])
+
+    def publish(self):
+        """
+        요청 기록을 세션 상태에 범위별로 저장합니다. (다음 rerun 의 디버그 섹션 표시용)
+        fragment 실행은 자기 범위만 바꾸고, 전체 실행은 이번 실행 중 기록되지 않은 범위(사라진 fragment)를 지웁니다.
+        """
+        logs = dict(st.session_state.get(LOG_KEY) or {})
+        if self.scope == MAIN_SCOPE:
+            logs = {scope: entry for scope, entry in logs.items() if entry[0] >= self.started}
+        logs[self.scope] = (time.monotonic(), self.summary())
+        st.session_state[LOG_KEY] = logs
+
+
+def published_log() -> pd.DataFrame:
+    """
+    범위별로 저장된 요청 기록을 하나로 합칩니다.
+
+    Returns:
+        pd.DataFrame: scope, consumer, dataset, reused (기록 없으면 빈 DataFrame)
+    """
+    logs = st.session_state.get(LOG_KEY) or {}
+    frames = [log.assign(scope=scope) for scope, (_, log) in logs.items() if not log.empty]
+    if not frames:
+        return pd.DataFrame(columns=["scope", "consumer", "dataset", "reused"])
+    return pd.concat(frames, ignore_index=True)[["scope", "consumer", "dataset", "reused"]]
@@ -0,0 +1,300 @@
+"""
+Precomputed area × category × quarter sales cube
+상권 × 업종 × 분기 매출 큐브 (사전 집계 후 메모리 조회)
+
+큐브 파일은 스냅샷 백엔드에서, 같은 스냅샷으로 빌드된 경우에만 사용합니다.
+
+사용법 (src/web 에서 실행):
+    python -m data.cube build [--out PATH]
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+from config import FOOD10, CURRENT_YQ, SNAPSHOT_DIR, SALES_CUBE_ENABLED
+from data.source import read_sql, get_backend
+from data.snapshot import snapshot_exists, read_manifest
+from data.partition import expand_quarters
+from data.result_cache import shared_cache
+
+
+CUBE_FILE_NAME = "sales_cube.parquet"
+# 큐브 파일 메타데이터: 빌드 당시 스냅샷 manifest 의 created_at
+CUBE_SOURCE_KEY = b"snapshot_created_at"
+DEFAULT_QUARTERS = tuple(expand_quarters(CURRENT_YQ))
+
+
+@shared_cache()
+def build_sales_cube_frame() -> pd.DataFrame:
+    """
+    매출 큐브의 원천이 되는 (분기, 상권, 업종) 단위 집계를 조회합니다.
+    Shop_Count → Sales_Daytype → Service_Category 조인을 한 번만 수행합니다.
+
+    Returns:
+        pd.DataFrame: 분기/상권/업종별 매출 합계, 점포 수, 매출 행 수
+    """
+    sql = """
+    SELECT sh.year_quarter,
+           sh.commercial_area_code,
+           ca.name AS area_name, ca.gu, ca.dong,
+           cat.name AS category_name,
+           MAX(sh.shop_count) AS shop_count,
+           SUM(sdt.sales)     AS sales,
+           COUNT(sdt.store_id) AS sales_rows
+    FROM Shop_Count sh
+    JOIN Service_Category cat  ON cat.code = sh.service_category_code
+    LEFT JOIN Commercial_Area ca ON ca.code = sh.commercial_area_code
+    LEFT JOIN Sales_Daytype sdt  ON sdt.store_id = sh.id
+    WHERE cat.name IN :cats
+    GROUP BY sh.year_quarter, sh.commercial_area_code, ca.name, ca.gu, ca.dong, cat.name
+    """
+    return read_sql(sql, {"cats": tuple(FOOD10)})
+
+
+class SalesCube:
+    """
+    상권 × 업종 × 분기 밀집 배열.
+
+    Attributes:
+        area_codes: 상권 코드 축 (정렬)
+        categories: 업종명 축
+        quarters: 분기 축 (정렬)
+        sales: 매출 합계 (A, C, Q)
+        stores: 점포 수 (A, C, Q)
+        present: 매출 데이터 존재 여부 (A, C, Q)
+        areas: 상권 축에 맞춘 상권명/구/동
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.area_codes = np.sort(frame["commercial_area_code"].unique()).astype(np.int64)
+        self.categories = [c for c in FOOD10 if c in set(frame["category_name"])]
+        self.quarters = np.sort(frame["year_quarter"].unique()).astype(np.int64)
+
+        self.area_index = {int(c): i for i, c in enumerate(self.area_codes)}
+        self.cat_index = {c: i for i, c in enumerate(self.categories)}
+        self.quarter_index = {int(q): i for i, q in enumerate(self.quarters)}
+
+        shape = (len(self.area_codes), len(self.categories), len(self.quarters))
+        self.sales = np.zeros(shape, dtype=np.int64)
+        self.stores = np.zeros(shape, dtype=np.int64)
+        self.present = np.zeros(shape, dtype=bool)
+
+        f = frame[frame["category_name"].isin(self.cat_index)]
+        ai = np.searchsorted(self.area_codes, f["commercial_area_code"].to_numpy())
+        ci = f["category_name"].map(self.cat_index).to_numpy()
+        qi = np.searchsorted(self.quarters, f["year_quarter"].to_numpy())
+        self.sales[ai, ci, qi] = pd.to_numeric(f["sales"]).fillna(0).to_numpy(dtype=np.int64)
+        self.stores[ai, ci, qi] = pd.to_numeric(f["shop_count"]).fillna(0).to_numpy(dtype=np.int64)
+        self.present[ai, ci, qi] = pd.to_numeric(f["sales_rows"]).to_numpy() > 0
+
+        meta = f.drop_duplicates("commercial_area_code").set_index("commercial_area_code")
+        self.areas = meta.reindex(self.area_codes)[["area_name", "gu", "dong"]].reset_index()
+
+    @property
+    def avg_sales(self) -> np.ndarray:
+        """점포당 매출 (A, C, Q). 점포 수 0 이면 0"""
+        return np.floor_divide(self.sales, self.stores, out=np.zeros_like(self.sales), where=self.stores > 0)
+
+    # --- index helpers ---
+    def _cat_idx(self, cats) -> np.ndarray:
+        return np.array([self.cat_index[c] for c in cats if c in self.cat_index], dtype=np.intp)
+
+    def _quarter_idx(self, quarters) -> np.ndarray:
+        return np.array([self.quarter_index[int(q)] for q in quarters if int(q) in self.quarter_index], dtype=np.intp)
+
+    def _slice(self, arr, cats, quarters) -> np.ndarray:
+        return arr[:, self._cat_idx(cats)][:, :, self._quarter_idx(quarters)]
+
+    # --- lookups ---
+    def area_totals(self, cats, area_codes=None, quarters=DEFAULT_QUARTERS) -> pd.DataFrame:
+        """
+        상권별 선택 업종 매출 합계를 계산합니다.
+
+        Args:
+            cats: 업종명 리스트
+            area_codes: 상권 코드 리스트 (None 이면 전체)
+            quarters: 분기 리스트
+
+        Returns:
+            pd.DataFrame: commercial_area_code, sales_sum_2024
+        """
+        totals = self._slice(self.sales, cats, quarters).sum(axis=(1, 2))
+        mask = self._slice(self.present, cats, quarters).any(axis=(1, 2))
+        if area_codes:
+            mask &= np.isin(self.area_codes, [int(x) for x in area_codes])
+        return pd.DataFrame({
+            "commercial_area_code": self.area_codes[mask],
+            "sales_sum_2024": totals[mask],
+        })
+
+    def city_avg(self, cats, quarters=DEFAULT_QUARTERS) -> float:
+        """선택 업종 매출이 있는 상권들의 상권당 평균 매출"""
+        totals = self._slice(self.sales, cats, quarters).sum(axis=(1, 2))
+        mask = self._slice(self.present, cats, quarters).any(axis=(1, 2))
+        return float(totals[mask].mean()) if mask.any() else 0.0
+
+    def area_sum(self, area_codes, cats, quarters=DEFAULT_QUARTERS) -> float:
+        """선택 상권들의 선택 업종 매출 합계"""
+        ai = [self.area_index[int(c)] for c in area_codes if int(c) in self.area_index]
+        if not ai:
+            return 0.0
+        return float(self._slice(self.sales, cats, quarters)[ai].sum())
+
+    def period(self, quarters):
+        """기간 축소: 매출 합계, 점포 수 분기 평균(매출이 있는 분기 기준), 존재 여부 (A, C)"""
+        qi = self._quarter_idx(quarters)
+        present_q = self.present[:, :, qi]
+        sales = self.sales[:, :, qi].sum(axis=2)
+        n_present = present_q.sum(axis=2)
+        store_sum = np.where(present_q, self.stores[:, :, qi], 0).sum(axis=2)
+        stores = np.rint(store_sum / np.maximum(n_present, 1)).astype(np.int64)
+        return sales, stores, n_present > 0
+
+    def area_breakdown(self, area_code, quarters=DEFAULT_QUARTERS) -> pd.DataFrame:
+        """
+        한 상권의 업종별 매출/점포 수를 반환합니다.
+        여러 분기면 매출은 합산, 점포 수는 분기 평균입니다.
+
+        Returns:
+            pd.DataFrame: commercial_area_name, service_category_name, total_sales, shop_count
+        """
+        ai = self.area_index.get(int(area_code))
+        if ai is None:
+            return pd.DataFrame(columns=["commercial_area_name", "service_category_name", "total_sales", "shop_count"])
+        sales, stores, present = self.period(quarters)
+        mask = present[ai]
+        return pd.DataFrame({
+            "commercial_area_name": self.areas.at[ai, "area_name"],
+            "service_category_name": np.array(self.categories, dtype=object)[mask],
+            "total_sales": sales[ai, mask],
+            "shop_count": stores[ai, mask],
+        })
+
+    def category_breakdown(self, category_name, quarters=DEFAULT_QUARTERS) -> pd.DataFrame:
+        """
+        한 업종의 상권별 매출/점포 수를 반환합니다.
+        여러 분기면 매출은 합산, 점포 수는 분기 평균입니다.
+
+        Returns:
+            pd.DataFrame: commercial_area_code, commercial_area_name, gu, dong, total_sales, shop_count
+        """
+        ci = self.cat_index.get(category_name)
+        if ci is None:
+            return pd.DataFrame(columns=["commercial_area_code", "commercial_area_name", "gu", "dong",
+                                         "total_sales", "shop_count"])
+        sales, stores, present = self.period(quarters)
+        mask = present[:, ci]
+        areas = self.areas[mask]
+        return pd.DataFrame({
+            "commercial_area_code": self.area_codes[mask],
+            "commercial_area_name": areas["area_name"].to_numpy(),
+            "gu": areas["gu"].to_numpy(),
+            "dong": areas["dong"].to_numpy(),
+            "total_sales": sales[mask, ci],
+            "shop_count": stores[mask, ci],
+        })
+
+
+def _snapshot_stamp() -> str:
+    """현재 스냅샷의 생성 시각 (스냅샷 백엔드가 아니면 빈 문자열)"""
+    if get_backend() != "snapshot" or not snapshot_exists(SNAPSHOT_DIR):
+        return ""
+    return read_manifest(SNAPSHOT_DIR)["created_at"]
+
+
+def cube_file_is_current(path) -> bool:
+    """
+    큐브 파일을 사용할 수 있는지 확인합니다.
+    스냅샷 백엔드이고, 파일이 현재 스냅샷(manifest created_at)에서 빌드된 경우에만 사용합니다.
+
+    Args:
+        path: 큐브 파일 경로
+
+    Returns:
+        bool: 사용 가능 여부
+    """
+    stamp = _snapshot_stamp()
+    if not stamp or not Path(path).is_file():
+        return False
+    metadata = pq.read_schema(path).metadata or {}
+    return metadata.get(CUBE_SOURCE_KEY, b"").decode() == stamp
+
+
+@st.cache_resource(show_spinner=False)
+def get_sales_cube() -> SalesCube:
+    """
+    매출 큐브를 프로세스당 한 번 생성합니다. (캐시 비우기 시 get_sales_cube.clear())
+    현재 스냅샷에서 빌드된 큐브 파일이 있으면 그것을 읽고, 없거나 DB 백엔드면 집계합니다.
+
+    Returns:
+        SalesCube: 매출 큐브
+    """
+    path = Path(SNAPSHOT_DIR) / CUBE_FILE_NAME
+    frame = pd.read_parquet(path) if cube_file_is_current(path) else build_sales_cube_frame()
+    return SalesCube(frame)
+
+
+def get_period_cube(quarters=CURRENT_YQ) -> SalesCube:
+    """
+    기간 매출 큐브를 반환합니다. (추천 점수/유사 상권 색인용)
+    SALES_CUBE_ENABLED 면 전체 큐브를, 아니면 해당 기간만 업종별 상권 순위 조회로 만든 큐브를 반환합니다.
+    후자의 분기 축은 기간 끝 분기 하나이며 매출은 기간 합계, 점포 수는 분기 평균입니다. (period() 결과는 동일)
+
+    Args:
+        quarters: 분기 범위 (시작, 끝)
+
+    Returns:
+        SalesCube: 매출 큐브
+    """
+    if SALES_CUBE_ENABLED:
+        return get_sales_cube()
+
+    from data.query import fetch_category_area_ranking
+    frames = []
+    for category in FOOD10:
+        df = fetch_category_area_ranking(category, None, 1_000_000, quarters)
+        frames.append(pd.DataFrame({
+            "year_quarter": expand_quarters(quarters)[-1],
+            "commercial_area_code": df["commercial_area_code"].astype("int64"),
+            "area_name": df["commercial_area_name"].astype(object),
+            "gu": df["gu"].astype(object),
+            "dong": df["dong"].astype(object),
+            "category_name": category,
+            "shop_count": df["shop_count"],
+            "sales": df["total_sales"],
+            "sales_rows": 1,
+        }))
+    return SalesCube(pd.concat(frames, ignore_index=True))
+
+
+def main(argv=None):
+    """큐브 빌드 CLI 진입점"""
+    parser = argparse.ArgumentParser(description="매출 큐브 빌드 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="현재 데이터 소스에서 큐브를 집계해 저장")
+    p_build.add_argument("--out", default=str(Path(SNAPSHOT_DIR) / CUBE_FILE_NAME), help="출력 파일")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        # 빌드는 항상 원본에서 다시 집계 (공유 캐시 우회)
+        frame = build_sales_cube_frame.__wrapped__()
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        # 원본 스냅샷 생성 시각을 기록 → 스냅샷이 바뀌면 파일을 쓰지 않음
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        stamp = _snapshot_stamp()
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), CUBE_SOURCE_KEY: stamp.encode()})
+        pq.write_table(table, args.out)
+        if not stamp:
+            print("⚠️ 스냅샷 백엔드가 아니므로 앱은 이 파일을 사용하지 않습니다.")
+        cube = SalesCube(frame)
+        print(f"areas={len(cube.area_codes):,} categories={len(cube.categories)} quarters={len(cube.quarters)}")
+        print(f"✅ 매출 큐브 저장 완료: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
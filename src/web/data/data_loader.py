@@ -8,29 +8,34 @@ from data.query import (
     fetch_sales_2024, fetch_floating_by_area_2024,
     fetch_population_ga_2024, fetch_income_2024
 )
-from config import ALL_YQ
+from data.planner import FetchPlan
+from config import CURRENT_YQ
 
 
-def load_dashboard_data(selected_area_codes, sel_cats, areas_key, cats_key):
+def load_dashboard_data(selected_area_codes, sel_cats, areas_key, cats_key, quarters=CURRENT_YQ):
     """
     대시보드에 필요한 모든 데이터를 로드합니다.
     
     Args:
         selected_area_codes: 선택된 상권 코드 리스트
         sel_cats: 선택된 카테고리 리스트
-        areas_key: 상권 키
-        cats_key: 카테고리 키
+        areas_key: 상권 키 (데이터 컨텍스트 키용 — 조회 캐시는 조회 인자로 구분)
+        cats_key: 카테고리 키 (위와 같음)
+        quarters: 분기 범위 (시작, 끝)
         
     Returns:
         tuple: (df_sales, df_fpop, df_pga, df_income)
     """
+    plan = FetchPlan("dashboard")
+    plan.add("sales", fetch_sales_2024, selected_area_codes, sel_cats, quarters=quarters)
+    plan.add("fpop", fetch_floating_by_area_2024, selected_area_codes, quarters=quarters)
+    plan.add("pga", fetch_population_ga_2024, selected_area_codes, quarters=quarters)
+    plan.add("income", fetch_income_2024, quarters=quarters)
+
     with st.spinner("데이터 로딩 중…"):
-        df_sales = fetch_sales_2024(selected_area_codes, sel_cats, cache_key=("sales", areas_key, cats_key))
-        df_fpop = fetch_floating_by_area_2024(selected_area_codes, cache_key=("fpop", areas_key))
-        df_pga = fetch_population_ga_2024(selected_area_codes, cache_key=("pga", areas_key))
-        df_income = fetch_income_2024(cache_key=("income", ALL_YQ))
+        r = plan.run()
 
-    return df_sales, df_fpop, df_pga, df_income
+    return r["sales"], r["fpop"], r["pga"], r["income"]
 
 
 def prepare_sales_data(df_sales, df_areas, selected_area_codes):
@@ -0,0 +1,222 @@
+"""
+Pre-aggregated customer demographics
+상권별/업종별 성별·연령대 매출 사전 집계 (분기 단위)
+
+Sales_Sex 와 Sales_Age 를 같은 store_id 로 함께 조인하면 점포마다 성별 행 × 연령대 행이 곱해져
+합계가 부풀려집니다. 여기서는 성별과 연령대를 각각 따로 집계한 관계 4개를 분기마다 만듭니다.
+- sex_by_area, age_by_area: 상권별 (전체 업종)
+- sex_by_category, age_by_category: 업종별 (전체 상권)
+
+분기 집계는 프로세스당 한 번 만들어 메모리에 두고(공유 디스크 캐시 경유), 상권/업종 조회는 색인 조회입니다.
+refresh 는 분기별 버전 파일을 바꾸고, 실행 중인 프로세스는 다음 조회 때 버전이 바뀐 분기만 다시 만듭니다.
+
+사용법 (src/web 에서 실행):
+    python -m data.demographics refresh [--quarters 20241 20244]
+"""
+
+import argparse
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from config import CURRENT_YQ, AGGREGATE_VERSION_DIR
+from data.source import read_sql
+from data.partition import expand_quarters
+from data.result_cache import shared_cache
+
+# 차원명: (매출 테이블, 구분 컬럼, 결과 매출 컬럼)
+DIMENSIONS = {
+    "sex": ("Sales_Sex", "sex", "sales_by_gender"),
+    "age": ("Sales_Age", "age", "sales_by_age"),
+}
+# 키명: (SELECT 식, 업종 테이블 조인 필요 여부)
+KEYS = {
+    "area": ("sh.commercial_area_code", False),
+    "category": ("sc.name", True),
+}
+COLUMNS = ["sex", "sales_by_gender", "age", "sales_by_age"]
+
+
+def _aggregate_sql(key: str, dimension: str) -> str:
+    """분기 하나의 (키, 성별 또는 연령대) 매출 합계 SQL — 매출 테이블 하나만 조인"""
+    key_expr, join_category = KEYS[key]
+    table, column, _ = DIMENSIONS[dimension]
+    join = "JOIN Service_Category sc ON sc.code = sh.service_category_code" if join_category else ""
+    return f"""
+    SELECT {key_expr} AS group_key, d.{column} AS bucket, SUM(d.sales) AS sales
+    FROM Shop_Count sh
+    {join}
+    JOIN {table} d ON d.store_id = sh.id
+    WHERE sh.year_quarter = :yq
+    GROUP BY {key_expr}, d.{column}
+    """
+
+
+@shared_cache()
+def build_demographic_aggregates(yq: int) -> dict[str, pd.DataFrame]:
+    """
+    분기 하나의 성별/연령대 매출 사전 집계를 조회합니다.
+
+    Args:
+        yq: 분기 (예: 20244)
+
+    Returns:
+        dict: {"sex_by_area" 등: DataFrame(group_key, bucket, sales)}
+    """
+    out = {}
+    for key in KEYS:
+        for dimension in DIMENSIONS:
+            df = read_sql(_aggregate_sql(key, dimension), {"yq": int(yq)})
+            df["sales"] = pd.to_numeric(df["sales"]).fillna(0).astype(np.int64)
+            out[f"{dimension}_by_{key}"] = df
+    return out
+
+
+class DemographicAggregates:
+    """
+    분기 하나의 성별/연령대 매출 집계와 키별 색인.
+
+    Attributes:
+        yq: 분기
+        relations: {"sex_by_area" 등: DataFrame(group_key, bucket, sales)}
+    """
+
+    def __init__(self, yq: int, relations: dict[str, pd.DataFrame]):
+        self.yq = int(yq)
+        self.relations = relations
+        # 키 → 행 위치 (조회 시 전체 프레임을 훑지 않음)
+        self._index = {name: df.groupby("group_key", sort=False).indices for name, df in relations.items()}
+
+    def _rows(self, dimension: str, key: str, value) -> pd.DataFrame:
+        name = f"{dimension}_by_{key}"
+        pos = self._index[name].get(value)
+        df = self.relations[name]
+        return df.iloc[pos] if pos is not None else df.iloc[:0]
+
+    def lookup(self, key: str, value) -> pd.DataFrame:
+        """
+        상권 또는 업종 하나의 성별/연령대 매출을 반환합니다.
+        성별 행(age 없음)과 연령대 행(sex 없음)이 따로 들어 있어 서로 곱해지지 않습니다.
+
+        Args:
+            key: "area" 또는 "category"
+            value: 상권 코드 또는 업종명
+
+        Returns:
+            pd.DataFrame: sex, sales_by_gender, age, sales_by_age
+        """
+        if key == "area":
+            value = int(value)
+        frames = []
+        for dimension, (_, column, sales_col) in DIMENSIONS.items():
+            rows = self._rows(dimension, key, value)
+            frames.append(pd.DataFrame({column: rows["bucket"].to_numpy(), sales_col: rows["sales"].to_numpy()}))
+        return pd.concat(frames, ignore_index=True).reindex(columns=COLUMNS)
+
+
+def _version_path(yq: int):
+    return AGGREGATE_VERSION_DIR / f"demographics_{int(yq)}"
+
+
+def aggregate_version(yq: int) -> int:
+    """분기 집계 버전 (버전 파일 수정 시각, 파일이 없으면 0) — 조회마다 stat 한 번"""
+    try:
+        return _version_path(yq).stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def bump_aggregate_version(yq: int):
+    """분기 집계 버전을 올립니다. (모든 프로세스가 다음 조회 때 다시 만듦)"""
+    path = _version_path(yq)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(uuid.uuid4().hex)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _load_demographic_aggregates(yq: int, version: int) -> DemographicAggregates:
+    """(분기, 버전) 별 집계 — 버전이 바뀌면 새 항목, 이전 버전은 max_entries 로 밀려남"""
+    return DemographicAggregates(yq, build_demographic_aggregates(int(yq)))
+
+
+def get_demographic_aggregates(yq: int) -> DemographicAggregates:
+    """
+    분기 하나의 인구통계 집계를 반환합니다. (버전이 같으면 프로세스당 한 번 생성)
+
+    Args:
+        yq: 분기
+
+    Returns:
+        DemographicAggregates: 분기 집계
+    """
+    return _load_demographic_aggregates(int(yq), aggregate_version(yq))
+
+
+def clear_demographic_aggregates():
+    """이 프로세스의 분기 집계를 모두 비웁니다. (캐시 비우기 버튼)"""
+    _load_demographic_aggregates.clear()
+
+
+def demographics_for(key: str, value, quarters=CURRENT_YQ) -> pd.DataFrame:
+    """
+    분기 범위의 상권/업종 성별·연령대 매출 합계를 반환합니다.
+
+    Args:
+        key: "area" 또는 "category"
+        value: 상권 코드 또는 업종명
+        quarters: 분기 범위 (시작, 끝)
+
+    Returns:
+        pd.DataFrame: sex, sales_by_gender, age, sales_by_age (성별 행과 연령대 행이 분리됨)
+    """
+    frames = [get_demographic_aggregates(yq).lookup(key, value) for yq in expand_quarters(quarters)]
+    if len(frames) == 1:
+        return frames[0]
+    df = pd.concat(frames, ignore_index=True)
+    sex = df[df["sex"].notna()].groupby("sex", as_index=False, sort=False)["sales_by_gender"].sum()
+    age = df[df["age"].notna()].groupby("age", as_index=False, sort=False)["sales_by_age"].sum()
+    return pd.concat([sex, age], ignore_index=True).reindex(columns=COLUMNS)
+
+
+def refresh_demographics(quarters=CURRENT_YQ) -> dict:
+    """
+    분기 집계를 원천에서 다시 만듭니다.
+    공유 디스크 캐시 항목을 지우고 버전을 올린 뒤 새로 만들어 저장합니다. 실행 중인 프로세스는
+    다음 조회 때 바뀐 버전을 보고 (디스크 캐시에서) 새 집계를 읽습니다.
+
+    Args:
+        quarters: 분기 범위 (시작, 끝)
+
+    Returns:
+        dict: {분기: {관계명: 행 수}}
+    """
+    out = {}
+    for yq in expand_quarters(quarters):
+        build_demographic_aggregates.invalidate(yq)
+        bump_aggregate_version(yq)
+        agg = get_demographic_aggregates(yq)
+        out[yq] = {name: len(df) for name, df in agg.relations.items()}
+    return out
+
+
+def main(argv=None):
+    """인구통계 집계 CLI 진입점"""
+    parser = argparse.ArgumentParser(description="성별/연령대 매출 사전 집계 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_refresh = sub.add_parser("refresh", help="분기 집계를 다시 만들어 공유 캐시에 저장")
+    p_refresh.add_argument("--quarters", type=int, nargs="+", default=list(CURRENT_YQ),
+                           help="분기 하나 또는 (시작, 끝)")
+    args = parser.parse_args(argv)
+
+    if args.command == "refresh":
+        t0 = time.perf_counter()
+        quarters = args.quarters[0] if len(args.quarters) == 1 else tuple(args.quarters[:2])
+        for yq, counts in refresh_demographics(quarters).items():
+            print(yq, " ".join(f"{name}={n:,}" for name, n in counts.items()))
+        print(f"✅ 인구통계 집계 갱신 완료 ({time.perf_counter() - t0:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
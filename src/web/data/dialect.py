@@ -0,0 +1,96 @@
+"""
+Dialect-aware engine construction
+DB_URL 종류에 맞는 SQLAlchemy 엔진 생성 (MySQL 서버 / SQLite·DuckDB 로컬 파일)
+
+예:
+    DB_URL=mysql+pymysql://user:pw@host:3306/db
+    DB_URL=sqlite:///../data/local.sqlite
+    DB_URL=duckdb:///../data/local.duckdb     (duckdb-engine 설치 필요)
+
+임베디드 엔진은 프로세스 안에서 집계를 실행하므로 네트워크 왕복이 없습니다.
+query.py 의 SQL 은 표준 SQL + expanding 바인드 파라미터만 사용하므로 세 dialect 에서 그대로 실행됩니다.
+"""
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from config import DB_POOL_SIZE, DB_MAX_OVERFLOW
+
+EMBEDDED_DIALECTS = ("sqlite", "duckdb")
+
+# SQLite 커넥션별 설정: 읽기 위주 집계 쿼리용 캐시/메모리 매핑
+SQLITE_PRAGMAS = (
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+def dialect_name(url) -> str:
+    """
+    DB URL 의 dialect 이름을 반환합니다.
+
+    Args:
+        url: SQLAlchemy DB URL
+
+    Returns:
+        str: "mysql", "sqlite", "duckdb" 등
+    """
+    return make_url(url).get_backend_name()
+
+
+def is_embedded(url) -> bool:
+    """프로세스 내 임베디드 엔진(SQLite/DuckDB) 여부"""
+    return dialect_name(url) in EMBEDDED_DIALECTS
+
+
+def engine_options(url, read_only: bool = True) -> dict:
+    """
+    dialect 별 create_engine 옵션을 만듭니다.
+
+    Args:
+        url: SQLAlchemy DB URL
+        read_only: 임베디드 파일을 읽기 전용으로 열지 여부
+            (DuckDB 는 읽기 전용일 때만 여러 프로세스가 같은 파일을 열 수 있음)
+
+    Returns:
+        dict: create_engine 키워드 인자
+    """
+    u = make_url(url)
+    name = u.get_backend_name()
+    in_memory = name in EMBEDDED_DIALECTS and u.database in (None, "", ":memory:")
+
+    opts = {"future": True}
+    if name == "sqlite":
+        opts["connect_args"] = {"check_same_thread": False}
+    elif name == "duckdb":
+        opts["connect_args"] = {"read_only": read_only and not in_memory}
+    else:
+        # 서버 DB: 끊긴 커넥션 감지, MySQL wait_timeout 전에 재연결
+        opts.update(pool_pre_ping=True, pool_recycle=3600)
+    if not in_memory:
+        opts.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW)
+    return opts
+
+
+def create_db_engine(url, read_only: bool = True):
+    """
+    DB URL 에 맞는 옵션으로 엔진을 생성합니다.
+
+    Args:
+        url: SQLAlchemy DB URL
+        read_only: 임베디드 파일을 읽기 전용으로 열지 여부
+
+    Returns:
+        sqlalchemy.engine.Engine: DB 엔진
+    """
+    engine = create_engine(url, **engine_options(url, read_only))
+    if engine.dialect.name == "sqlite":
+        pragmas = SQLITE_PRAGMAS + (("PRAGMA query_only = ON",) if read_only else ())
+
+        @event.listens_for(engine, "connect")
+        def _set_pragmas(dbapi_con, _):
+            cur = dbapi_con.cursor()
+            for p in pragmas:
+                cur.execute(p)
+            cur.close()
+    return engine
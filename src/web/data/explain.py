@@ -0,0 +1,198 @@
+"""
+EXPLAIN advisor for the fetchers
+fetch_* 함수가 실행하는 SQL 의 실행 계획을 수집하고 전체 테이블 스캔을 찾는 도구
+
+각 fetch_* 를 예시 인자로 호출해 실행된 SQL 을 모으고(data.source.capture_queries), 같은 파라미터로
+EXPLAIN 을 실행합니다. 매출 큐브/공유 캐시를 끄고 SQL 경로를 그대로 확인합니다.
+허용 목록 밖의 전체 스캔이 있으면 종료 코드 1 → 배포 전 계획 회귀 확인용.
+
+- SQLite: EXPLAIN QUERY PLAN 의 "SCAN <테이블>" (USING INDEX 없음)
+- MySQL: EXPLAIN 의 type = ALL
+- 그 밖의 dialect(DuckDB 등): 계획만 출력
+
+사용법 (src/web 에서 실행):
+    python -m data.explain [--url sqlite:///../data/local.sqlite] [--only demographics] [--plan]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from data.snapshot import SNAPSHOT_TABLES
+
+# 작은 차원 테이블은 전체 스캔 허용
+SMALL_TABLES = {"Service_Category", "Dong"}
+_ALIAS_RE = re.compile(r"\b(?:FROM|JOIN)\s+([A-Za-z_]\w*)(?:\s+(?:AS\s+)?([A-Za-z_]\w*))?", re.IGNORECASE)
+_SQL_KEYWORDS = {"WHERE", "JOIN", "LEFT", "INNER", "ON", "GROUP", "ORDER", "LIMIT", "USING"}
+
+
+def build_cases():
+    """
+    EXPLAIN 대상 목록을 만듭니다. (DB_URL 이 대상 DB 로 설정된 프로세스에서 호출)
+
+    Returns:
+        list[tuple]: (이름, 호출 함수, 전체 스캔 허용 테이블 집합)
+    """
+    from config import FOOD10, CURRENT_YQ
+    from data import query as q
+    from data.cube import build_sales_cube_frame
+    from data.demographics import build_demographic_aggregates
+
+    df_areas, _ = q.fetch_areas_and_categories()
+    area = int(df_areas["commercial_area_code"].iloc[0]) if len(df_areas) else 0
+    category = FOOD10[0]
+    yq = CURRENT_YQ[1]
+    # 상권 목록/매핑은 전체 상권을 읽는 것이 목적
+    all_areas = {"Commercial_Area"}
+    return [
+        # 참조 데이터는 프로세스당 한 번 읽으므로 원본 조회 함수를 직접 호출
+        ("load_areas_and_categories", q.load_areas_and_categories.__wrapped__, all_areas),
+        ("load_dong_map_for_areas", q.load_dong_map_for_areas.__wrapped__, all_areas),
+        ("fetch_sales_2024[all]", lambda: q.fetch_sales_2024(None, FOOD10), set()),
+        ("fetch_sales_2024[area]", lambda: q.fetch_sales_2024([area], FOOD10), set()),
+        ("fetch_floating_by_area_2024[all]", lambda: q.fetch_floating_by_area_2024(None), set()),
+        ("fetch_floating_by_area_2024[area]", lambda: q.fetch_floating_by_area_2024([area]), set()),
+        ("fetch_population_ga_2024[all]", lambda: q.fetch_population_ga_2024(None), set()),
+        ("fetch_population_ga_2024[area]", lambda: q.fetch_population_ga_2024([area]), set()),
+        ("fetch_income_2024", q.fetch_income_2024, set()),
+        ("fetch_commercial_area_analysis", lambda: q.fetch_commercial_area_analysis(area), set()),
+        ("fetch_category_area_ranking", lambda: q.fetch_category_area_ranking(category), set()),
+        ("fetch_population_patterns", lambda: q.fetch_population_patterns(area), set()),
+        ("fetch_time_patterns", lambda: q.fetch_time_patterns(area), set()),
+        ("fetch_category_time_patterns", lambda: q.fetch_category_time_patterns(category), set()),
+        ("build_demographic_aggregates", lambda: build_demographic_aggregates.__wrapped__(yq), set()),
+        # 큐브는 외식 10종 전체를 한 번에 집계하므로 업종 테이블 외 스캔도 예상됨
+        ("build_sales_cube_frame", build_sales_cube_frame.__wrapped__, {"Shop_Count"}),
+    ]
+
+
+def table_aliases(sql: str) -> dict:
+    """FROM/JOIN 절의 {별칭 또는 테이블명: 테이블명} (CTE 이름도 포함 — 판별 시 실제 테이블만 사용)"""
+    out = {}
+    for table, alias in _ALIAS_RE.findall(sql):
+        out[table] = table
+        if alias and alias.upper() not in _SQL_KEYWORDS:
+            out[alias] = table
+    return out
+
+
+def explain(con, sql: str, params: dict) -> tuple[list[str], list[str]]:
+    """
+    SQL 하나의 실행 계획과 전체 스캔 테이블을 반환합니다.
+
+    Args:
+        con: SQLAlchemy 커넥션
+        sql: SQL 문자열
+        params: 바인드 파라미터
+
+    Returns:
+        tuple: (계획 줄 목록, 전체 스캔 테이블 목록 — 판별을 지원하지 않는 dialect 는 빈 목록)
+    """
+    from data.source import bind_statement
+
+    dialect = con.dialect.name
+    aliases = table_aliases(sql)
+    prefix = {"sqlite": "EXPLAIN QUERY PLAN "}.get(dialect, "EXPLAIN ")
+    stmt, params = bind_statement(prefix + sql.lstrip(), params)
+    result = con.execute(stmt, params)
+    rows = [dict(r._mapping) for r in result]
+
+    plan, scans = [], []
+    if dialect == "sqlite":
+        for r in rows:
+            detail = r["detail"]
+            plan.append(detail)
+            m = re.match(r"SCAN (?:TABLE )?(\w+)", detail)
+            if m and "USING" not in detail and aliases.get(m.group(1)) in SNAPSHOT_TABLES:
+                scans.append(aliases[m.group(1)])
+    elif dialect == "mysql":
+        for r in rows:
+            plan.append(f"{r.get('table')}: type={r.get('type')} key={r.get('key')} rows={r.get('rows')}")
+            if r.get("type") == "ALL" and aliases.get(r.get("table")) in SNAPSHOT_TABLES:
+                scans.append(aliases[r["table"]])
+    else:
+        plan = [" | ".join(str(v) for v in r.values()) for r in rows]
+    return plan, scans
+
+
+def run_advisor(only=()) -> list[dict]:
+    """
+    모든 대상의 SQL 을 수집해 EXPLAIN 합니다.
+
+    Args:
+        only: 이름에 포함된 문자열로 대상 필터
+
+    Returns:
+        list[dict]: name, sql, plan, scans(전체 스캔 테이블), flagged(허용 목록 밖 전체 스캔)
+    """
+    from data.source import capture_queries, get_engine
+
+    results, seen = [], set()
+    engine = get_engine()
+    for name, fn, allowed in build_cases():
+        if only and not any(o in name for o in only):
+            continue
+        with capture_queries() as captured:
+            fn()
+        for sql, params in captured:
+            if sql in seen:
+                continue
+            seen.add(sql)
+            with engine.connect() as con:
+                plan, scans = explain(con, sql, params)
+            flagged = sorted({t for t in scans if t not in SMALL_TABLES | allowed})
+            results.append({"name": name, "sql": sql, "plan": plan, "scans": scans, "flagged": flagged})
+    return results
+
+
+def _child_env(url) -> dict:
+    """SQL 경로를 그대로 확인하도록 큐브/공유 캐시를 끄고 DB 를 직접 조회하는 자식 프로세스 환경변수"""
+    env = dict(os.environ)
+    env.update({
+        "SALES_CUBE_ENABLED": "0",
+        "RESULT_CACHE_ENABLED": "0",
+        "DATA_BACKEND": "db",
+        "WARMUP_ON_START": "0",
+        "METRICS_EXPORT_PATH": "",
+        "STREAMLIT_LOGGER_LEVEL": "error",
+    })
+    if url:
+        env["DB_URL"] = url
+    return env
+
+
+def main(argv=None):
+    """EXPLAIN 도구 CLI 진입점"""
+    parser = argparse.ArgumentParser(description="fetch_* SQL 실행 계획 점검")
+    parser.add_argument("--url", help="대상 DB URL (기본: DB_URL)")
+    parser.add_argument("--only", nargs="*", default=[], help="이름에 포함된 문자열로 대상 필터")
+    parser.add_argument("--plan", action="store_true", help="모든 계획 출력 (기본: 전체 스캔이 있는 문장만)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if not args.child:
+        # config 는 임포트 시점에 환경변수를 읽으므로 설정을 바꾼 별도 프로세스에서 실행
+        cmd = [sys.executable, "-m", "data.explain", "--child", *(["--plan"] if args.plan else [])]
+        cmd += ["--only", *args.only] if args.only else []
+        sys.exit(subprocess.run(cmd, env=_child_env(args.url), cwd=Path(__file__).parent.parent).returncode)
+
+    results = run_advisor(args.only)
+    n_flagged = 0
+    for r in results:
+        if r["flagged"]:
+            n_flagged += 1
+        if not (args.plan or r["scans"]):
+            continue
+        mark = "❌" if r["flagged"] else ("⚠️ " if r["scans"] else "✅")
+        print(f"{mark} {r['name']}" + (f" — 전체 스캔: {', '.join(r['flagged'])}" if r["flagged"] else ""))
+        for line in r["plan"]:
+            print(f"      {line}")
+    print(f"문장 {len(results)}개, 전체 스캔 경고 {n_flagged}개")
+    sys.exit(1 if n_flagged else 0)
+
+
+if __name__ == "__main__":
+    main()
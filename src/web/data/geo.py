@@ -0,0 +1,273 @@
+"""
+Preprocessed dong boundaries
+행정동 경계 GeoJSON 전처리 → GeoParquet 캐시
+
+원본 GeoJSON 을 한 번 읽어 구/동 이름과 정규화 키를 벡터 연산으로 만들고, 단순화 단계별 경계
+(GEO_SIMPLIFY_LEVELS)를 geometry_<단계> 컬럼으로 함께 저장합니다. 이후 로드는 Parquet 컬럼 읽기입니다.
+원본보다 오래된 캐시는 로드 시 자동으로 다시 만듭니다.
+
+상권 → 행정동 배정은 경계 STRtree 에 상권 좌표를 한 번에 질의하는 공간 조인입니다. (AreaDongIndex)
+Commercial_Area.dong_code 가 비었거나 오래된 상권도 좌표가 속한 동으로 배정됩니다.
+
+사용법 (src/web 에서 실행):
+    python -m data.geo build [--src GEOJSON] [--out PARQUET]
+    python -m data.geo assign
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+import streamlit as st
+from config import GEOJSON_PATH, GEO_PARQUET_PATH, GEO_SIMPLIFY_LEVELS, GEO_NEAREST_MAX_DEG
+
+ATTR_COLUMNS = ["adm_cd", "adm_nm", "gu", "dong_geo", "gu_n", "dong_geo_n"]
+
+
+def norm_series(s: pd.Series) -> pd.Series:
+    """utils.norm_txt 의 벡터 버전: 공백/괄호/하이픈 제거 (None → "")"""
+    return s.astype(object).fillna("").astype(str).str.replace(r"[\s()\-]", "", regex=True)
+
+
+def geometry_column(level: str) -> str:
+    """단순화 단계의 geometry 컬럼명 (full 은 원본 geometry)"""
+    if level not in GEO_SIMPLIFY_LEVELS:
+        raise ValueError(f"알 수 없는 경계 단계: {level} (가능: {', '.join(GEO_SIMPLIFY_LEVELS)})")
+    return "geometry" if not GEO_SIMPLIFY_LEVELS[level] else f"geometry_{level}"
+
+
+def preprocess_boundaries(src=GEOJSON_PATH, out=GEO_PARQUET_PATH) -> gpd.GeoDataFrame:
+    """
+    원본 GeoJSON 을 전처리해 GeoParquet 으로 저장합니다.
+
+    Args:
+        src: 원본 GeoJSON 경로
+        out: 출력 Parquet 경로
+
+    Returns:
+        geopandas.GeoDataFrame: 전처리된 경계 (geometry + geometry_<단계> 컬럼)
+    """
+    gdf = gpd.read_file(src)
+    gdf["adm_cd"] = gdf["adm_cd"].astype(str)
+    # adm_nm → [시, 구, 동]
+    toks = gdf["adm_nm"].astype(str).str.split()
+    gdf["gu"] = toks.str[1]
+    gdf["dong_geo"] = toks.str[2]
+    gdf["gu_n"] = norm_series(gdf["gu"])
+    gdf["dong_geo_n"] = norm_series(gdf["dong_geo"])
+    gdf = gdf[ATTR_COLUMNS + ["geometry"]]
+
+    for level, tolerance in GEO_SIMPLIFY_LEVELS.items():
+        if tolerance:
+            gdf[geometry_column(level)] = gdf.geometry.simplify(tolerance, preserve_topology=True)
+
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(".tmp")
+    gdf.to_parquet(tmp, index=False)
+    tmp.replace(out)
+    return gdf
+
+
+def load_boundaries(src=GEOJSON_PATH, level: str = "full", cache_path=GEO_PARQUET_PATH) -> gpd.GeoDataFrame:
+    """
+    전처리된 행정동 경계를 읽습니다. 캐시가 없거나 원본보다 오래되면 먼저 전처리합니다.
+
+    Args:
+        src: 원본 GeoJSON 경로
+        level: 경계 단순화 단계 ("full", "medium", "low")
+        cache_path: GeoParquet 캐시 경로
+
+    Returns:
+        geopandas.GeoDataFrame: adm_cd, adm_nm, gu, dong_geo, gu_n, dong_geo_n, geometry
+    """
+    col = geometry_column(level)
+    cache_path = Path(cache_path)
+    if not cache_path.is_file() or cache_path.stat().st_mtime < Path(src).stat().st_mtime:
+        gdf = preprocess_boundaries(src, cache_path)
+    else:
+        gdf = gpd.read_parquet(cache_path, columns=ATTR_COLUMNS + [col])
+    gdf = gdf[ATTR_COLUMNS + [col]].set_geometry(col)
+    return gdf.rename_geometry("geometry") if col != "geometry" else gdf
+
+
+def assign_points(boundaries: gpd.GeoDataFrame, lon, lat, max_distance: float = GEO_NEAREST_MAX_DEG) -> tuple:
+    """
+    좌표들을 행정동 경계에 한 번에 배정합니다. (STRtree 벡터 질의)
+    경계 안의 점은 포함하는 동, 경계 밖이지만 max_distance 이내인 점(하천변 등)은 가장 가까운 동에 배정합니다.
+
+    Args:
+        boundaries: load_boundaries 결과
+        lon: 경도 배열
+        lat: 위도 배열
+        max_distance: 최근접 배정 허용 거리 (도 단위)
+
+    Returns:
+        tuple: (feature 위치 배열 — 미배정 -1, 배정 방식 배열 — "within" / "nearest" / "")
+    """
+    lon = pd.to_numeric(pd.Series(lon), errors="coerce").to_numpy(dtype=float)
+    lat = pd.to_numeric(pd.Series(lat), errors="coerce").to_numpy(dtype=float)
+    valid = ~(np.isnan(lon) | np.isnan(lat))
+    points = shapely.points(lon, lat)
+
+    tree = shapely.STRtree(boundaries.geometry.values)
+    pos = np.full(len(points), -1)
+    how = np.full(len(points), "", dtype=object)
+
+    pi, gi = tree.query(points[valid], predicate="intersects")
+    # 경계선 위의 점은 두 동과 겹침 → 먼저 나온 동
+    _, first = np.unique(pi, return_index=True)
+    idx = np.flatnonzero(valid)[pi[first]]
+    pos[idx], how[idx] = gi[first], "within"
+
+    missing = np.flatnonzero(valid & (pos < 0))
+    if missing.size:
+        mi, mg = tree.query_nearest(points[missing], max_distance=max_distance, all_matches=False)
+        pos[missing[mi]], how[missing[mi]] = mg, "nearest"
+    return pos, how
+
+
+class AreaDongIndex:
+    """
+    상권 → 행정동 공간 조인 결과 조회 테이블.
+
+    Attributes:
+        areas: index=commercial_area_code, columns=adm_cd, gu, dong, dong_code, match
+            (match: "within" / "nearest" = 좌표로 배정, "code" = 경계 밖이라 DB dong_code 유지)
+        dongs: index=adm_cd, columns=gu, dong, dong_code (DB 행정동 코드, 없으면 NaN)
+    """
+
+    def __init__(self, areas: pd.DataFrame, dongs: pd.DataFrame):
+        self.areas = areas
+        self.dongs = dongs
+
+    def dong_code_of(self, area_code: int):
+        """상권의 DB 행정동 코드 (모르면 None)"""
+        if area_code not in self.areas.index:
+            return None
+        code = self.areas.at[area_code, "dong_code"]
+        return None if pd.isna(code) else code
+
+    def dong_codes(self, area_codes=None) -> list:
+        """상권들이 속한 DB 행정동 코드 목록 (중복 제거, None 이면 전체 상권)"""
+        codes = self.areas["dong_code"] if area_codes is None else \
+            self.areas["dong_code"].reindex(list(area_codes))
+        return codes.dropna().unique().tolist()
+
+    def lookup(self, area_codes) -> pd.DataFrame:
+        """상권별 배정 결과 (없는 상권은 NaN 행)"""
+        return self.areas.reindex(list(area_codes))
+
+
+def build_area_dong_index(dong_map: pd.DataFrame, boundaries: gpd.GeoDataFrame) -> AreaDongIndex:
+    """
+    상권 좌표를 행정동 경계에 공간 조인해 조회 테이블을 만듭니다.
+    경계의 DB 행정동 코드는 그 안에 있는 상권들의 dong_code 중 최빈값이며(잘못된 코드는 다수결로 보정),
+    상권이 없는 경계만 (구, 동) 이름으로 맞춥니다.
+
+    Args:
+        dong_map: fetch_dong_map_for_areas 결과
+        boundaries: load_boundaries 결과
+
+    Returns:
+        AreaDongIndex
+    """
+    pos, how = assign_points(boundaries, dong_map["lon"], dong_map["lat"])
+    hit = pos >= 0
+    adm_cd = boundaries["adm_cd"].to_numpy()
+
+    areas = dong_map[["commercial_area_code", "gu", "dong", "dong_code"]].copy()
+    areas["adm_cd"] = np.where(hit, adm_cd[np.maximum(pos, 0)], None)
+    areas["match"] = np.where(hit, how, "code")
+
+    # 경계별 DB 코드: 배정된 상권들의 dong_code 최빈값
+    voted = (areas.loc[hit].dropna(subset=["dong_code"])
+             .groupby(["adm_cd", "dong_code"]).size().rename("n").reset_index()
+             .sort_values(["adm_cd", "n"], ascending=[True, False])
+             .drop_duplicates("adm_cd").set_index("adm_cd")["dong_code"])
+    dongs = boundaries.set_index("adm_cd")[["gu", "dong_geo", "gu_n", "dong_geo_n"]].rename(columns={"dong_geo": "dong"})
+    dongs["dong_code"] = voted.reindex(dongs.index)
+
+    # 상권이 없는 경계: (구, 동) 정규화 이름이 DB 에서 하나의 코드로만 대응될 때만 사용
+    names = dong_map.dropna(subset=["dong_code"]).assign(
+        gu_n=norm_series(dong_map["gu"]), dong_n=norm_series(dong_map["dong_name"]))
+    names = names.drop_duplicates(["gu_n", "dong_n", "dong_code"])
+    names = names[~names.duplicated(["gu_n", "dong_n"], keep=False)].set_index(["gu_n", "dong_n"])["dong_code"]
+    by_name = names.reindex(pd.MultiIndex.from_arrays([dongs["gu_n"], dongs["dong_geo_n"]])).to_numpy()
+    dongs["dong_code"] = dongs["dong_code"].where(dongs["dong_code"].notna(), by_name)
+
+    # 좌표로 배정된 상권은 경계의 코드, 경계 밖 상권은 DB 코드 유지
+    resolved = areas["adm_cd"].map(dongs["dong_code"])
+    areas["dong_code"] = resolved.where(hit & resolved.notna(), areas["dong_code"])
+    areas["gu"] = areas["adm_cd"].map(dongs["gu"]).where(hit, areas["gu"])
+    areas["dong"] = areas["adm_cd"].map(dongs["dong"]).where(hit, areas["dong"])
+
+    if pd.api.types.is_integer_dtype(dong_map["dong_code"]):
+        # 결측 때문에 float 으로 바뀐 코드를 원래 정수형으로 (Income 과 같은 키 타입 유지)
+        areas["dong_code"] = areas["dong_code"].astype("Int64")
+        dongs["dong_code"] = dongs["dong_code"].astype("Int64")
+
+    areas = areas.set_index("commercial_area_code")[["adm_cd", "gu", "dong", "dong_code", "match"]]
+    return AreaDongIndex(areas, dongs[["gu", "dong", "dong_code"]])
+
+
+@st.cache_resource(show_spinner=False)
+def get_area_dong_index() -> AreaDongIndex:
+    """
+    상권 → 행정동 조회 테이블을 프로세스당 한 번 생성합니다.
+
+    Returns:
+        AreaDongIndex
+    """
+    from data.query import fetch_dong_map_for_areas
+    dong_map = fetch_dong_map_for_areas()
+    if not Path(GEOJSON_PATH).is_file():
+        # 경계 파일이 없으면 DB dong_code 그대로 사용
+        areas = dong_map.set_index("commercial_area_code")[["gu", "dong", "dong_code"]].assign(adm_cd=None, match="code")
+        return AreaDongIndex(areas[["adm_cd", "gu", "dong", "dong_code", "match"]],
+                             pd.DataFrame(columns=["gu", "dong", "dong_code"]).rename_axis("adm_cd"))
+    return build_area_dong_index(dong_map, load_boundaries(GEOJSON_PATH, "full"))
+
+
+def main(argv=None):
+    """경계 전처리 CLI 진입점"""
+    parser = argparse.ArgumentParser(description="행정동 경계 GeoJSON 전처리 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="GeoJSON 을 전처리해 GeoParquet 으로 저장")
+    p_build.add_argument("--src", default=str(GEOJSON_PATH), help="원본 GeoJSON")
+    p_build.add_argument("--out", default=str(GEO_PARQUET_PATH), help="출력 Parquet")
+    sub.add_parser("assign", help="상권 → 행정동 공간 조인 결과 요약")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        t0 = time.perf_counter()
+        gdf = preprocess_boundaries(args.src, args.out)
+        for level in GEO_SIMPLIFY_LEVELS:
+            geoms = gdf[geometry_column(level)].values
+            print(f"{level:<7} vertices={int(shapely.get_num_coordinates(geoms).sum()):>7,}")
+        print(f"✅ 경계 전처리 완료: {args.out} ({len(gdf)} dongs, {time.perf_counter() - t0:.1f}s)")
+    elif args.command == "assign":
+        from data.query import fetch_dong_map_for_areas
+        dong_map = fetch_dong_map_for_areas()
+        t0 = time.perf_counter()
+        index = build_area_dong_index(dong_map, load_boundaries(GEOJSON_PATH, "full"))
+        elapsed = time.perf_counter() - t0
+        areas = index.areas
+        before = dong_map.set_index("commercial_area_code")["dong_code"].reindex(areas.index)
+        assigned = areas["dong_code"].notna()
+        # 보정: DB 코드가 있었는데 다른 동으로 배정 / 채움: DB 코드가 비어 있던 상권에 배정
+        corrected = int((assigned & before.notna() & (areas["dong_code"] != before)).sum())
+        filled = int((assigned & before.isna()).sum())
+        for match, n in areas["match"].value_counts().items():
+            print(f"{match:<8} {n:>6,}")
+        print(f"dong_code 보정 {corrected:,}개, 빈 코드 채움 {filled:,}개, "
+              f"DB 코드 없는 경계 {int(index.dongs['dong_code'].isna().sum()):,}개")
+        print(f"✅ 상권 {len(areas):,}개 배정 완료 ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
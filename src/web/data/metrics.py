@@ -0,0 +1,238 @@
+"""
+Fetcher instrumentation
+fetch_* 조회 함수별 소요 시간 / 행 수 / 메모리 / 캐시 hit 계측
+
+- wall: 조회 함수 전체 소요 시간
+- db: SQL 실행 + 결과 수신 시간 (read_sql 내부)
+- frame: 결과 → DataFrame 생성 시간 (read_sql 내부)
+- hit: 호출 중 DB 조회가 한 번도 없었던 경우 (st.cache_data / 공유 캐시 / 큐브에서 처리)
+
+METRICS_EXPORT_PATH 를 설정하면 METRICS_EXPORT_INTERVAL 초마다 Prometheus 텍스트 포맷(.prom)
+또는 JSONL(.jsonl) 파일로 내보냅니다.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+from config import METRICS_EXPORT_PATH, METRICS_EXPORT_INTERVAL
+
+_local = threading.local()
+
+
+class FetchMetrics:
+    """
+    프로세스 단위 조회 계측 레지스트리 (스레드 안전).
+
+    Attributes:
+        stats: {조회 함수명: 누적 통계}
+        db_inflight: 현재 실행 중인 SQL 수
+        db_inflight_peak: 동시 실행 SQL 수 최대값 (커넥션 풀 크기 산정용)
+    """
+
+    FIELDS = ("calls", "hits", "misses", "errors", "wall", "db", "frame", "queries", "rows", "bytes", "wall_max")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {}
+        self.last = {}
+        self.db_inflight = 0
+        self.db_inflight_peak = 0
+        self.started_at = time.time()
+
+    def record(self, name: str, call: dict):
+        """조회 한 건의 계측 결과를 누적합니다."""
+        with self._lock:
+            s = self.stats.setdefault(name, dict.fromkeys(self.FIELDS, 0))
+            s["calls"] += 1
+            s["errors"] += call["error"]
+            s["hits" if call["queries"] == 0 else "misses"] += 1
+            for k in ("wall", "db", "frame", "queries", "rows", "bytes"):
+                s[k] += call[k]
+            s["wall_max"] = max(s["wall_max"], call["wall"])
+            self.last[name] = call
+
+    @contextmanager
+    def db_query(self):
+        """SQL 실행 구간 (동시 실행 수 추적)"""
+        with self._lock:
+            self.db_inflight += 1
+            self.db_inflight_peak = max(self.db_inflight_peak, self.db_inflight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.db_inflight -= 1
+
+    def snapshot(self) -> dict:
+        """누적 통계 사본"""
+        with self._lock:
+            return {name: dict(s) for name, s in self.stats.items()}
+
+    def reset(self):
+        """누적 통계를 초기화합니다."""
+        with self._lock:
+            self.stats.clear()
+            self.last.clear()
+            self.db_inflight_peak = self.db_inflight
+            self.started_at = time.time()
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        디버그 표시용 요약 테이블을 만듭니다.
+
+        Returns:
+            pd.DataFrame: 조회 함수별 호출 수, hit 률, 평균/최대 소요 시간, 평균 행 수/메모리
+        """
+        rows = []
+        with self._lock:
+            items = [(name, dict(s), dict(self.last.get(name, {}))) for name, s in self.stats.items()]
+        for name, s, last in items:
+            n = s["calls"] or 1
+            rows.append({
+                "fetcher": name,
+                "calls": s["calls"],
+                "hit%": round(100 * s["hits"] / n),
+                "avg ms": round(1000 * s["wall"] / n, 1),
+                "max ms": round(1000 * s["wall_max"], 1),
+                "db ms": round(1000 * s["db"] / n, 1),
+                "frame ms": round(1000 * s["frame"] / n, 1),
+                "rows": last.get("rows", 0),
+                "KB": round(last.get("bytes", 0) / 1024, 1),
+            })
+        df = pd.DataFrame(rows)
+        return df.sort_values("avg ms", ascending=False, ignore_index=True) if not df.empty else df
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 포맷 문자열"""
+        snap = self.snapshot()
+        lines = [
+            "# HELP dashboard_fetch_calls_total fetch_* calls by cache result",
+            "# TYPE dashboard_fetch_calls_total counter",
+        ]
+        for name, s in snap.items():
+            lines.append(f'dashboard_fetch_calls_total{{fetcher="{name}",result="hit"}} {s["hits"]}')
+            lines.append(f'dashboard_fetch_calls_total{{fetcher="{name}",result="miss"}} {s["misses"]}')
+        lines += ["# HELP dashboard_fetch_errors_total fetch_* calls that raised",
+                  "# TYPE dashboard_fetch_errors_total counter"]
+        lines += [f'dashboard_fetch_errors_total{{fetcher="{name}"}} {s["errors"]}' for name, s in snap.items()]
+        lines += ["# HELP dashboard_fetch_seconds_total time spent in fetch_* by phase",
+                  "# TYPE dashboard_fetch_seconds_total counter"]
+        for name, s in snap.items():
+            for phase in ("wall", "db", "frame"):
+                lines.append(f'dashboard_fetch_seconds_total{{fetcher="{name}",phase="{phase}"}} {s[phase]:.6f}')
+        for metric, key, help_ in (("queries", "queries", "SQL statements executed"),
+                                   ("rows", "rows", "rows returned"),
+                                   ("bytes", "bytes", "result memory size in bytes")):
+            lines += [f"# HELP dashboard_fetch_{metric}_total {help_}",
+                      f"# TYPE dashboard_fetch_{metric}_total counter"]
+            lines += [f'dashboard_fetch_{metric}_total{{fetcher="{name}"}} {s[key]}' for name, s in snap.items()]
+        lines += ["# HELP dashboard_db_inflight_peak max concurrent SQL statements",
+                  "# TYPE dashboard_db_inflight_peak gauge",
+                  f"dashboard_db_inflight_peak {self.db_inflight_peak}"]
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """
+        계측 결과를 파일로 내보냅니다.
+        .jsonl 이면 스냅샷 한 줄을 추가하고, 그 외에는 Prometheus 텍스트 파일을 원자적으로 교체합니다.
+
+        Args:
+            path: 출력 파일 경로
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".jsonl":
+            record = {"ts": time.time(), "pid": os.getpid(),
+                      "db_inflight_peak": self.db_inflight_peak, "fetchers": self.snapshot()}
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(self.to_prometheus(), encoding="utf-8")
+            os.replace(tmp, path)
+
+
+@st.cache_resource(show_spinner=False)
+def get_fetch_metrics() -> FetchMetrics:
+    """프로세스당 하나의 계측 레지스트리"""
+    return FetchMetrics()
+
+
+def _frame_stats(result) -> tuple[int, int]:
+    """결과(DataFrame 또는 DataFrame 을 담은 tuple)의 행 수와 메모리 크기"""
+    frames = result if isinstance(result, tuple) else (result,)
+    rows = size = 0
+    for f in frames:
+        if isinstance(f, pd.DataFrame):
+            rows += len(f)
+            size += int(f.memory_usage(deep=True).sum())
+    return rows, size
+
+
+def instrument(fn):
+    """
+    조회 함수를 계측하는 데코레이터. st.cache_data 바깥(위)에 붙여 캐시 hit 도 기록합니다.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        stack = _local.__dict__.setdefault("stack", [])
+        call = {"wall": 0.0, "db": 0.0, "frame": 0.0, "queries": 0, "rows": 0, "bytes": 0, "error": 0}
+        stack.append(call)
+        t0 = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            call["error"] = 1
+            raise
+        else:
+            call["rows"], call["bytes"] = _frame_stats(result)
+            return result
+        finally:
+            call["wall"] = time.perf_counter() - t0
+            stack.pop()
+            get_fetch_metrics().record(fn.__name__, call)
+    return wrapper
+
+
+def record_query(db_time: float, frame_time: float):
+    """
+    read_sql 한 번의 DB / DataFrame 생성 시간을 진행 중인 모든 계측 호출에 더합니다.
+    (조회 함수가 다른 조회 함수를 호출하는 경우 양쪽 모두에 반영)
+    """
+    for call in getattr(_local, "stack", ()):
+        call["db"] += db_time
+        call["frame"] += frame_time
+        call["queries"] += 1
+
+
+def _export_loop(path, interval: float):
+    metrics = get_fetch_metrics()
+    while True:
+        time.sleep(interval)
+        try:
+            metrics.export(path)
+        except OSError:
+            pass
+
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_exporter():
+    """
+    METRICS_EXPORT_PATH 가 설정되어 있으면 주기적 내보내기 스레드를 프로세스당 한 번 시작합니다.
+
+    Returns:
+        threading.Thread | None: 내보내기 스레드
+    """
+    if not METRICS_EXPORT_PATH:
+        return None
+    t = threading.Thread(target=_export_loop, args=(METRICS_EXPORT_PATH, METRICS_EXPORT_INTERVAL),
+                         name="metrics-export", daemon=True)
+    t.start()
+    return t
@@ -0,0 +1,164 @@
+"""
+Index migrations for the query access paths
+query.py 조회 경로에 맞춘 인덱스 마이그레이션
+
+마이그레이션은 버전 순서대로 적용되는 인덱스 묶음이며, 이미 있는 인덱스는 건너뜁니다(멱등).
+적용 상태는 인덱스 존재 여부로 판단하므로 별도 이력 테이블이 없습니다.
+스냅샷 적재(SQLite)와 벤치마크 fixture 도 같은 목록으로 인덱스를 만듭니다.
+
+사용법 (src/web 에서 실행):
+    python -m data.migrations status [--url URL]
+    python -m data.migrations apply [--url URL] [--dry-run]
+"""
+
+import argparse
+
+from sqlalchemy import inspect
+
+# (버전, 설명, {인덱스명: (테이블, (컬럼, ...))})
+MIGRATIONS = (
+    (1, "foreign key indexes", {
+        # MySQL InnoDB 는 외래키에 인덱스를 자동 생성 → 로컬 파일 DB 도 같은 조건으로 맞춤
+        "fk_shop_area": ("Shop_Count", ("commercial_area_code",)),
+        "fk_shop_category": ("Shop_Count", ("service_category_code",)),
+        "fk_sales_daytype_store": ("Sales_Daytype", ("store_id",)),
+        "fk_sales_sex_store": ("Sales_Sex", ("store_id",)),
+        "fk_sales_age_store": ("Sales_Age", ("store_id",)),
+        "fk_fpop_area": ("Floating_Population", ("commercial_area_code",)),
+        "fk_pga_area": ("Population_GA", ("commercial_area_code",)),
+        "fk_income_dong": ("Income", ("dong_code",)),
+        "fk_area_dong": ("Commercial_Area", ("dong_code",)),
+    }),
+    (2, "composite access-path indexes", {
+        # 분기 + 상권 (+ 업종): 매출/상권 분석, 분기별 인구통계 집계, 매출 큐브
+        "ix_shop_yq_area_cat": ("Shop_Count", ("year_quarter", "commercial_area_code", "service_category_code")),
+        # 업종 + 분기: 업종 순위, 업종별 상권 매출
+        "ix_shop_cat_yq": ("Shop_Count", ("service_category_code", "year_quarter")),
+        # 점포별 매출 합계 — 매출 컬럼까지 포함해 테이블 조회 없이 SUM
+        "ix_sales_daytype_store_sales": ("Sales_Daytype", ("store_id", "sales")),
+        "ix_sales_sex_store_sex": ("Sales_Sex", ("store_id", "sex", "sales")),
+        "ix_sales_age_store_age": ("Sales_Age", ("store_id", "age", "sales")),
+        # 분기 + 상권: 유동인구, 시간대 프로필
+        "ix_fpop_yq_area": ("Floating_Population", ("year_quarter", "commercial_area_code")),
+        # 분기 + 상권 + 상주/직장 구분: 상주/직장 인구
+        "ix_pga_yq_area_type": ("Population_GA", ("year_quarter", "commercial_area_code", "pop_type")),
+        # 분기 + 행정동: 소득/지출
+        "ix_income_yq_dong": ("Income", ("year_quarter", "dong_code")),
+        # 업종명 조회 (sc.name = :category_name)
+        "ix_category_name": ("Service_Category", ("name",)),
+    }),
+)
+
+
+def all_indexes() -> dict:
+    """모든 마이그레이션의 인덱스를 버전 순서대로 합친 {인덱스명: (테이블, 컬럼들)}"""
+    out = {}
+    for _, _, indexes in MIGRATIONS:
+        out.update(indexes)
+    return out
+
+
+def index_ddl(name: str, table: str, columns, if_not_exists: bool = False) -> str:
+    """
+    CREATE INDEX 문을 만듭니다.
+
+    Args:
+        name: 인덱스명
+        table: 테이블명
+        columns: 컬럼명 목록
+        if_not_exists: IF NOT EXISTS 사용 여부 (SQLite/DuckDB 만 지원, MySQL 미지원)
+
+    Returns:
+        str: DDL
+    """
+    guard = "IF NOT EXISTS " if if_not_exists else ""
+    return f"CREATE INDEX {guard}{name} ON {table}({', '.join(columns)})"
+
+
+def existing_indexes(engine) -> tuple[set, set]:
+    """
+    DB 에 있는 테이블과 인덱스 이름을 조회합니다.
+
+    Returns:
+        tuple: (테이블명 집합, 인덱스명 집합)
+    """
+    insp = inspect(engine)
+    tables = set(insp.get_table_names())
+    names = set()
+    for table in tables:
+        try:
+            names.update(ix["name"] for ix in insp.get_indexes(table))
+        except NotImplementedError:
+            pass
+    return tables, names
+
+
+def migration_status(engine) -> list[dict]:
+    """
+    마이그레이션별 적용 상태를 반환합니다.
+
+    Returns:
+        list[dict]: version, description, applied, missing(없는 인덱스명 목록)
+    """
+    tables, names = existing_indexes(engine)
+    out = []
+    for version, description, indexes in MIGRATIONS:
+        missing = [n for n, (t, _) in indexes.items() if t in tables and n not in names]
+        out.append({"version": version, "description": description, "applied": not missing, "missing": missing})
+    return out
+
+
+def apply_migrations(engine, dry_run: bool = False) -> list[str]:
+    """
+    없는 인덱스를 버전 순서대로 만듭니다. (대상 테이블이 없는 인덱스는 건너뜀)
+
+    Args:
+        engine: 대상 DB 엔진 (쓰기 가능)
+        dry_run: True 면 실행하지 않고 DDL 만 반환
+
+    Returns:
+        list[str]: 실행한(또는 실행할) DDL 목록
+    """
+    tables, names = existing_indexes(engine)
+    embedded = engine.dialect.name in ("sqlite", "duckdb")
+    ddls = [index_ddl(n, t, cols, if_not_exists=embedded)
+            for n, (t, cols) in all_indexes().items() if t in tables and n not in names]
+    if ddls and not dry_run:
+        with engine.begin() as con:
+            for ddl in ddls:
+                con.exec_driver_sql(ddl)
+    return ddls
+
+
+def main(argv=None):
+    """인덱스 마이그레이션 CLI 진입점"""
+    from config import DB_URL
+    from data.dialect import create_db_engine
+
+    parser = argparse.ArgumentParser(description="조회 경로 인덱스 마이그레이션")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("status", "마이그레이션 적용 상태"), ("apply", "없는 인덱스 생성")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--url", default=DB_URL, help="대상 DB URL (기본: DB_URL)")
+        if name == "apply":
+            p.add_argument("--dry-run", action="store_true", help="DDL 만 출력")
+    args = parser.parse_args(argv)
+    if not args.url:
+        parser.error("DB_URL 이 설정되어 있지 않습니다. --url 을 지정하세요.")
+
+    engine = create_db_engine(args.url, read_only=args.command == "status")
+    if args.command == "status":
+        for m in migration_status(engine):
+            mark = "✅" if m["applied"] else "⏳"
+            print(f"{mark} {m['version']:03d} {m['description']}" + (f" (missing: {', '.join(m['missing'])})"
+                                                                      if m["missing"] else ""))
+    else:
+        ddls = apply_migrations(engine, dry_run=args.dry_run)
+        for ddl in ddls:
+            print(f"{ddl};")
+        print(f"{'📝' if args.dry_run else '✅'} 인덱스 {len(ddls)}개 {'(dry-run)' if args.dry_run else '생성 완료'}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
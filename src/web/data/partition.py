@@ -0,0 +1,69 @@
+"""
+Quarter partition helpers
+분기 단위 파티션 조회/결합 헬퍼
+
+fetch_* 함수는 분기 하나를 조회하는 파티션 함수(st.cache_data)를 분기별로 호출하고 결과를 결합합니다.
+이미 캐시된 분기는 다시 조회하지 않으므로, 새 분기가 추가되면 해당 분기만 조회됩니다.
+"""
+
+import pandas as pd
+
+
+def expand_quarters(quarters) -> list[int]:
+    """
+    분기 범위를 분기 목록으로 펼칩니다.
+
+    Args:
+        quarters: (시작, 끝) 분기 범위 (예: (20241, 20244)) 또는 분기 하나
+
+    Returns:
+        list[int]: 분기 목록 (예: [20241, 20242, 20243, 20244])
+    """
+    if isinstance(quarters, int):
+        return [quarters]
+    start, end = (int(q) for q in quarters)
+    out = []
+    y, q = divmod(start, 10)
+    while y * 10 + q <= end:
+        out.append(y * 10 + q)
+        y, q = (y + 1, 1) if q == 4 else (y, q + 1)
+    return out
+
+
+def fetch_partitioned(fetch_quarter, quarters, *args, **kwargs) -> list[pd.DataFrame]:
+    """
+    분기별 파티션 함수를 호출해 결과 목록을 반환합니다.
+
+    Args:
+        fetch_quarter: 분기 하나를 조회하는 함수 (첫 인자 = 분기)
+        quarters: 분기 범위
+        *args, **kwargs: 파티션 함수 인자
+
+    Returns:
+        list[pd.DataFrame]: 분기별 결과
+    """
+    return [fetch_quarter(yq, *args, **kwargs) for yq in expand_quarters(quarters)]
+
+
+def combine_partitions(frames, by=(), sums=(), means=()) -> pd.DataFrame:
+    """
+    분기별 결과를 하나로 결합합니다.
+
+    Args:
+        frames: 분기별 DataFrame 목록
+        by: 결합 기준 컬럼 (없으면 전체를 한 행으로 결합)
+        sums: 분기 간 합산할 컬럼
+        means: 분기 간 평균낼 컬럼
+
+    Returns:
+        pd.DataFrame: 결합된 결과
+    """
+    if len(frames) == 1:
+        return frames[0]
+    df = pd.concat(frames, ignore_index=True)
+    agg = {c: "sum" for c in sums if c in df.columns} | {c: "mean" for c in means if c in df.columns}
+    if not by:
+        if df.empty:
+            return df
+        return df.agg(agg).to_frame().T[list(agg)]
+    return df.groupby(list(by), as_index=False, sort=False, dropna=False, observed=True).agg(agg)
@@ -0,0 +1,107 @@
+"""
+Parallel fetch planner
+페이지 단위 조회 계획 — 서로 독립적인 fetch_* 호출을 스레드 풀에서 동시에 실행
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from config import FETCH_MAX_WORKERS
+from data.source import get_engine
+
+
+def _pool_capacity() -> int:
+    """SQLAlchemy 커넥션 풀 크기 (풀 크기를 넘는 동시 조회는 커넥션 대기만 늘림)"""
+    pool = get_engine().pool
+    # QueuePool 만 size() 를 가짐. StaticPool(스냅샷) 등은 단일 커넥션
+    return pool.size() if hasattr(pool, "size") else 1
+
+
+@st.cache_resource(show_spinner=False)
+def get_fetch_executor() -> ThreadPoolExecutor:
+    """
+    프로세스 공용 조회 스레드 풀을 생성합니다.
+
+    Returns:
+        ThreadPoolExecutor: 커넥션 풀 크기로 제한된 스레드 풀
+    """
+    workers = FETCH_MAX_WORKERS or _pool_capacity()
+    return ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="fetch")
+
+
+class FetchPlan:
+    """
+    한 페이지에서 필요한 조회 목록을 선언하고 병렬로 실행합니다.
+
+    사용 예:
+        plan = FetchPlan("area")
+        plan.add("sales", fetch_sales_2024, codes, cats)
+        plan.add("fpop", fetch_floating_by_area_2024, codes)
+        results = plan.run()
+
+    Attributes:
+        name: 계획 이름 (타이밍 기록용)
+        timings: 조회별 소요 시간(초)
+        wall_time: 전체 소요 시간(초)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.tasks = {}
+        self.timings = {}
+        self.wall_time = 0.0
+
+    def add(self, key: str, fn, *args, **kwargs):
+        """조회를 계획에 추가합니다."""
+        self.tasks[key] = (fn, args, kwargs)
+        return self
+
+    def run(self) -> dict:
+        """
+        모든 조회를 실행합니다.
+
+        Returns:
+            dict: {key: 조회 결과}
+        """
+        ctx = get_script_run_ctx(suppress_warning=True)
+
+        def _timed(key, fn, args, kwargs):
+            # 워커 스레드에서도 st.cache_data 등이 현재 세션 컨텍스트를 쓰도록 연결
+            if ctx is not None:
+                add_script_run_ctx(threading.current_thread(), ctx)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.timings[key] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        if len(self.tasks) <= 1:
+            results = {k: _timed(k, fn, a, kw) for k, (fn, a, kw) in self.tasks.items()}
+        else:
+            executor = get_fetch_executor()
+            futures = {k: executor.submit(_timed, k, fn, a, kw) for k, (fn, a, kw) in self.tasks.items()}
+            results = {k: f.result() for k, f in futures.items()}
+        self.wall_time = time.perf_counter() - t0
+
+        _record_timings(self)
+        return results
+
+    def summary(self) -> str:
+        """타이밍 요약 문자열"""
+        parts = ", ".join(f"{k}={v * 1000:.0f}ms" for k, v in self.timings.items())
+        return f"[{self.name}] wall={self.wall_time * 1000:.0f}ms ({parts})"
+
+
+def _record_timings(plan: FetchPlan):
+    """최근 실행 타이밍을 세션 상태에 기록합니다. (디버그 섹션 표시용)"""
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return
+    st.session_state.setdefault("fetch_timings", {})[plan.name] = {
+        "wall": plan.wall_time,
+        "sum": sum(plan.timings.values()),
+        "queries": dict(plan.timings),
+    }
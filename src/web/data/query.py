@@ -4,19 +4,38 @@ Database query functions for the Seoul Commercial Area Analysis Dashboard
 """
 
 import pandas as pd
-from sqlalchemy import create_engine, text
 import streamlit as st
-from config import DB_URL, FOOD10, ALL_YQ
-
-
-# Database engine
-engine = create_engine(DB_URL, pool_pre_ping=True, future=True)
-
-
-@st.cache_data(show_spinner=False)
+from config import (
+    FOOD10, ALL_YQ, CURRENT_YQ, SALES_CUBE_ENABLED,
+    TIME_PERIODS, DAY_COLUMNS, GENDER_COLUMNS, CATEGORY_TIME_TOP_N
+)
+from data.source import read_sql
+from data.result_cache import shared_cache
+from data.metrics import instrument
+from data.cube import get_sales_cube
+from data.demographics import demographics_for
+from data.partition import expand_quarters, fetch_partitioned, combine_partitions
+from data.reference import get_reference_data
+from data.schema import apply_schema
+
+
+@instrument
 def fetch_areas_and_categories():
     """
     상권 정보와 카테고리 정보를 가져옵니다.
+    프로세스 공유 참조 데이터(data/reference.py)의 읽기 전용 뷰이며 세션별 사본을 만들지 않습니다.
+    
+    Returns:
+        tuple: (상권 데이터프레임 — display_name, area_label 포함, 카테고리 리스트)
+    """
+    ref = get_reference_data()
+    return ref.frame("areas"), list(ref.categories)
+
+
+@shared_cache()
+def load_areas_and_categories():
+    """
+    상권 정보와 카테고리 정보를 조회합니다. (참조 데이터 빌드용)
     
     Returns:
         tuple: (상권 데이터프레임, 카테고리 리스트)
@@ -29,30 +48,44 @@ def fetch_areas_and_categories():
     WHERE ca.lon IS NOT NULL AND ca.lat IS NOT NULL
     ORDER BY ca.gu, ca.dong, ca.name
     """
-    df_areas = pd.read_sql(text(q), engine)
+    df_areas = apply_schema(read_sql(q), "areas")
 
     qcat = "SELECT name AS category_name FROM Service_Category WHERE name IN :names ORDER BY name"
-    df_cats = pd.read_sql(text(qcat), engine, params={"names": tuple(FOOD10)})
+    df_cats = read_sql(qcat, {"names": tuple(FOOD10)})
 
     return df_areas, df_cats["category_name"].tolist()
 
 
-@st.cache_data(show_spinner=False)
-def fetch_sales_2024(selected_areas: list[int] | None, selected_cats: list[str], cache_key=None):
+@instrument
+def fetch_sales_2024(selected_areas: list[int] | None, selected_cats: list[str], cache_key=None,
+                     quarters=CURRENT_YQ):
     """
-    2024년 매출 데이터를 가져옵니다.
+    매출 데이터를 가져옵니다.
     
     Args:
         selected_areas: 선택된 상권 코드 리스트
         selected_cats: 선택된 카테고리 리스트
-        cache_key: 캐시 키
+        cache_key: 사용하지 않음 (이전 호출 호환용 — 캐시는 조회 인자로 구분)
+        quarters: 분기 범위 (시작, 끝)
         
     Returns:
-        pd.DataFrame: 매출 데이터
+        pd.DataFrame: 매출 데이터 (기간 합계)
     """
-    # Sum 2024 Sales_Daytype by area, filtered by categories and/or areas
-    where = ["sc.year_quarter = 20244", "cat.name IN :cats"]
-    params = {"cats": tuple(selected_cats)}
+    if SALES_CUBE_ENABLED:
+        return apply_schema(get_sales_cube().area_totals(selected_cats, selected_areas, expand_quarters(quarters)),
+                            "sales")
+
+    frames = fetch_partitioned(_fetch_sales_q, quarters, selected_areas, selected_cats)
+    return combine_partitions(frames, by=["commercial_area_code"], sums=["sales_sum_2024"])
+
+
+@st.cache_data(show_spinner=False)
+@shared_cache()
+def _fetch_sales_q(yq: int, selected_areas: list[int] | None, selected_cats: list[str]):
+    """fetch_sales_2024 의 분기 파티션"""
+    # Sum Sales_Daytype by area, filtered by categories and/or areas
+    where = ["sc.year_quarter = :yq", "cat.name IN :cats"]
+    params = {"yq": yq, "cats": tuple(selected_cats)}
     if selected_areas:
         where.append("sc.commercial_area_code IN :areas")
         params["areas"] = tuple(int(x) for x in selected_areas)
@@ -66,23 +99,32 @@ def fetch_sales_2024(selected_areas: list[int] | None, selected_cats: list[str],
     WHERE {' AND '.join(where)}
     GROUP BY sc.commercial_area_code
     """
-    return pd.read_sql(text(sql), engine, params=params)
+    return apply_schema(read_sql(sql, params), "sales")
 
 
-@st.cache_data(show_spinner=False)
-def fetch_floating_by_area_2024(selected_areas: list[int] | None, cache_key=None):
+@instrument
+def fetch_floating_by_area_2024(selected_areas: list[int] | None, cache_key=None, quarters=CURRENT_YQ):
     """
-    2024년 지역별 유동인구 데이터를 가져옵니다.
+    지역별 유동인구 데이터를 가져옵니다.
     
     Args:
         selected_areas: 선택된 상권 코드 리스트
-        cache_key: 캐시 키
+        cache_key: 사용하지 않음 (이전 호출 호환용 — 캐시는 조회 인자로 구분)
+        quarters: 분기 범위 (시작, 끝)
         
     Returns:
-        pd.DataFrame: 유동인구 데이터
+        pd.DataFrame: 유동인구 데이터 (분기 평균)
     """
-    where = ["year_quarter = 20244"]
-    params = {}
+    frames = fetch_partitioned(_fetch_floating_q, quarters, selected_areas)
+    return combine_partitions(frames, by=["commercial_area_code"], means=DAY_COLUMNS + TIME_PERIODS + GENDER_COLUMNS)
+
+
+@st.cache_data(show_spinner=False)
+@shared_cache()
+def _fetch_floating_q(yq: int, selected_areas: list[int] | None):
+    """fetch_floating_by_area_2024 의 분기 파티션"""
+    where = ["year_quarter = :yq"]
+    params = {"yq": yq}
     if selected_areas:
         where.append("commercial_area_code IN :areas")
         params["areas"] = tuple(int(x) for x in selected_areas)
@@ -98,77 +140,103 @@ def fetch_floating_by_area_2024(selected_areas: list[int] | None, cache_key=None
     WHERE {' AND '.join(where)}
     GROUP BY commercial_area_code
     """
-    return pd.read_sql(text(sql), engine, params=params)
+    return apply_schema(read_sql(sql, params), "floating")
 
 
-@st.cache_data(show_spinner=False)
-def fetch_population_ga_2024(selected_areas: list[int] | None, cache_key=None):
+@instrument
+def fetch_population_ga_2024(selected_areas: list[int] | None, cache_key=None, quarters=CURRENT_YQ):
     """
-    2024년 상주/직장 인구 데이터를 가져옵니다.
+    상주/직장 인구 데이터를 가져옵니다.
     
     Args:
         selected_areas: 선택된 상권 코드 리스트
-        cache_key: 캐시 키
+        cache_key: 사용하지 않음 (이전 호출 호환용 — 캐시는 조회 인자로 구분)
+        quarters: 분기 범위 (시작, 끝)
         
     Returns:
         pd.DataFrame: 상주/직장 인구 데이터
     """
-    # Sum by quarter then average across quarters, per area_code and pop_type
-    where = ["year_quarter = 20244"]
-    params = {}
+    # Sum by quarter (partition) then average across quarters, per area_code and pop_type
+    frames = fetch_partitioned(_fetch_population_ga_q, quarters, selected_areas)
+    return combine_partitions(frames, by=["commercial_area_code"], means=["resident", "worker"])
+
+
+@st.cache_data(show_spinner=False)
+@shared_cache()
+def _fetch_population_ga_q(yq: int, selected_areas: list[int] | None):
+    """fetch_population_ga_2024 의 분기 파티션"""
+    where = ["pg.year_quarter = :yq"]
+    params = {"yq": yq}
     if selected_areas:
         where.append("pg.commercial_area_code IN :areas")
         params["areas"] = tuple(int(x) for x in selected_areas)
 
     sql = f"""
     WITH agg AS (
-      SELECT year_quarter, pg.commercial_area_code, pg.pop_type,
+      SELECT pg.commercial_area_code, pg.pop_type,
              SUM(pg.population) AS pop_sum
       FROM Population_GA pg
       WHERE {' AND '.join(where)}
-      GROUP BY year_quarter, pg.commercial_area_code, pg.pop_type
+      GROUP BY pg.commercial_area_code, pg.pop_type
     )
     SELECT commercial_area_code,
-           MAX(CASE WHEN pop_type='RESIDENT' THEN pop_avg ELSE 0 END) AS resident,
-           MAX(CASE WHEN pop_type='WORKING'  THEN pop_avg ELSE 0 END) AS worker
-    FROM (
-      SELECT commercial_area_code, pop_type, AVG(pop_sum) AS pop_avg
-      FROM agg
-      GROUP BY commercial_area_code, pop_type
-    ) t
+           MAX(CASE WHEN pop_type='RESIDENT' THEN pop_sum ELSE 0 END) AS resident,
+           MAX(CASE WHEN pop_type='WORKING'  THEN pop_sum ELSE 0 END) AS worker
+    FROM agg
     GROUP BY commercial_area_code
     """
-    return pd.read_sql(text(sql), engine, params=params)
+    return apply_schema(read_sql(sql, params), "population_ga")
 
 
-@st.cache_data(show_spinner=False)
-def fetch_income_2024(cache_key=None):
+@instrument
+def fetch_income_2024(cache_key=None, quarters=CURRENT_YQ):
     """
-    2024년 소득/지출 데이터를 가져옵니다.
+    소득/지출 데이터를 가져옵니다.
     
     Args:
-        cache_key: 캐시 키
+        cache_key: 사용하지 않음 (이전 호출 호환용 — 캐시는 조회 인자로 구분)
+        quarters: 분기 범위 (시작, 끝)
         
     Returns:
-        pd.DataFrame: 소득/지출 데이터
+        pd.DataFrame: 소득/지출 데이터 (기간 합계)
     """
-    sql = f"""
+    frames = fetch_partitioned(_fetch_income_q, quarters)
+    return combine_partitions(frames, by=["dong_code", "dong_name"],
+                              sums=["total_expenditure", "food_expenditure"])
+
+
+@st.cache_data(show_spinner=False)
+@shared_cache()
+def _fetch_income_q(yq: int):
+    """fetch_income_2024 의 분기 파티션"""
+    sql = """
     SELECT i.dong_code,
            d.name AS dong_name,
            SUM(i.total_expenditure) AS total_expenditure,
            SUM(i.food_expenditure)  AS food_expenditure
     FROM Income i
     JOIN Dong d ON d.code = i.dong_code
-    WHERE i.year_quarter = 20244
+    WHERE i.year_quarter = :yq
     GROUP BY i.dong_code, d.name
     """
-    return pd.read_sql(text(sql), engine)
+    return apply_schema(read_sql(sql, {"yq": yq}), "income")
 
 
-@st.cache_data(show_spinner=False)
+@instrument
 def fetch_dong_map_for_areas():
     """
-    상권 코드와 동 정보 매핑 데이터를 가져옵니다.
+    상권 코드와 동 정보 매핑 데이터를 가져옵니다. (프로세스 공유 참조 데이터의 읽기 전용 뷰)
+    
+    Returns:
+        pd.DataFrame: 상권-동 매핑 데이터
+    """
+    return get_reference_data().frame("dong_map")
+
+
+@shared_cache()
+def load_dong_map_for_areas():
+    """
+    상권 코드와 동 정보 매핑 데이터를 조회합니다. (참조 데이터 빌드용)
     
     Returns:
         pd.DataFrame: 상권-동 매핑 데이터
@@ -181,26 +249,43 @@ def fetch_dong_map_for_areas():
     LEFT JOIN Dong d ON d.code = ca.dong_code
     WHERE ca.lon IS NOT NULL AND ca.lat IS NOT NULL
     """
-    return pd.read_sql(text(sql), engine)
+    return apply_schema(read_sql(sql), "dong_map")
 
 
 # ===============================
 # 🎯 RECOMMENDATION QUERY FUNCTIONS
 # ===============================
 
-@st.cache_data(show_spinner=False)
-def fetch_commercial_area_analysis(area_code: int, cache_key=None):
-    import numpy as np
+@instrument
+def fetch_commercial_area_analysis(area_code: int, cache_key=None, quarters=CURRENT_YQ):
     """
     특정 상권의 업종별 분석 데이터를 가져옵니다.
+    여러 분기를 조회하면 매출은 합산, 점포 수는 분기 평균입니다.
     
     Args:
         area_code: 상권 코드
-        cache_key: 캐시 키
+        cache_key: 사용하지 않음 (이전 호출 호환용 — 캐시는 조회 인자로 구분)
+        quarters: 분기 범위 (시작, 끝)
         
     Returns:
         pd.DataFrame: 상권별 업종 분석 데이터
     """
+    if SALES_CUBE_ENABLED:
+        df = apply_schema(get_sales_cube().area_breakdown(area_code, expand_quarters(quarters)), "area_analysis")
+    else:
+        frames = fetch_partitioned(_fetch_commercial_area_analysis_q, quarters, area_code)
+        df = combine_partitions(frames, by=["commercial_area_name", "service_category_name"],
+                                sums=["total_sales"], means=["shop_count"])
+        df["shop_count"] = pd.to_numeric(df["shop_count"]).round().astype(int)
+
+    df["avg_sales"] = (df["total_sales"] // df["shop_count"].where(df["shop_count"] != 0)).fillna(0).astype(int)
+    return df.sort_values("avg_sales", ascending=False)
+
+
+@st.cache_data(show_spinner=False)
+@shared_cache()
+def _fetch_commercial_area_analysis_q(yq: int, area_code: int):
+    """fetch_commercial_area_analysis 의 분기 파티션"""
     sql = """
     SELECT 
         ca.name AS commercial_area_name,
@@ -214,152 +299,170 @@ def fetch_commercial_area_analysis(area_code: int, cache_key=None):
     JOIN (
         SELECT commercial_area_code, service_category_code, shop_count
         FROM Shop_Count 
-        WHERE year_quarter = 20244
+        WHERE year_quarter = :yq
     ) shop_data ON shop_data.commercial_area_code = sh.commercial_area_code 
                 AND shop_data.service_category_code = sh.service_category_code
     WHERE sh.commercial_area_code = :area_code
         AND sc.name IN :categories
-        AND sh.year_quarter = 20244
+        AND sh.year_quarter = :yq
     GROUP BY ca.name, sc.name, shop_data.shop_count
     ORDER BY total_sales DESC
     """
-    df = pd.read_sql(text(sql), engine, params={
+    df = read_sql(sql, {
+        "yq": yq,
         "area_code": area_code,
         "categories": tuple(FOOD10)
     })
+    return apply_schema(df, "area_analysis")
 
-    df["avg_sales"] = np.where(df["shop_count"] != 0,
-                            df["total_sales"] // df["shop_count"],
-                            np.nan).astype(int)
-
-    return df.sort_values("avg_sales", ascending=False)
-
-
-@st.cache_data(show_spinner=False)
-def fetch_business_category_analysis(category_name: str, cache_key=None):
-    import numpy as np
 
+@instrument
+def fetch_business_category_analysis(category_name: str, cache_key=None, quarters=CURRENT_YQ):
     """추천 상권
-    특정 업종의 상권별 분석 데이터를 가져옵니다.
+    특정 업종의 상권별 분석 데이터를 가져옵니다. (점포당 매출 상위 50개 상권)
     
     Args:
         category_name: 업종명
-        cache_key: 캐시 키
+        cache_key: 사용하지 않음 (이전 호출 호환용 — 캐시는 조회 인자로 구분)
+        quarters: 분기 범위 (시작, 끝)
         
     Returns:
-        pd.DataFrame: 업종별 상권 분석 데이터
+        pd.DataFrame: 업종별 상권 분석 데이터 (점포당 매출 순위)
     """
-    sql = """
-    SELECT 
-        ca.name AS commercial_area_name,
-        ca.gu, ca.dong,
-        sc.name AS service_category_name,
-        SUM(sdt.sales) AS total_sales,
-        shop_data.shop_count
-    FROM Shop_Count sh
-    JOIN Commercial_Area ca ON ca.code = sh.commercial_area_code
-    JOIN Service_Category sc ON sc.code = sh.service_category_code
-    JOIN Sales_Daytype sdt ON sdt.store_id = sh.id
-    JOIN (
-        SELECT commercial_area_code, service_category_code, shop_count
-        FROM Shop_Count 
-        WHERE year_quarter = 20244
-    ) shop_data ON shop_data.commercial_area_code = sh.commercial_area_code 
-                AND shop_data.service_category_code = sh.service_category_code
-    WHERE sc.name = :category_name
-        AND sh.year_quarter = 20244
-    GROUP BY ca.name, ca.gu, ca.dong, sc.name, shop_data.shop_count
-    ORDER BY total_sales DESC
-    LIMIT 50
+    return fetch_category_area_ranking(category_name, None, 50, quarters)
+
 
+@instrument
+@st.cache_data(show_spinner=False)
+@shared_cache()
+def fetch_category_area_ranking(category_name: str, cursor: tuple | None = None, page_size: int = 50,
+                                quarters=CURRENT_YQ):
     """
-    return pd.read_sql(text(sql), engine, params={
-        "category_name": category_name
-    })
+    특정 업종의 전체 상권을 점포당 매출로 순위를 매겨 한 페이지씩 가져옵니다.
+    점포당 매출/순위/백분위는 DB 의 윈도 함수로 계산하고, 페이지는 keyset 커서로 이어 받습니다.
+    여러 분기를 조회하면 매출(total_sales)은 합산, 점포 수는 분기 평균이고,
+    avg_sales 는 점포당 분기 매출 (기간 매출 ÷ 매출이 있는 분기 수 ÷ 평균 점포 수) 입니다.
 
-    df["avg_sales"] = np.where(df["shop_count"] != 0,
-                            df["total_sales"] // df["shop_count"],
-                            np.nan).astype(int)
+    Args:
+        category_name: 업종명
+        cursor: 이전 페이지 마지막 행의 (sales_rank, commercial_area_code) — None 이면 첫 페이지
+        page_size: 페이지 크기
+        quarters: 분기 범위 (시작, 끝)
 
-    return df.sort_values("avg_sales", ascending=False)
+    Returns:
+        pd.DataFrame: commercial_area_code, commercial_area_name, gu, dong, service_category_name,
+            total_sales, shop_count, avg_sales, sales_rank, percentile(1 = 최상위), n_areas
+    """
+    yq_start, yq_end = expand_quarters(quarters)[0], expand_quarters(quarters)[-1]
+    params = {"category_name": category_name, "yq_start": yq_start, "yq_end": yq_end, "page_size": int(page_size)}
+    after = ""
+    if cursor is not None:
+        after = "WHERE sales_rank > :after_rank OR (sales_rank = :after_rank AND commercial_area_code > :after_code)"
+        params.update(after_rank=int(cursor[0]), after_code=int(cursor[1]))
 
+    sql = f"""
+    WITH per_quarter AS (
+        SELECT sh.commercial_area_code, sh.year_quarter,
+               MAX(sh.shop_count) AS shop_count,
+               SUM(sdt.sales)     AS sales
+        FROM Shop_Count sh
+        JOIN Service_Category sc ON sc.code = sh.service_category_code
+        JOIN Sales_Daytype sdt   ON sdt.store_id = sh.id
+        WHERE sc.name = :category_name
+            AND sh.year_quarter BETWEEN :yq_start AND :yq_end
+        GROUP BY sh.commercial_area_code, sh.year_quarter
+    ),
+    per_area AS (
+        SELECT commercial_area_code,
+               SUM(sales)             AS total_sales,
+               ROUND(AVG(shop_count)) AS shop_count,
+               COUNT(*)               AS n_quarters
+        FROM per_quarter
+        GROUP BY commercial_area_code
+    ),
+    scored AS (
+        SELECT commercial_area_code, total_sales, shop_count,
+               CASE WHEN shop_count > 0 THEN total_sales * 1.0 / n_quarters / shop_count ELSE 0 END AS avg_sales
+        FROM per_area
+    ),
+    ranked AS (
+        SELECT commercial_area_code, total_sales, shop_count, avg_sales,
+               RANK()         OVER (ORDER BY avg_sales DESC) AS sales_rank,
+               PERCENT_RANK() OVER (ORDER BY avg_sales)      AS percentile,
+               COUNT(*)       OVER ()                        AS n_areas
+        FROM scored
+    )
+    SELECT r.commercial_area_code,
+           ca.name AS commercial_area_name, ca.gu, ca.dong,
+           r.total_sales, r.shop_count, r.avg_sales, r.sales_rank, r.percentile, r.n_areas
+    FROM (SELECT * FROM ranked {after}) r
+    JOIN Commercial_Area ca ON ca.code = r.commercial_area_code
+    ORDER BY r.sales_rank, r.commercial_area_code
+    LIMIT :page_size
+    """
+    df = read_sql(sql, params)
+    df.insert(4, "service_category_name", category_name)
+    for c in ("total_sales", "shop_count", "avg_sales", "sales_rank", "n_areas"):
+        df[c] = pd.to_numeric(df[c]).astype("int64")
+    df["percentile"] = pd.to_numeric(df["percentile"]).astype(float)
+    return apply_schema(df, "category_ranking")
 
 
-@st.cache_data(show_spinner=False)
-def fetch_customer_demographics(area_code: int, cache_key=None):
+@instrument
+def fetch_customer_demographics(area_code: int, cache_key=None, quarters=CURRENT_YQ):
     """
     특정 상권의 고객 인구통계 데이터를 가져옵니다.
+    성별/연령대는 분기별 사전 집계(data.demographics)에서 각각 따로 읽습니다.
     
     Args:
         area_code: 상권 코드
-        cache_key: 캐시 키
+        cache_key: 사용하지 않음 (이전 호출 호환용 — 캐시는 조회 인자로 구분)
+        quarters: 분기 범위 (시작, 끝)
         
     Returns:
-        pd.DataFrame: 고객 인구통계 데이터
+        pd.DataFrame: 고객 인구통계 데이터 (성별 행과 연령대 행이 분리됨)
     """
-    sql = """
-    SELECT 
-        ss.sex,
-        SUM(ss.sales) AS sales_by_gender,
-        sa.age,
-        SUM(sa.sales) AS sales_by_age
-    FROM Shop_Count sh
-    JOIN Sales_Sex ss ON ss.store_id = sh.id
-    LEFT JOIN Sales_Age sa ON sa.store_id = sh.id
-    WHERE sh.commercial_area_code = :area_code
-        AND sh.year_quarter = 20244
-    GROUP BY ss.sex, sa.age
-    ORDER BY sales_by_gender DESC
-    """
-    return pd.read_sql(text(sql), engine, params={
-        "area_code": area_code
-    })
+    return apply_schema(demographics_for("area", area_code, quarters), "demographics")
 
 
-@st.cache_data(show_spinner=False)
-def fetch_category_demographics(category_name: str, cache_key=None):
+@instrument
+def fetch_category_demographics(category_name: str, cache_key=None, quarters=CURRENT_YQ):
     """
     특정 업종의 고객 인구통계 데이터를 가져옵니다.
+    성별/연령대는 분기별 사전 집계(data.demographics)에서 각각 따로 읽습니다.
     
     Args:
         category_name: 업종명
-        cache_key: 캐시 키
+        cache_key: 사용하지 않음 (이전 호출 호환용 — 캐시는 조회 인자로 구분)
+        quarters: 분기 범위 (시작, 끝)
         
     Returns:
-        pd.DataFrame: 업종별 고객 인구통계 데이터
+        pd.DataFrame: 업종별 고객 인구통계 데이터 (성별 행과 연령대 행이 분리됨)
     """
-    sql = """
-    SELECT 
-        ss.sex,
-        SUM(ss.sales) AS sales_by_gender,
-        sa.age,
-        SUM(sa.sales) AS sales_by_age
-    FROM Shop_Count sh
-    JOIN Service_Category sc ON sc.code = sh.service_category_code
-    JOIN Sales_Sex ss ON ss.store_id = sh.id
-    LEFT JOIN Sales_Age sa ON sa.store_id = sh.id
-    WHERE sc.name = :category_name
-        AND sh.year_quarter = 20244
-    GROUP BY ss.sex, sa.age
-    ORDER BY sales_by_gender DESC
-    """
-    return pd.read_sql(text(sql), engine, params={
-        "category_name": category_name
-    })
+    return apply_schema(demographics_for("category", category_name, quarters), "demographics")
 
 
-@st.cache_data(show_spinner=False)
-def fetch_population_patterns(area_code: int, cache_key=None):
+@instrument
+def fetch_population_patterns(area_code: int, cache_key=None, quarters=CURRENT_YQ):
     """
     특정 상권의 인구 패턴 데이터를 가져옵니다.
     
     Args:
         area_code: 상권 코드
-        cache_key: 캐시 키
+        cache_key: 사용하지 않음 (이전 호출 호환용 — 캐시는 조회 인자로 구분)
+        quarters: 분기 범위 (시작, 끝)
         
     Returns:
-        pd.DataFrame: 인구 패턴 데이터
+        pd.DataFrame: 인구 패턴 데이터 (분기 평균)
     """
+    frames = fetch_partitioned(_fetch_population_patterns_q, quarters, area_code)
+    return combine_partitions(frames, means=DAY_COLUMNS + GENDER_COLUMNS + ["resident", "worker"])
+
+
+@st.cache_data(show_spinner=False)
+@shared_cache()
+def _fetch_population_patterns_q(yq: int, area_code: int):
+    """fetch_population_patterns 의 분기 파티션"""
     # 상주/직장 인구 데이터
     sql_pop = """
     SELECT 
@@ -367,7 +470,7 @@ def fetch_population_patterns(area_code: int, cache_key=None):
         AVG(pg.population) AS avg_population
     FROM Population_GA pg
     WHERE pg.commercial_area_code = :area_code
-        AND pg.year_quarter = 20244
+        AND pg.year_quarter = :yq
     GROUP BY pg.pop_type
     """
     
@@ -379,14 +482,16 @@ def fetch_population_patterns(area_code: int, cache_key=None):
         AVG(male_pop) AS male, AVG(female_pop) AS female
     FROM Floating_Population fp
     WHERE fp.commercial_area_code = :area_code
-        AND fp.year_quarter = 20244
+        AND fp.year_quarter = :yq
     """
     
-    pop_data = pd.read_sql(text(sql_pop), engine, params={
+    pop_data = read_sql(sql_pop, {
+        "yq": yq,
         "area_code": area_code
     })
     
-    float_data = pd.read_sql(text(sql_float), engine, params={
+    float_data = read_sql(sql_float, {
+        "yq": yq,
         "area_code": area_code
     })
     
@@ -400,65 +505,110 @@ def fetch_population_patterns(area_code: int, cache_key=None):
         elif row['pop_type'] == 'WORKING':
             result['worker'] = row['avg_population']
     
-    return result
+    return apply_schema(result, "population_patterns")
 
 
-@st.cache_data(show_spinner=False)
-def fetch_time_patterns(area_code: int, cache_key=None):
+@instrument
+def fetch_time_patterns(area_code: int, cache_key=None, quarters=CURRENT_YQ):
     """
     특정 상권의 시간대별 패턴 데이터를 가져옵니다.
     
     Args:
         area_code: 상권 코드
-        cache_key: 캐시 키
+        cache_key: 사용하지 않음 (이전 호출 호환용 — 캐시는 조회 인자로 구분)
+        quarters: 분기 범위 (시작, 끝)
         
     Returns:
-        pd.DataFrame: 시간대별 패턴 데이터
+        pd.DataFrame: 시간대별 패턴 데이터 (분기 평균)
     """
-    sql = """
-    SELECT 
-        AVG(t00_06_pop) AS t00_06, AVG(t06_11_pop) AS t06_11, AVG(t11_14_pop) AS t11_14,
-        AVG(t14_17_pop) AS t14_17, AVG(t17_21_pop) AS t17_21, AVG(t21_24_pop) AS t21_24
-    FROM Floating_Population fp
-    WHERE fp.commercial_area_code = :area_code
-        AND fp.year_quarter = 20244
+    df = fetch_area_time_profiles((int(area_code),), quarters)
+    return df[TIME_PERIODS].reset_index(drop=True)
+
+
+def fetch_area_time_profiles(area_codes: tuple, quarters=CURRENT_YQ) -> pd.DataFrame:
     """
-    return pd.read_sql(text(sql), engine, params={
-        "area_code": area_code
-    })
+    상권 여러 개의 시간대별 유동인구를 한 번에 가져옵니다.
+    상권 분석(상권 1개)과 업종 분석(매출 상위 상권 N개)이 같은 조회 경로를 씁니다.
+
+    Args:
+        area_codes: 상권 코드 튜플
+        quarters: 분기 범위 (시작, 끝)
+
+    Returns:
+        pd.DataFrame: commercial_area_code + 시간대 컬럼 (분기 평균)
+    """
+    frames = fetch_partitioned(_fetch_area_time_profiles_q, quarters, tuple(int(x) for x in area_codes))
+    return combine_partitions(frames, by=["commercial_area_code"], means=TIME_PERIODS)
 
 
 @st.cache_data(show_spinner=False)
-def fetch_category_time_patterns(category_name: str, cache_key=None):
+@shared_cache()
+def _fetch_area_time_profiles_q(yq: int, area_codes: tuple):
+    """상권 여러 개의 시간대별 유동인구 (분기 파티션)"""
+    sql = """
+    SELECT commercial_area_code,
+           AVG(t00_06_pop) AS t00_06, AVG(t06_11_pop) AS t06_11, AVG(t11_14_pop) AS t11_14,
+           AVG(t14_17_pop) AS t14_17, AVG(t17_21_pop) AS t17_21, AVG(t21_24_pop) AS t21_24
+    FROM Floating_Population
+    WHERE year_quarter = :yq
+        AND commercial_area_code IN :areas
+    GROUP BY commercial_area_code
+    """
+    return apply_schema(read_sql(sql, {"yq": yq, "areas": area_codes}), "time_profiles")
+
+
+@instrument
+def fetch_category_time_patterns(category_name: str, cache_key=None, quarters=CURRENT_YQ,
+                                 top_n: int = CATEGORY_TIME_TOP_N):
     """
     특정 업종의 상권별 시간대별 유동인구 패턴 데이터를 가져옵니다.
+    1) 업종 매출 상위 top_n 개 상권 선정 → 2) 해당 상권들의 유동인구만 조회 (유동인구 × 매출 조인 없음)
     
     Args:
         category_name: 업종명
-        cache_key: 캐시 키
+        cache_key: 사용하지 않음 (이전 호출 호환용 — 캐시는 조회 인자로 구분)
+        quarters: 분기 범위 (시작, 끝)
+        top_n: 상권 수
         
     Returns:
-        pd.DataFrame: 업종별 상권 시간대별 유동인구 데이터
+        pd.DataFrame: 업종별 상권 시간대별 유동인구 데이터 (매출 상위 top_n 개 상권)
     """
+    columns = ["commercial_area_name", "commercial_area_code"] + TIME_PERIODS + ["total_sales"]
+    if SALES_CUBE_ENABLED:
+        ranked = get_sales_cube().category_breakdown(category_name, expand_quarters(quarters))
+    else:
+        frames = fetch_partitioned(_fetch_category_area_sales_q, quarters, category_name)
+        ranked = combine_partitions(frames, by=["commercial_area_name", "commercial_area_code"],
+                                    sums=["total_sales"])
+    if ranked.empty:
+        return pd.DataFrame(columns=columns)
+    ranked["total_sales"] = pd.to_numeric(ranked["total_sales"])
+    top = ranked.nlargest(int(top_n), "total_sales")[["commercial_area_name", "commercial_area_code", "total_sales"]]
+
+    fp = fetch_area_time_profiles(tuple(top["commercial_area_code"]), quarters)
+    df = top.merge(fp, on="commercial_area_code", how="inner")[columns].reset_index(drop=True)
+    return apply_schema(df, "category_time_patterns")
+
+
+@st.cache_data(show_spinner=False)
+@shared_cache()
+def _fetch_category_area_sales_q(yq: int, category_name: str):
+    """업종의 상권별 매출 합계 (분기 파티션, 큐브를 쓰지 않을 때)"""
     sql = """
     SELECT 
         ca.name AS commercial_area_name,
         ca.code AS commercial_area_code,
-        AVG(fp.t00_06_pop) AS t00_06, AVG(fp.t06_11_pop) AS t06_11, AVG(fp.t11_14_pop) AS t11_14,
-        AVG(fp.t14_17_pop) AS t14_17, AVG(fp.t17_21_pop) AS t17_21, AVG(fp.t21_24_pop) AS t21_24,
         SUM(sdt.sales) AS total_sales
     FROM Shop_Count sh
     JOIN Commercial_Area ca ON ca.code = sh.commercial_area_code
     JOIN Service_Category sc ON sc.code = sh.service_category_code
     JOIN Sales_Daytype sdt ON sdt.store_id = sh.id
-    JOIN Floating_Population fp ON fp.commercial_area_code = ca.code
     WHERE sc.name = :category_name
-        AND sh.year_quarter = 20244
-        AND fp.year_quarter = 20244
+        AND sh.year_quarter = :yq
     GROUP BY ca.name, ca.code
-    ORDER BY total_sales DESC
-    LIMIT 10
     """
-    return pd.read_sql(text(sql), engine, params={
+    df = read_sql(sql, {
+        "yq": yq,
         "category_name": category_name
     })
+    return apply_schema(df, "category_area_sales")
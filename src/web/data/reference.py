@@ -0,0 +1,136 @@
+"""
+Shared read-only reference data
+프로세스당 한 벌만 두는 읽기 전용 참조 데이터 (상권 목록, 상권-동 매핑)
+
+st.cache_data 는 hit 마다 결과를 unpickle 해 세션별 사본을 만듭니다. 거의 바뀌지 않는 참조 데이터는
+st.cache_resource 로 Arrow 테이블 한 벌을 두고, 소비자에게는 복사 없는 읽기 전용 뷰를 넘깁니다.
+
+- 문자열 컬럼: string[pyarrow] (Arrow 버퍼 공유)
+- 범주 컬럼(구/동): category (Arrow 사전 공유, 코드만 뷰마다 생성)
+- 숫자 컬럼: 읽기 전용 numpy 배열 → 제자리 수정은 ValueError ("assignment destination is read-only")
+- 뷰는 호출마다 새 DataFrame → 소비자가 컬럼을 추가하거나 문자열을 바꿔도 공유 원본에는 반영되지 않음
+- 파생 컬럼(표시명 등)은 빌드 시 한 번 계산
+"""
+
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+from data.schema import TEXT
+
+
+def _is_text(col: pa.ChunkedArray) -> bool:
+    return pa.types.is_string(col.type) or pa.types.is_large_string(col.type)
+
+
+def _is_dictionary(col: pa.ChunkedArray) -> bool:
+    return pa.types.is_dictionary(col.type)
+
+
+def _view_column(col: pa.ChunkedArray, numeric: dict, name: str):
+    if name in numeric:
+        return numeric[name]
+    if _is_dictionary(col):
+        # category: 범주는 Arrow 사전을, 코드(행당 1~2바이트)만 뷰마다 새로 만듦
+        return col.to_pandas().array
+    return pd.arrays.ArrowStringArray(col)
+
+
+def read_only_columns(table: pa.Table) -> dict:
+    """
+    Arrow 테이블의 숫자 컬럼을 읽기 전용 numpy 배열로 바꿉니다. (결측 없는 컬럼은 Arrow 버퍼를 그대로 사용)
+
+    Args:
+        table: Arrow 테이블
+
+    Returns:
+        dict: {컬럼명: 읽기 전용 numpy 배열} — 문자열/범주 컬럼은 제외 (뷰마다 Arrow 배열을 감쌈)
+    """
+    out = {}
+    for name, col in zip(table.column_names, table.columns):
+        if _is_text(col) or _is_dictionary(col):
+            continue
+        if pa.types.is_integer(col.type) and col.null_count:
+            # 결측 있는 정수(Int32 등)는 float 로 바뀌지 않도록 nullable 배열로 (빌드 시 한 번 복사)
+            values = col.to_pandas(types_mapper={col.type: pd.api.types.pandas_dtype(str(col.type).title())}.get).array
+            values._data.flags.writeable = False
+        else:
+            values = col.to_numpy()
+            values.flags.writeable = False
+        out[name] = values
+    return out
+
+
+def reference_view(table: pa.Table, numeric: dict) -> pd.DataFrame:
+    """
+    참조 테이블의 읽기 전용 뷰를 만듭니다. (데이터 복사 없음)
+    숫자 컬럼은 공유 읽기 전용 배열, 문자열 컬럼은 Arrow 버퍼를 뷰마다 새로 감싼 string[pyarrow] 입니다.
+
+    Args:
+        table: Arrow 테이블
+        numeric: read_only_columns 결과
+
+    Returns:
+        pd.DataFrame: 읽기 전용 뷰
+    """
+    cols = {name: _view_column(col, numeric, name) for name, col in zip(table.column_names, table.columns)}
+    return pd.DataFrame(cols, copy=False)
+
+
+def area_labels(df_areas: pd.DataFrame) -> pd.DataFrame:
+    """
+    상권 목록에 표시명 파생 컬럼을 붙입니다.
+
+    Returns:
+        pd.DataFrame: display_name ("상권명 (동)"), area_label ("상권명 (구 동)") 추가
+    """
+    name, gu, dong = (df_areas[c].astype(TEXT).fillna("") for c in ("area_name", "gu", "dong"))
+    return df_areas.assign(display_name=name + " (" + dong + ")", area_label=name + " (" + gu + " " + dong + ")")
+
+
+class ReferenceData:
+    """
+    프로세스 공유 참조 데이터.
+
+    Attributes:
+        tables: {이름: Arrow 테이블} — 불변 원본
+        categories: 외식 업종명 (튜플)
+    """
+
+    def __init__(self, frames: dict, categories):
+        self.tables = {name: pa.Table.from_pandas(df, preserve_index=False) for name, df in frames.items()}
+        self.categories = tuple(categories)
+        self._numeric = {name: read_only_columns(t) for name, t in self.tables.items()}
+
+    def frame(self, name: str) -> pd.DataFrame:
+        """참조 테이블의 읽기 전용 뷰 (데이터 복사 없음)"""
+        return reference_view(self.tables[name], self._numeric[name])
+
+    @property
+    def nbytes(self) -> int:
+        """Arrow 테이블 전체 크기 (바이트)"""
+        return sum(t.nbytes for t in self.tables.values())
+
+
+@st.cache_resource(show_spinner=False)
+def get_reference_data() -> ReferenceData:
+    """
+    참조 데이터를 프로세스당 한 번 읽습니다. (원본 조회는 공유 디스크 캐시를 거침)
+
+    Returns:
+        ReferenceData: 프로세스 공유 참조 데이터
+    """
+    from data.query import load_areas_and_categories, load_dong_map_for_areas
+    df_areas, categories = load_areas_and_categories()
+    frames = {
+        "areas": area_labels(df_areas),
+        "dong_map": load_dong_map_for_areas(),
+    }
+    return ReferenceData(frames, categories)
+
+
+def clear_reference_data():
+    """참조 데이터와 그것으로 만든 색인(상권 색인/검색, 상권-동 공간 조인)을 비웁니다."""
+    from data.areas import get_area_registry, get_area_search_index
+    from data.geo import get_area_dong_index
+    for fn in (get_reference_data, get_area_registry, get_area_search_index, get_area_dong_index):
+        fn.clear()
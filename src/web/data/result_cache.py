@@ -0,0 +1,336 @@
+"""
+Shared cross-process result cache
+여러 Streamlit 프로세스가 함께 쓰는 로컬 디스크 조회 결과 캐시
+
+st.cache_data(프로세스 메모리) 아래에 두는 2차 캐시입니다. SQLite 파일 하나에 결과를 저장하므로
+같은 호스트의 모든 워커가 공유하고 재시작 후에도 유지됩니다.
+- 항목별 TTL
+- 전체 크기 상한 초과 시 가장 오래 사용되지 않은 항목부터 제거 (LRU)
+- hit / miss / eviction 카운터 (프로세스 간 공유)
+- 키 채우기 잠금: 같은 키를 놓친 프로세스들 중 하나만 조회하고 나머지는 결과를 기다림
+  (배포 직후 모든 워커가 같은 쿼리로 DB 에 몰리는 것을 방지)
+- 키에 데이터 소스(백엔드, DB_URL/스냅샷)와 스키마 버전을 포함 → 소스 전환/스키마 변경 시 이전 결과를 쓰지 않음
+- hit 경로는 읽기만 수행: 마지막 사용 시각과 카운터는 프로세스별로 모아 RESULT_CACHE_FLUSH_INTERVAL 마다 기록
+"""
+
+import atexit
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+from config import (
+    DB_URL, SNAPSHOT_DIR, RESULT_CACHE_ENABLED, RESULT_CACHE_PATH,
+    RESULT_CACHE_TTL, RESULT_CACHE_MAX_BYTES, RESULT_CACHE_FILL_TIMEOUT, RESULT_CACHE_FLUSH_INTERVAL
+)
+from data.schema import record_cached
+
+# 캐시 값 형식 버전 — 조회 결과의 형식이 스키마 밖에서 바뀌면 올림
+CACHE_FORMAT_VERSION = 1
+_FILL_POLL = 0.05  # 채우기 대기 중 확인 간격(초)
+
+
+class ResultCache:
+    """
+    SQLite 기반 키-값 결과 캐시.
+
+    Args:
+        path: 캐시 파일 경로
+        max_bytes: 저장 용량 상한 (바이트)
+    """
+
+    def __init__(self, path, max_bytes: int, fill_timeout: float = RESULT_CACHE_FILL_TIMEOUT,
+                 flush_interval: float = RESULT_CACHE_FLUSH_INTERVAL):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.fill_timeout = fill_timeout
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        # 아직 기록하지 않은 hit 시각 / 카운터 (프로세스 메모리)
+        self._pending_lock = threading.Lock()
+        self._pending_access = {}
+        self._pending_stats = {}
+        self._flushed_at = time.monotonic()
+        self.owner = f"{os.getpid()}"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._conn() as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL, last_access REAL NOT NULL
+                )""")
+            con.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)")
+            con.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            # 조회 중인 키 (다른 프로세스는 이 행이 사라질 때까지 기다림)
+            con.execute("CREATE TABLE IF NOT EXISTS fills (key TEXT PRIMARY KEY, owner TEXT NOT NULL, "
+                        "started_at REAL NOT NULL)")
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 커넥션 (sqlite3 커넥션은 스레드 간 공유하지 않음)"""
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.con = con
+        return con
+
+    def _bump(self, con, name: str, n: int = 1):
+        con.execute(
+            "INSERT INTO stats(name, value) VALUES(?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", (name, n)
+        )
+
+    def _count(self, name: str, n: int = 1):
+        """카운터를 프로세스 메모리에 누적합니다. (flush 때 기록)"""
+        with self._pending_lock:
+            self._pending_stats[name] = self._pending_stats.get(name, 0) + n
+
+    def flush(self, force: bool = False):
+        """
+        모아 둔 hit 시각과 카운터를 한 트랜잭션으로 기록합니다.
+
+        Args:
+            force: 주기와 관계없이 기록
+        """
+        with self._pending_lock:
+            if not force and time.monotonic() - self._flushed_at < self.flush_interval:
+                return
+            access, self._pending_access = self._pending_access, {}
+            stats, self._pending_stats = self._pending_stats, {}
+            self._flushed_at = time.monotonic()
+        if not access and not stats:
+            return
+        con = self._conn()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            con.executemany("UPDATE entries SET last_access = MAX(last_access, ?) WHERE key = ?",
+                            [(t, k) for k, t in access.items()])
+            for name, n in stats.items():
+                self._bump(con, name, n)
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+
+    def _read(self, key: str):
+        """(hit 여부, 값) — 읽기만 수행, 만료 항목은 miss (put 이 덮어씀)"""
+        row = self._conn().execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] < time.time():
+            return False, None
+        return True, pickle.loads(row[0])
+
+    def get(self, key: str):
+        """
+        캐시 값을 조회합니다. (쓰기 없음 — 사용 시각/카운터는 flush 때 기록)
+
+        Returns:
+            tuple: (hit 여부, 값)
+        """
+        hit, value = self._read(key)
+        if hit:
+            with self._pending_lock:
+                self._pending_access[key] = time.time()
+        self._count("hits" if hit else "misses")
+        self.flush()
+        return hit, value
+
+    def try_begin_fill(self, key: str) -> bool:
+        """
+        키 채우기를 시작합니다. 다른 프로세스가 이미 채우는 중이면 False.
+        채우던 프로세스가 fill_timeout 이 지나도록 끝내지 않았으면 그 잠금을 넘겨받습니다.
+        """
+        con = self._conn()
+        now = time.time()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            con.execute("DELETE FROM fills WHERE key = ? AND started_at < ?", (key, now - self.fill_timeout))
+            cur = con.execute("INSERT OR IGNORE INTO fills(key, owner, started_at) VALUES(?, ?, ?)",
+                              (key, self.owner, now))
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        return cur.rowcount == 1
+
+    def end_fill(self, key: str):
+        """키 채우기 잠금을 해제합니다. (성공/실패 모두)"""
+        self._conn().execute("DELETE FROM fills WHERE key = ?", (key,))
+
+    def wait_fill(self, key: str):
+        """
+        다른 프로세스가 채우는 키를 기다립니다.
+
+        Returns:
+            tuple: (hit 여부, 값) — 채우기가 실패했거나 시간이 지나면 (False, None)
+        """
+        con = self._conn()
+        deadline = time.monotonic() + self.fill_timeout
+        while time.monotonic() < deadline:
+            hit, value = self._read(key)
+            if hit:
+                self._count("fill_waits")
+                return True, value
+            if con.execute("SELECT 1 FROM fills WHERE key = ?", (key,)).fetchone() is None:
+                # 잠금이 풀렸는데 값이 없음 → 채우기 실패 (직접 조회)
+                return self._read(key)
+            time.sleep(_FILL_POLL)
+        return False, None
+
+    def put(self, key: str, value, ttl: float):
+        """값을 저장하고 용량 상한을 넘으면 LRU 순서로 제거합니다."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        con = self._conn()
+        now = time.time()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            con.execute(
+                "INSERT OR REPLACE INTO entries(key, value, size, expires_at, last_access) VALUES(?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now + ttl, now)
+            )
+            total = con.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            evicted = 0
+            if total > self.max_bytes:
+                for k, size in con.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    con.execute("DELETE FROM entries WHERE key = ?", (k,))
+                    total -= size
+                    evicted += 1
+            if evicted:
+                self._bump(con, "evictions", evicted)
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+
+    def delete(self, key: str):
+        """항목 하나를 삭제합니다."""
+        self._conn().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        """모든 항목, 카운터, 채우기 잠금을 삭제합니다. (채우던 프로세스를 기다리던 쪽은 바로 직접 조회)"""
+        with self._pending_lock:
+            self._pending_access.clear()
+            self._pending_stats.clear()
+        con = self._conn()
+        con.execute("DELETE FROM entries")
+        con.execute("DELETE FROM stats")
+        con.execute("DELETE FROM fills")
+
+    def stats(self) -> dict:
+        """hit/miss/eviction/fill_waits 카운터와 현재 항목 수/용량 (이 프로세스의 미기록분은 먼저 기록)"""
+        self.flush(force=True)
+        con = self._conn()
+        out = {"hits": 0, "misses": 0, "evictions": 0, "fill_waits": 0}
+        out.update(dict(con.execute("SELECT name, value FROM stats").fetchall()))
+        out["entries"], out["bytes"] = con.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return out
+
+
+@st.cache_resource(show_spinner=False)
+def get_result_cache() -> ResultCache:
+    """프로세스당 하나의 ResultCache 핸들 (종료 시 미기록 카운터/사용 시각 기록)"""
+    cache = ResultCache(RESULT_CACHE_PATH, RESULT_CACHE_MAX_BYTES)
+    atexit.register(cache.flush, force=True)
+    return cache
+
+
+@functools.lru_cache(maxsize=1)
+def cache_namespace() -> str:
+    """
+    키 네임스페이스: 데이터 소스와 결과 형식이 같은 프로세스끼리만 항목을 공유합니다.
+
+    Returns:
+        str: (백엔드, DB_URL 또는 스냅샷 생성 시각, 스키마, 형식 버전) 해시
+    """
+    from data.source import get_backend
+    from data.snapshot import read_manifest
+    from data.schema import SCHEMAS
+
+    backend = get_backend()
+    source = read_manifest(SNAPSHOT_DIR)["created_at"] if backend == "snapshot" else DB_URL
+    raw = repr((backend, source, sorted((k, sorted(v.items())) for k, v in SCHEMAS.items()), CACHE_FORMAT_VERSION))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+_signature = functools.lru_cache(maxsize=None)(inspect.signature)
+
+
+def _normalize(x):
+    """키용 인자 정규화: numpy 스칼라 → 파이썬 값, list → tuple, dict → 정렬된 (키, 값) tuple"""
+    if isinstance(x, np.generic):
+        return x.item()
+    if isinstance(x, (list, tuple)):
+        return tuple(_normalize(v) for v in x)
+    if isinstance(x, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in x.items()))
+    return x
+
+
+def _make_key(fn, args, kwargs) -> str:
+    """
+    (네임스페이스, 함수, 인자) 캐시 키. 인자는 함수 시그니처로 묶어(기본값 포함) 정규화하므로
+    f(5) / f(np.int64(5)) / f(a=5), [1, 2] / (1, 2) 처럼 같은 조회는 같은 키가 됩니다.
+    """
+    bound = _signature(fn).bind(*args, **kwargs)
+    bound.apply_defaults()
+    params = tuple((name, _normalize(value)) for name, value in bound.arguments.items())
+    raw = repr((cache_namespace(), fn.__module__, fn.__qualname__, params))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def shared_cache(ttl: float = RESULT_CACHE_TTL):
+    """
+    조회 함수 결과를 공유 디스크 캐시에 저장하는 데코레이터.
+    st.cache_data 아래(안쪽)에 붙여 사용합니다. 돌려주는 값의 스키마 절감량을 기록합니다. (data/schema.py)
+    감싼 함수의 invalidate(*args, **kwargs) 로 해당 인자의 항목만 지울 수 있습니다.
+
+    Args:
+        ttl: 항목 유효 시간(초)
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def fill(key, args, kwargs):
+            if not RESULT_CACHE_ENABLED:
+                return fn(*args, **kwargs)
+            cache = get_result_cache()
+            hit, value = cache.get(key)
+            if hit:
+                return value
+            # 같은 키를 다른 프로세스가 조회 중이면 그 결과를 기다림
+            while not cache.try_begin_fill(key):
+                hit, value = cache.wait_fill(key)
+                if hit:
+                    return value
+            try:
+                value = fn(*args, **kwargs)
+                cache.put(key, value, ttl)
+            finally:
+                cache.end_fill(key)
+            return value
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = _make_key(fn, args, kwargs)
+            value = fill(key, args, kwargs)
+            # 메모리에 올라가는 값 한 벌 — 디스크 hit 여도 스키마 절감 통계에 기록
+            record_cached(key, value)
+            return value
+
+        def invalidate(*args, **kwargs):
+            if RESULT_CACHE_ENABLED:
+                get_result_cache().delete(_make_key(fn, args, kwargs))
+
+        wrapper.invalidate = invalidate
+        return wrapper
+    return decorator
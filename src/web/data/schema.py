@@ -0,0 +1,248 @@
+"""
+Compact dtype schema for fetched DataFrames
+조회 결과 DataFrame 의 컴팩트 dtype 스키마 (로드 시 적용, 캐시 프레임 기준 데이터셋별 절감 메모리 집계)
+
+read_sql 결과는 이름/구/동이 object, 코드가 int64, 값이 float64 이고, 캐시 키마다(st.cache_data,
+공유 디스크 캐시) 여러 벌 보관됩니다. 조회 직후 데이터셋별로 선언한 스키마로 변환합니다.
+절감량은 캐시 항목 한 벌당 한 번 집계합니다. (캐시 hit 여부와 무관, 조회마다 새로 만드는 큐브/사전 집계
+결과는 메모리에 남지 않으므로 제외)
+
+- 상권 코드 / 행정동 코드: int32 (결측이 있으면 Int32, 범위를 넘으면 변환하지 않음)
+- 구 / 동: category
+- 업종명: FOOD10 고정 범주 category (분기 파티션을 이어 붙여도 category 유지)
+- 상권명 등 그 밖의 문자열: string[pyarrow]
+- 좌표, 유동/상주/직장 인구 평균: float32
+- 매출/지출 합계, 순위: 선언하지 않음 (int64/float64 그대로 — 정밀도 유지)
+
+사용법 (src/web 에서 실행):
+    python -m data.schema check     # 모든 조회 함수 결과가 스키마와 일치하는지 검사 (불일치 시 종료 코드 1)
+    python -m data.schema report    # 데이터셋별 캐시 프레임의 변환 전/후 메모리와 절감량
+"""
+
+import argparse
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from config import FOOD10, DAY_COLUMNS, TIME_PERIODS, GENDER_COLUMNS
+
+CATEGORY = pd.CategoricalDtype(sorted(FOOD10))
+TEXT = pd.StringDtype("pyarrow")
+
+_AREA_CODE = {"commercial_area_code": "int32"}
+_REGION = {"gu": "category", "dong": "category"}
+_COORDS = {"lon": "float32", "lat": "float32"}
+
+SCHEMAS = {
+    "areas": {**_AREA_CODE, "area_name": TEXT, **_REGION, "dong_code": "int32", **_COORDS},
+    "dong_map": {**_AREA_CODE, "area_name": TEXT, **_REGION, **_COORDS, "dong_code": "int32", "dong_name": TEXT},
+    "sales": {**_AREA_CODE},
+    "floating": {**_AREA_CODE, **{c: "float32" for c in DAY_COLUMNS + TIME_PERIODS + GENDER_COLUMNS}},
+    "population_ga": {**_AREA_CODE, "resident": "float32", "worker": "float32"},
+    "income": {"dong_code": "int32", "dong_name": TEXT},
+    "area_analysis": {"commercial_area_name": TEXT, "service_category_name": CATEGORY},
+    "category_ranking": {**_AREA_CODE, "commercial_area_name": TEXT, **_REGION, "service_category_name": CATEGORY},
+    "demographics": {"sex": TEXT, "age": TEXT},
+    "population_patterns": {c: "float32" for c in DAY_COLUMNS + GENDER_COLUMNS + ["resident", "worker"]},
+    "time_profiles": {**_AREA_CODE, **{c: "float32" for c in TIME_PERIODS}},
+    "category_area_sales": {"commercial_area_name": TEXT, **_AREA_CODE},
+    "category_time_patterns": {"commercial_area_name": TEXT, **_AREA_CODE, **{c: "float32" for c in TIME_PERIODS}},
+}
+
+_INT32 = np.iinfo(np.int32)
+
+
+def _cast(s: pd.Series, dtype) -> pd.Series:
+    """컬럼 하나를 스키마 dtype 으로 변환합니다."""
+    if dtype == "int32":
+        v = pd.to_numeric(s, errors="coerce")
+        if v.notna().any() and (v.min() < _INT32.min or v.max() > _INT32.max):
+            return s
+        return v.astype("Int32" if v.isna().any() else "int32")
+    if dtype == "float32":
+        return pd.to_numeric(s, errors="coerce").astype("float32")
+    return s.astype(dtype)
+
+
+def _nbytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=False, deep=True).sum())
+
+
+SCHEMA_ATTR = "schema"  # df.attrs 키: (데이터셋, 변환 전 바이트) — 캐시 채우기 시 통계 기록에 사용
+
+
+class SchemaStats:
+    """
+    데이터셋별 스키마 적용 통계 (스레드 안전).
+    캐시에 올라간 프레임 한 벌당 한 번 기록합니다. (같은 캐시 키는 덮어씀 — 캐시 hit 와 무관하게 같은 값)
+
+    Attributes:
+        frames: {(데이터셋, 캐시 키): (행 수, 변환 전 바이트, 변환 후 바이트)}
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.frames = {}
+
+    def record(self, dataset: str, key: str, rows: int, before: int, after: int):
+        """캐시 프레임 한 벌의 크기를 기록합니다."""
+        with self._lock:
+            self.frames[(dataset, key)] = (rows, before, after)
+
+    def reset(self):
+        """기록을 모두 지웁니다. (캐시 비우기 버튼)"""
+        with self._lock:
+            self.frames.clear()
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        데이터셋별 절감 메모리 표.
+
+        Returns:
+            pd.DataFrame: dataset, frames, rows, before_kb, after_kb, saved_kb, saved_pct (절감량 내림차순)
+        """
+        with self._lock:
+            rows = [(dataset, *sizes) for (dataset, _), sizes in self.frames.items()]
+        df = (pd.DataFrame(rows, columns=["dataset", "rows", "before", "after"])
+              .astype({"rows": "int64", "before": "int64", "after": "int64"})
+              .groupby("dataset", as_index=False)
+              .agg(frames=("rows", "size"), rows=("rows", "sum"), before=("before", "sum"), after=("after", "sum")))
+        df["saved"] = df["before"] - df["after"]
+        df["saved_pct"] = (100.0 * df["saved"] / df["before"].where(df["before"] > 0)).round(1)
+        for c in ("before", "after", "saved"):
+            df[f"{c}_kb"] = (df.pop(c) / 1024).round(1)
+        return df.sort_values("saved_kb", ascending=False).reset_index(drop=True)[
+            ["dataset", "frames", "rows", "before_kb", "after_kb", "saved_kb", "saved_pct"]]
+
+    @property
+    def saved_bytes(self) -> int:
+        """캐시 프레임 전체의 절감 바이트"""
+        with self._lock:
+            return sum(before - after for _, before, after in self.frames.values())
+
+
+@st.cache_resource(show_spinner=False)
+def get_schema_stats() -> SchemaStats:
+    """프로세스 단위 스키마 적용 통계"""
+    return SchemaStats()
+
+
+def apply_schema(df: pd.DataFrame, dataset: str) -> pd.DataFrame:
+    """
+    조회 결과에 데이터셋 스키마를 적용합니다. (선언된 컬럼 중 있는 것만 변환, 그 밖의 컬럼은 그대로)
+    변환 전 크기는 df.attrs 에 남겨 두고, 통계는 캐시를 채울 때(record_cached) 기록합니다.
+
+    Args:
+        df: 조회 결과
+        dataset: SCHEMAS 키
+
+    Returns:
+        pd.DataFrame: 컴팩트 dtype 으로 변환된 DataFrame
+    """
+    schema = SCHEMAS[dataset]
+    cols = [c for c in df.columns if c in schema]
+    if not cols:
+        return df
+    before = _nbytes(df)
+    df = df.assign(**{c: _cast(df[c], schema[c]) for c in cols})
+    df.attrs[SCHEMA_ATTR] = (dataset, before)
+    return df
+
+
+def record_cached(key: str, value):
+    """
+    캐시에 채운 값(DataFrame 또는 그 tuple/list/dict)에서 스키마가 적용된 프레임의 크기를 기록합니다.
+    shared_cache 가 값을 돌려줄 때마다(디스크 hit 포함) 호출되며, 위의 st.cache_data 가 그 값을 한 벌 보관합니다.
+
+    Args:
+        key: 캐시 키
+        value: 캐시 값
+    """
+    items = value.values() if isinstance(value, dict) else value if isinstance(value, (tuple, list)) else (value,)
+    for i, df in enumerate(items):
+        if isinstance(df, pd.DataFrame) and SCHEMA_ATTR in df.attrs:
+            dataset, before = df.attrs[SCHEMA_ATTR]
+            get_schema_stats().record(dataset, f"{key}:{i}", len(df), before, _nbytes(df))
+
+
+def check_frame(df: pd.DataFrame, dataset: str) -> list[str]:
+    """
+    조회 결과의 dtype 이 스키마와 일치하는지 검사합니다.
+
+    Args:
+        df: 조회 결과
+        dataset: SCHEMAS 키
+
+    Returns:
+        list[str]: 불일치 설명 (일치하면 빈 리스트)
+    """
+    problems = []
+    for col, dtype in SCHEMAS[dataset].items():
+        if col not in df.columns:
+            continue
+        actual = df[col].dtype
+        if dtype == "int32":
+            ok = actual in (np.dtype("int32"), pd.Int32Dtype())
+        elif dtype == "category":
+            ok = isinstance(actual, pd.CategoricalDtype)
+        else:
+            ok = actual == dtype
+        if not ok:
+            problems.append(f"{dataset}.{col}: {actual} (기대: {dtype})")
+    return problems
+
+
+def fetcher_cases():
+    """(조회 함수명, 데이터셋, 호출) — check 대상 (상권/업종은 첫 상권, FOOD10 첫 업종)"""
+    from data import query as q
+    df_areas, _ = q.fetch_areas_and_categories()
+    area = int(df_areas["commercial_area_code"].iloc[0])
+    category = FOOD10[0]
+    return [
+        ("fetch_areas_and_categories", "areas", lambda: q.fetch_areas_and_categories()[0]),
+        ("fetch_dong_map_for_areas", "dong_map", q.fetch_dong_map_for_areas),
+        ("fetch_sales_2024", "sales", lambda: q.fetch_sales_2024(None, FOOD10)),
+        ("fetch_floating_by_area_2024", "floating", lambda: q.fetch_floating_by_area_2024(None)),
+        ("fetch_population_ga_2024", "population_ga", lambda: q.fetch_population_ga_2024(None)),
+        ("fetch_income_2024", "income", q.fetch_income_2024),
+        ("fetch_commercial_area_analysis", "area_analysis", lambda: q.fetch_commercial_area_analysis(area)),
+        ("fetch_category_area_ranking", "category_ranking", lambda: q.fetch_category_area_ranking(category)),
+        ("fetch_customer_demographics", "demographics", lambda: q.fetch_customer_demographics(area)),
+        ("fetch_category_demographics", "demographics", lambda: q.fetch_category_demographics(category)),
+        ("fetch_population_patterns", "population_patterns", lambda: q.fetch_population_patterns(area)),
+        ("fetch_area_time_profiles", "time_profiles", lambda: q.fetch_area_time_profiles((area,))),
+        ("fetch_category_time_patterns", "category_time_patterns", lambda: q.fetch_category_time_patterns(category)),
+    ]
+
+
+def main(argv=None):
+    """스키마 검사/보고 CLI 진입점"""
+    parser = argparse.ArgumentParser(description="조회 결과 dtype 스키마 검사 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("check", help="모든 조회 함수 결과가 스키마와 일치하는지 검사")
+    sub.add_parser("report", help="데이터셋별 절감 메모리")
+    args = parser.parse_args(argv)
+
+    problems = []
+    for name, dataset, call in fetcher_cases():
+        found = check_frame(call(), dataset)
+        problems += found
+        if args.command == "check":
+            print(f"{'❌' if found else '✅'} {name:<32} {dataset}")
+
+    if args.command == "report":
+        # -m 실행 시 이 모듈은 __main__ 이므로 조회 함수가 기록한 data.schema 쪽 통계를 읽음
+        from data.schema import get_schema_stats as stats
+        report = stats().to_frame()
+        print(report.to_string(index=False))
+        print(f"\n합계: {report['before_kb'].sum():,.1f}KB → {report['after_kb'].sum():,.1f}KB "
+              f"({report['saved_kb'].sum():,.1f}KB 절감)")
+    for p in problems:
+        print(f"  {p}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
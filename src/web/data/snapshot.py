@@ -0,0 +1,198 @@
+"""
+Local columnar snapshot of the database tables
+데이터베이스 테이블의 로컬 Parquet 스냅샷 내보내기/불러오기
+
+export 시 Parquet 과 함께 인덱스까지 만든 SQLite 파일(snapshot.sqlite)을 한 번 생성합니다.
+앱은 이 파일을 그대로 열어 사용하므로 프로세스 시작 시 적재/인덱스 생성 비용이 없고,
+여러 프로세스가 OS 페이지 캐시를 공유합니다.
+
+사용법 (src/web 에서 실행):
+    python -m data.snapshot export [--out DIR] [--tables T1 T2 ...]
+    python -m data.snapshot load --url duckdb:///../data/local.duckdb [--snapshot DIR]
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import text
+from data.migrations import apply_migrations
+
+
+# 스냅샷 대상 테이블 (query.py 의 fetch_* 함수들이 참조하는 전체 테이블)
+SNAPSHOT_TABLES = (
+    "Commercial_Area", "Service_Category", "Shop_Count", "Sales_Daytype",
+    "Sales_Sex", "Sales_Age", "Floating_Population", "Population_GA",
+    "Income", "Dong",
+)
+MANIFEST_NAME = "manifest.json"
+SNAPSHOT_DB_NAME = "snapshot.sqlite"
+
+
+def snapshot_exists(snapshot_dir) -> bool:
+    """
+    스냅샷 디렉터리에 manifest 가 있는지 확인합니다.
+
+    Args:
+        snapshot_dir: 스냅샷 디렉터리 경로
+
+    Returns:
+        bool: 스냅샷 존재 여부
+    """
+    return (Path(snapshot_dir) / MANIFEST_NAME).is_file()
+
+
+def read_manifest(snapshot_dir) -> dict:
+    """
+    스냅샷 manifest 를 읽습니다.
+
+    Args:
+        snapshot_dir: 스냅샷 디렉터리 경로
+
+    Returns:
+        dict: manifest 내용
+    """
+    with open(Path(snapshot_dir) / MANIFEST_NAME, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def export_snapshot(engine, out_dir, tables=SNAPSHOT_TABLES) -> dict:
+    """
+    DB 테이블을 테이블별 Parquet 파일로 내보냅니다.
+
+    Args:
+        engine: 원본 DB 의 SQLAlchemy 엔진
+        out_dir: 출력 디렉터리
+        tables: 내보낼 테이블 이름 목록
+
+    Returns:
+        dict: 작성된 manifest
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    manifest = {"created_at": datetime.now().isoformat(timespec="seconds"), "tables": {}}
+    for name in tables:
+        df = pd.read_sql(text(f"SELECT * FROM {name}"), engine)
+        df.to_parquet(out / f"{name}.parquet", index=False)
+        manifest["tables"][name] = {"rows": len(df), "columns": list(df.columns)}
+
+    # 앱이 바로 여는 인덱스 포함 SQLite 파일 (export 시 1회 생성)
+    build_snapshot_db(out, list(manifest["tables"]))
+    manifest["db"] = SNAPSHOT_DB_NAME
+
+    # manifest 는 마지막에 기록 → 중간에 실패한 스냅샷은 사용되지 않음
+    with open(out / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def build_snapshot_db(snapshot_dir, tables) -> Path:
+    """
+    스냅샷 Parquet 을 인덱스 포함 SQLite 파일로 만듭니다. (임시 파일에 만든 뒤 교체)
+
+    Args:
+        snapshot_dir: 스냅샷 디렉터리 경로
+        tables: 적재할 테이블 이름 목록
+
+    Returns:
+        Path: 생성된 SQLite 파일 경로
+    """
+    path = Path(snapshot_dir) / SNAPSHOT_DB_NAME
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    _load_tables(f"sqlite:///{tmp.as_posix()}", snapshot_dir, tables)
+    os.replace(tmp, path)
+    return path
+
+
+def load_snapshot_engine(snapshot_dir):
+    """
+    스냅샷 SQLite 파일을 여는 엔진을 만듭니다. (적재/인덱스 생성 없음)
+    query.py 의 SQL 을 그대로 실행할 수 있도록 테이블 이름/컬럼을 유지합니다.
+    파일이 없는 이전 형식의 스냅샷이면 한 번 생성합니다.
+
+    Args:
+        snapshot_dir: 스냅샷 디렉터리 경로
+
+    Returns:
+        sqlalchemy.engine.Engine: 스냅샷 엔진
+    """
+    from data.dialect import create_db_engine
+
+    path = Path(snapshot_dir) / SNAPSHOT_DB_NAME
+    if not path.is_file():
+        build_snapshot_db(snapshot_dir, list(read_manifest(snapshot_dir)["tables"]))
+    return create_db_engine(f"sqlite:///{path.as_posix()}")
+
+
+def _load_tables(url, snapshot_dir, tables):
+    """스냅샷 Parquet 테이블들을 대상 DB 로 적재합니다. (SQLite 는 인덱스 마이그레이션 적용)"""
+    from data.dialect import create_db_engine
+
+    engine = create_db_engine(url, read_only=False)
+    with engine.begin() as con:
+        for name in tables:
+            path = Path(snapshot_dir) / f"{name}.parquet"
+            if engine.dialect.name == "duckdb":
+                # DuckDB 는 Parquet 을 직접 읽어 적재
+                con.exec_driver_sql(f"CREATE OR REPLACE TABLE {name} AS SELECT * FROM read_parquet('{path.as_posix()}')")
+            else:
+                pd.read_parquet(path).to_sql(name, con, index=False, if_exists="replace", chunksize=50_000)
+    if engine.dialect.name == "sqlite":
+        # DuckDB 는 컬럼 스캔 위주라 인덱스를 만들지 않음
+        apply_migrations(engine)
+    engine.dispose()
+
+
+def load_snapshot_into(url, snapshot_dir) -> dict:
+    """
+    스냅샷을 로컬 파일 DB(SQLite/DuckDB 등)로 적재합니다. 적재 후 DB_URL 로 바로 사용할 수 있습니다.
+
+    Args:
+        url: 대상 SQLAlchemy DB URL
+        snapshot_dir: 스냅샷 디렉터리 경로
+
+    Returns:
+        dict: 스냅샷 manifest
+    """
+    manifest = read_manifest(snapshot_dir)
+    _load_tables(url, snapshot_dir, list(manifest["tables"]))
+    return manifest
+
+
+def main(argv=None):
+    """스냅샷 CLI 진입점"""
+    from config import DB_URL, SNAPSHOT_DIR
+
+    parser = argparse.ArgumentParser(description="DB 테이블 Parquet 스냅샷 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_export = sub.add_parser("export", help="DB_URL 의 테이블을 스냅샷으로 내보내기")
+    p_export.add_argument("--out", default=str(SNAPSHOT_DIR), help="출력 디렉터리")
+    p_export.add_argument("--tables", nargs="+", default=list(SNAPSHOT_TABLES), help="내보낼 테이블")
+    p_load = sub.add_parser("load", help="스냅샷을 로컬 파일 DB(SQLite/DuckDB)로 적재")
+    p_load.add_argument("--url", required=True, help="대상 DB URL (예: duckdb:///../data/local.duckdb)")
+    p_load.add_argument("--snapshot", default=str(SNAPSHOT_DIR), help="스냅샷 디렉터리")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        from data.dialect import create_db_engine
+
+        if not DB_URL:
+            parser.error("DB_URL 이 설정되어 있지 않습니다.")
+        engine = create_db_engine(DB_URL)
+        manifest = export_snapshot(engine, args.out, args.tables)
+        for name, meta in manifest["tables"].items():
+            print(f"{name}: {meta['rows']:,} rows")
+        print(f"✅ 스냅샷 저장 완료: {args.out}")
+    elif args.command == "load":
+        manifest = load_snapshot_into(args.url, args.snapshot)
+        print(f"tables={len(manifest['tables'])} rows={sum(t['rows'] for t in manifest['tables'].values()):,}")
+        print(f"✅ 로컬 DB 적재 완료: {args.url} (DB_URL 로 지정해 사용)")
+
+
+if __name__ == "__main__":
+    main()
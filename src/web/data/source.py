@@ -0,0 +1,113 @@
+"""
+Pluggable data source for the query layer
+쿼리 계층의 데이터 소스 (MySQL DB 또는 로컬 스냅샷)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+from sqlalchemy import text, bindparam
+from config import DB_URL, DATA_BACKEND, SNAPSHOT_DIR
+from data.snapshot import snapshot_exists, load_snapshot_engine
+from data.dialect import create_db_engine
+from data.metrics import get_fetch_metrics, record_query
+
+_capture = threading.local()
+
+
+def get_backend() -> str:
+    """
+    사용할 데이터 백엔드를 결정합니다.
+
+    Returns:
+        str: "db" 또는 "snapshot"
+    """
+    if DATA_BACKEND in ("db", "snapshot"):
+        return DATA_BACKEND
+    # auto: 스냅샷이 있으면 로컬 디스크 우선
+    return "snapshot" if snapshot_exists(SNAPSHOT_DIR) else "db"
+
+
+@st.cache_resource(show_spinner=False)
+def get_engine():
+    """
+    현재 백엔드의 SQLAlchemy 엔진을 생성합니다. (프로세스당 1회)
+
+    Returns:
+        sqlalchemy.engine.Engine: DB 엔진
+    """
+    if get_backend() == "snapshot":
+        return load_snapshot_engine(SNAPSHOT_DIR)
+    if not DB_URL:
+        raise RuntimeError("DB_URL 이 없고 스냅샷도 없습니다. .env 에 DB_URL 을 설정하거나 스냅샷을 생성하세요.")
+    return create_db_engine(DB_URL)
+
+
+def bind_statement(sql: str, params: dict | None = None):
+    """
+    SQL 문자열과 파라미터를 실행 가능한 문장으로 만듭니다.
+
+    Args:
+        sql: SQL 문자열 (:name 형식 바인드 파라미터)
+        params: 바인드 파라미터
+
+    Returns:
+        tuple: (TextClause, 파라미터 dict)
+    """
+    stmt = text(sql)
+    # numpy 스칼라(np.int64 등)는 SQLite 드라이버가 바인딩하지 못하므로 파이썬 값으로 변환
+    params = {k: (v.item() if hasattr(v, "item") else v) for k, v in (params or {}).items()}
+    # 리스트/튜플 값은 IN 절용 expanding 파라미터로 바인딩 — 드라이버의 튜플 바인딩(MySQL 전용)에 의존하지 않고
+    # SQLAlchemy 가 dialect 별 (?, ?, ...) / (%s, %s, ...) 로 펼침
+    seq_keys = [k for k, v in params.items() if isinstance(v, (list, tuple))]
+    if seq_keys:
+        stmt = stmt.bindparams(*(bindparam(k, expanding=True) for k in seq_keys))
+    return stmt, params
+
+
+@contextmanager
+def capture_queries():
+    """
+    이 스레드에서 read_sql 로 실행되는 SQL 과 파라미터를 기록합니다. (EXPLAIN 도구용)
+
+    Yields:
+        list[tuple]: (sql, params) 목록 — 블록 안에서 계속 채워짐
+    """
+    captured = []
+    _capture.log = captured
+    try:
+        yield captured
+    finally:
+        _capture.log = None
+
+
+def read_sql(sql: str, params: dict | None = None) -> pd.DataFrame:
+    """
+    현재 백엔드에서 SQL 을 실행해 DataFrame 으로 반환합니다.
+
+    Args:
+        sql: SQL 문자열 (:name 형식 바인드 파라미터)
+        params: 바인드 파라미터
+
+    Returns:
+        pd.DataFrame: 조회 결과
+    """
+    log = getattr(_capture, "log", None)
+    if log is not None:
+        log.append((sql, dict(params or {})))
+    stmt, params = bind_statement(sql, params)
+    # DB 시간(실행 + 수신)과 DataFrame 생성 시간을 나눠 계측
+    engine = get_engine()
+    t0 = time.perf_counter()
+    with get_fetch_metrics().db_query(), engine.connect() as con:
+        result = con.execute(stmt, params)
+        columns = list(result.keys())
+        records = result.fetchall()
+    t1 = time.perf_counter()
+    # pd.read_sql 과 동일하게 Decimal 등은 float 로 변환
+    df = pd.DataFrame.from_records(records, columns=columns, coerce_float=True)
+    record_query(t1 - t0, time.perf_counter() - t1)
+    return df
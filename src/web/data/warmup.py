@@ -0,0 +1,136 @@
+"""
+Startup cache warmer
+배포 직후 첫 요청이 캐시 hit 가 되도록 업종/주요 상권 분석 데이터를 미리 조회
+
+사용법 (src/web 에서 실행):
+    python -m data.warmup [--areas CODE ...] [--top-n N] [--workers N]
+또는 WARMUP_ON_START=1 로 대시보드 프로세스 시작 시 백그라운드 실행
+"""
+
+import argparse
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import streamlit as st
+from config import FOOD10, CURRENT_YQ, WARMUP_TOP_AREAS, WARMUP_TOP_N, WARMUP_MAX_WORKERS, SALES_CUBE_ENABLED
+from data.query import (
+    fetch_areas_and_categories,
+    fetch_customer_demographics,
+    fetch_category_demographics,
+    fetch_population_patterns,
+    fetch_time_patterns,
+    fetch_category_time_patterns
+)
+from data.demographics import get_demographic_aggregates
+from data.partition import expand_quarters
+from analyzer.scoring import get_score_index
+from analyzer.similarity import get_similarity_index
+from analyzer.recommend_analyzer import load_category_ranking_page
+
+logger = logging.getLogger(__name__)
+
+# 업종 분석 페이지 / 상권 분석 페이지가 조회하는 함수들
+# (추천 업종/상권 상위 5개는 analyzer.scoring 의 점수 색인, 유사 상권은 analyzer.similarity 색인,
+#  성별/연령대는 분기별 인구통계 집계 → 시작 시 한 번 생성.
+#  업종 전체 상권 순위 섹션은 fetch_category_area_ranking 첫 페이지 — 화면과 같은 인자로 조회)
+CATEGORY_FETCHERS = (fetch_category_demographics, fetch_category_time_patterns, load_category_ranking_page)
+AREA_FETCHERS = (fetch_customer_demographics, fetch_population_patterns, fetch_time_patterns)
+
+
+def top_area_codes(n: int) -> list[int]:
+    """
+    외식업 전체 매출 상위 n 개 상권 코드를 반환합니다.
+
+    Args:
+        n: 상권 수
+
+    Returns:
+        list[int]: 상권 코드 리스트
+    """
+    if n <= 0:
+        return []
+    if SALES_CUBE_ENABLED:
+        from data.cube import get_sales_cube
+        totals = get_sales_cube().area_totals(FOOD10)
+    else:
+        from data.query import fetch_sales_2024
+        totals = fetch_sales_2024(None, FOOD10)
+    return totals.nlargest(n, "sales_sum_2024")["commercial_area_code"].astype(int).tolist()
+
+
+def warm_caches(categories=FOOD10, area_codes=None, max_workers: int = WARMUP_MAX_WORKERS) -> dict:
+    """
+    업종/상권 분석 캐시를 채웁니다.
+
+    Args:
+        categories: 업종명 리스트
+        area_codes: 상권 코드 리스트 (None 이면 설정값 또는 매출 상위 상권)
+        max_workers: 동시 조회 수 상한
+
+    Returns:
+        dict: {"ok": 성공 수, "failed": 실패 수, "elapsed": 소요 시간(초)}
+    """
+    t0 = time.perf_counter()
+    fetch_areas_and_categories()
+    get_score_index()
+    get_similarity_index()
+    for yq in expand_quarters(CURRENT_YQ):
+        get_demographic_aggregates(yq)
+    if area_codes is None:
+        area_codes = WARMUP_TOP_AREAS or top_area_codes(WARMUP_TOP_N)
+
+    tasks = [(fn, c) for c in categories for fn in CATEGORY_FETCHERS]
+    tasks += [(fn, int(a)) for a in area_codes for fn in AREA_FETCHERS]
+    logger.info("warm-up 시작: 업종 %d개, 상권 %d개, 조회 %d건 (workers=%d)",
+                len(categories), len(area_codes), len(tasks), max_workers)
+
+    ok = failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="warmup") as pool:
+        futures = {pool.submit(fn, arg): (fn.__name__, arg) for fn, arg in tasks}
+        for i, f in enumerate(as_completed(futures), start=1):
+            name, arg = futures[f]
+            try:
+                f.result()
+                ok += 1
+            except Exception:
+                failed += 1
+                logger.exception("warm-up 실패: %s(%s)", name, arg)
+            if i % 10 == 0 or i == len(tasks):
+                logger.info("warm-up 진행: %d/%d (%.1fs)", i, len(tasks), time.perf_counter() - t0)
+
+    elapsed = time.perf_counter() - t0
+    logger.info("warm-up 완료: 성공 %d, 실패 %d, %.1fs", ok, failed, elapsed)
+    return {"ok": ok, "failed": failed, "elapsed": elapsed}
+
+
+@st.cache_resource(show_spinner=False)
+def start_background_warmup() -> threading.Thread:
+    """
+    프로세스당 한 번 백그라운드 스레드에서 warm-up 을 시작합니다.
+
+    Returns:
+        threading.Thread: warm-up 스레드
+    """
+    t = threading.Thread(target=warm_caches, name="cache-warmup", daemon=True)
+    t.start()
+    return t
+
+
+def main(argv=None):
+    """warm-up CLI 진입점"""
+    parser = argparse.ArgumentParser(description="분석 캐시 warm-up")
+    parser.add_argument("--areas", nargs="*", type=int, default=None, help="warm-up 할 상권 코드")
+    parser.add_argument("--top-n", type=int, default=WARMUP_TOP_N, help="--areas 미지정 시 매출 상위 상권 수")
+    parser.add_argument("--workers", type=int, default=WARMUP_MAX_WORKERS, help="동시 조회 수")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    area_codes = args.areas if args.areas is not None else (WARMUP_TOP_AREAS or top_area_codes(args.top_n))
+    result = warm_caches(FOOD10, area_codes, args.workers)
+    print(f"✅ warm-up 완료: 성공 {result['ok']}, 실패 {result['failed']}, {result['elapsed']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+pytest 공통 설정
+src/web 을 import 경로에 넣고, config 를 읽기 전에 임시 fixture DB(bench/fixture.py)를 쓰도록 환경변수를 지정합니다.
+
+사용법 (src/web 에서 실행):
+    python -m pytest -q
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+WEB_DIR = Path(__file__).resolve().parent.parent
+FIXTURE_DIR = Path(tempfile.mkdtemp(prefix="web_tests_"))
+FIXTURE_DB = FIXTURE_DIR / "fixture.db"
+FIXTURE_SCALE = 0.1  # 상권 165개
+
+sys.path.insert(0, str(WEB_DIR))
+os.environ.update({
+    "DB_URL": f"sqlite:///{FIXTURE_DB}",
+    "DATA_BACKEND": "db",
+    "RESULT_CACHE_ENABLED": "0",
+    "AGGREGATE_VERSION_DIR": str(FIXTURE_DIR / "versions"),
+    "WARMUP_ON_START": "0",
+    "METRICS_EXPORT_PATH": "",
+    "STREAMLIT_LOGGER_LEVEL": "error",
+})
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fixture_db() -> Path:
+    """세션당 한 번 fixture DB 를 만듭니다."""
+    from bench.fixture import build_fixture
+    build_fixture(FIXTURE_DB, FIXTURE_SCALE)
+    return FIXTURE_DB
@@ -0,0 +1,47 @@
+"""
+data/areas.py — 상권 검색 색인 (접두/부분/초성, 여러 토큰)
+"""
+
+import pytest
+from data.areas import AreaSearchIndex, get_area_registry, to_chosung
+
+
+@pytest.fixture(scope="module")
+def index():
+    return AreaSearchIndex(get_area_registry())
+
+
+@pytest.fixture(scope="module")
+def record():
+    return get_area_registry().records[5]
+
+
+def test_empty_query_returns_default_order(index):
+    assert index.search("", k=3) == [index.registry.records[i] for i in index._default[:3]]
+
+
+def test_exact_name_first(index, record):
+    assert index.search(record.name)[0] is record
+
+
+def test_tokens_across_fields(index, record):
+    results = index.search(f"{record.gu} {record.dong}", k=1000)
+    expected = {r.code for r in index.registry.records if r.gu == record.gu and r.dong == record.dong}
+    assert {r.code for r in results} == expected
+
+
+def test_full_label(index, record):
+    assert index.search(record.full_label)[0] is record
+
+
+def test_chosung_and_mixed(index, record):
+    dong = record.dong
+    chosung = {r.code for r in index.search(to_chosung(dong), k=1000)}
+    mixed = {r.code for r in index.search(to_chosung(dong[0]) + dong[1:], k=1000)}
+    text = {r.code for r in index.search(dong, k=1000)}
+    assert record.code in mixed
+    assert text <= mixed <= chosung
+
+
+def test_no_match(index, record):
+    assert index.search(f"{record.name} 없는토큰") == []
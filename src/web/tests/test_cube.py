@@ -0,0 +1,55 @@
+"""
+data/cube.py — 매출 큐브와 SQL 집계 경로의 결과 일치
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from config import FOOD10, ALL_YQ, CURRENT_YQ
+from data import cube, query
+from data.partition import expand_quarters
+
+QUARTERS = [CURRENT_YQ, ALL_YQ]
+
+
+@pytest.fixture
+def sql_only(monkeypatch):
+    """매출 큐브를 끈 조회 경로 (SALES_CUBE_ENABLED=0 과 같음)"""
+    monkeypatch.setattr(query, "SALES_CUBE_ENABLED", False)
+    monkeypatch.setattr(cube, "SALES_CUBE_ENABLED", False)
+
+
+def _by_area(df, value):
+    return df.set_index(df["commercial_area_code"].astype("int64"))[value].astype("int64").sort_index()
+
+
+@pytest.mark.parametrize("quarters", QUARTERS)
+def test_area_totals_match_sql(quarters, sql_only):
+    expected = _by_area(query.fetch_sales_2024(None, FOOD10, quarters=quarters), "sales_sum_2024")
+    actual = cube.get_sales_cube().area_totals(FOOD10, None, expand_quarters(quarters))
+    actual = _by_area(actual[actual["sales_sum_2024"] > 0], "sales_sum_2024")
+    pd.testing.assert_series_equal(actual, expected, check_names=False)
+
+
+@pytest.mark.parametrize("quarters", QUARTERS)
+def test_area_breakdown_matches_sql(quarters, sql_only):
+    area = int(query.fetch_areas_and_categories()[0]["commercial_area_code"].iloc[0])
+    key = ["service_category_name"]
+    expected = (query.fetch_commercial_area_analysis(area, quarters=quarters)
+                .astype({"service_category_name": str}).sort_values(key).reset_index(drop=True))
+    actual = (cube.get_sales_cube().area_breakdown(area, expand_quarters(quarters))
+              .astype({"service_category_name": str}).sort_values(key).reset_index(drop=True))
+    assert actual["service_category_name"].tolist() == expected["service_category_name"].tolist()
+    assert actual["total_sales"].astype("int64").tolist() == expected["total_sales"].astype("int64").tolist()
+
+
+@pytest.mark.parametrize("quarters", QUARTERS)
+def test_period_cube_matches_full_cube(quarters, sql_only):
+    full = cube.get_sales_cube()
+    period = cube.get_period_cube(quarters)
+    full_sales, _, _ = full.period(expand_quarters(quarters))
+    period_sales, _, _ = period.period(expand_quarters(quarters))
+    for code, i in period.area_index.items():
+        j = full.area_index[code]
+        ci = [full.categories.index(c) for c in period.categories]
+        np.testing.assert_array_equal(period_sales[i], full_sales[j, ci])
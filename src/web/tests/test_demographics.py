@@ -0,0 +1,50 @@
+"""
+data/demographics.py — 성별/연령대 사전 집계 (매출 테이블별 분리 집계, 분기 버전)
+"""
+
+from config import ALL_YQ, CURRENT_YQ
+from data.demographics import (
+    aggregate_version, bump_aggregate_version, demographics_for, get_demographic_aggregates
+)
+from data.partition import expand_quarters
+from data.query import fetch_areas_and_categories
+from data.source import read_sql
+
+
+def _area():
+    return int(fetch_areas_and_categories()[0]["commercial_area_code"].iloc[0])
+
+
+def _direct(table, column, area, quarters):
+    """상권 하나의 구분별 매출 합계 — 다른 매출 테이블과 조인하지 않음"""
+    sql = f"""
+    SELECT d.{column} AS bucket, SUM(d.sales) AS sales
+    FROM Shop_Count sh JOIN {table} d ON d.store_id = sh.id
+    WHERE sh.commercial_area_code = :area AND sh.year_quarter BETWEEN :a AND :b
+    GROUP BY d.{column}
+    """
+    yqs = expand_quarters(quarters)
+    df = read_sql(sql, {"area": area, "a": yqs[0], "b": yqs[-1]})
+    return dict(zip(df["bucket"], df["sales"].astype("int64")))
+
+
+def test_area_totals_match_source():
+    area = _area()
+    for quarters in (CURRENT_YQ, ALL_YQ):
+        df = demographics_for("area", area, quarters)
+        sex = df[df["sex"].notna()]
+        age = df[df["age"].notna()]
+        assert dict(zip(sex["sex"], sex["sales_by_gender"].astype("int64"))) == \
+            _direct("Sales_Sex", "sex", area, quarters)
+        assert dict(zip(age["age"], age["sales_by_age"].astype("int64"))) == \
+            _direct("Sales_Age", "age", area, quarters)
+
+
+def test_version_bump_rebuilds():
+    yq = expand_quarters(CURRENT_YQ)[0]
+    before = get_demographic_aggregates(yq)
+    assert get_demographic_aggregates(yq) is before
+    version = aggregate_version(yq)
+    bump_aggregate_version(yq)
+    assert aggregate_version(yq) != version
+    assert get_demographic_aggregates(yq) is not before
@@ -0,0 +1,54 @@
+"""
+analyzer/recommend_analyzer.py — 업종 전체 상권 순위 keyset 페이지
+"""
+
+import numpy as np
+import pandas as pd
+from config import FOOD10, CATEGORY_RANKING_PAGE_SIZE
+from analyzer.recommend_analyzer import load_category_ranking_page
+from data.query import fetch_category_area_ranking
+
+
+def _all_pages(category):
+    pages, cursor, has_next = [], None, True
+    while has_next:
+        page, has_next = load_category_ranking_page(category, cursor)
+        assert not page.empty
+        assert len(page) <= CATEGORY_RANKING_PAGE_SIZE
+        pages.append(page)
+        cursor = (int(page["sales_rank"].iloc[-1]), int(page["commercial_area_code"].iloc[-1]))
+    return pd.concat(pages, ignore_index=True)
+
+
+def test_pages_cover_every_area_once():
+    category = FOOD10[0]
+    rows = _all_pages(category)
+    full = fetch_category_area_ranking(category, None, 1_000_000)
+    assert len(rows) == int(full["n_areas"].iloc[0]) == len(full)
+    assert rows["commercial_area_code"].is_unique
+    assert rows["commercial_area_code"].tolist() == full["commercial_area_code"].tolist()
+
+
+def test_no_next_page_after_last_row():
+    category = FOOD10[0]
+    full = fetch_category_area_ranking(category, None, 1_000_000)
+    last = full.iloc[-2]
+    page, has_next = load_category_ranking_page(category, (int(last["sales_rank"]), int(last["commercial_area_code"])))
+    assert len(page) == 1 and not has_next
+
+
+def test_avg_sales_is_per_quarter_over_a_period():
+    from config import ALL_YQ
+    from data.partition import expand_quarters
+
+    category = FOOD10[0]
+    period = fetch_category_area_ranking(category, None, 1_000_000, ALL_YQ).set_index("commercial_area_code")
+    n_quarters = pd.concat(
+        fetch_category_area_ranking(category, None, 1_000_000, (yq, yq))["commercial_area_code"]
+        for yq in expand_quarters(ALL_YQ)
+    ).value_counts()
+    assert (n_quarters > 1).any()
+    # 기간 매출 합계를 분기 수와 평균 점포 수로 나눈 점포당 분기 매출
+    expected = period["total_sales"] / n_quarters.reindex(period.index) / period["shop_count"]
+    has_shops = period["shop_count"] > 0
+    assert np.allclose(period.loc[has_shops, "avg_sales"], expected[has_shops])
@@ -0,0 +1,54 @@
+"""
+data/result_cache.py — 공유 결과 캐시 키, 채우기 잠금, 데코레이터
+"""
+
+import numpy as np
+import pytest
+from data import result_cache
+from data.result_cache import ResultCache, _make_key, shared_cache
+
+
+def _query(area_code, cats, quarters=(20244, 20244)):
+    return area_code, cats, quarters
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path / "results.sqlite", 1 << 20, fill_timeout=1, flush_interval=0)
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_ENABLED", True)
+    monkeypatch.setattr(result_cache, "get_result_cache", lambda: cache)
+    return cache
+
+
+def test_equivalent_calls_share_a_key():
+    key = _make_key(_query, (5, ["a", "b"]), {})
+    assert _make_key(_query, (np.int64(5), ("a", "b")), {}) == key
+    assert _make_key(_query, (), {"area_code": 5, "cats": ["a", "b"]}) == key
+    assert _make_key(_query, (5, ["a", "b"], (20244, 20244)), {}) == key
+    assert _make_key(_query, (6, ["a", "b"]), {}) != key
+
+
+def test_clear_releases_fill_locks(cache):
+    other = ResultCache(cache.path, 1 << 20, fill_timeout=60)
+    other.owner = "other"
+    assert other.try_begin_fill("k")
+    assert not cache.try_begin_fill("k")
+    cache.clear()
+    assert cache.try_begin_fill("k")
+
+
+def test_shared_cache_fills_once(cache):
+    calls = []
+
+    @shared_cache()
+    def fetch(area_code, cats):
+        calls.append(area_code)
+        return {"area": area_code, "cats": list(cats)}
+
+    assert fetch(5, ["a"]) == fetch(np.int64(5), ("a",)) == {"area": 5, "cats": ["a"]}
+    assert calls == [5]
+    fetch.invalidate(5, ["a"])
+    fetch(5, ["a"])
+    assert calls == [5, 5]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1)
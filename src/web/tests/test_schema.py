@@ -0,0 +1,37 @@
+"""
+data/schema.py — 조회 함수 결과의 dtype 스키마와 캐시 프레임 통계
+"""
+
+import pandas as pd
+from data.schema import SCHEMA_ATTR, check_frame, get_schema_stats, fetcher_cases
+
+
+def test_fetchers_match_schema():
+    problems = []
+    for name, dataset, call in fetcher_cases():
+        problems += [f"{name}: {p}" for p in check_frame(call(), dataset)]
+    assert problems == []
+
+
+def test_cached_frame_recorded_once():
+    from data import query as q
+
+    stats = get_schema_stats()
+    stats.reset()
+    q._fetch_income_q.clear()
+    for _ in range(3):
+        q.fetch_income_2024()
+    q._fetch_income_q.clear()
+    q.fetch_income_2024()   # 같은 키를 다시 채워도 한 벌
+
+    report = stats.to_frame().set_index("dataset")
+    assert report.loc["income", "frames"] == 1
+    assert report.loc["income", "saved_kb"] > 0
+
+
+def test_schema_tag_survives_pickle():
+    import pickle
+    from data.schema import apply_schema
+
+    df = apply_schema(pd.DataFrame({"dong_code": [1, 2], "dong_name": ["가", "나"]}), "income")
+    assert pickle.loads(pickle.dumps(df)).attrs[SCHEMA_ATTR][0] == "income"
@@ -4,16 +4,27 @@ UI module for the dashboard
 """
 
 from .sidebar import render_sidebar, render_sidebar_for_recommand
-from .chart_renderer import render_all_charts
+from .chart_renderer import render_all_charts, render_dong_choropleth
 from .recommend_ui import (
     display_area_analysis_results,
-    display_category_analysis_results
+    display_category_analysis_results,
+    display_demographics,
+    display_population_patterns,
+    display_category_time_patterns,
+    display_category_ranking,
+    render_lazy_sections
 )
 
 __all__ = [
     'render_sidebar',
     'render_sidebar_for_recommand',
     'render_all_charts',
+    'render_dong_choropleth',
     'display_area_analysis_results',
-    'display_category_analysis_results'
+    'display_category_analysis_results',
+    'display_demographics',
+    'display_population_patterns',
+    'display_category_time_patterns',
+    'display_category_ranking',
+    'render_lazy_sections'
 ]
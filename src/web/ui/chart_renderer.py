@@ -7,9 +7,13 @@ import streamlit as st
 import streamlit.components.v1 as components
 from charts import (
     create_sales_comparison_chart, create_gender_day_chart, create_time_population_chart,
-    create_population_chart, create_expenditure_chart, create_kakao_map
+    create_population_chart, create_expenditure_chart, create_kakao_map,
+    create_dong_choropleth
 )
+from charts.choropleth import MAP_HEIGHT
+from data.areas import get_area_registry
 from utils import get_secret
+from .recommend_ui import render_lazy_sections
 
 
 def render_all_charts(selected_area_codes, sel_cats, all_categories, 
@@ -53,6 +57,12 @@ def render_all_charts(selected_area_codes, sel_cats, all_categories,
     with col6:
         _render_kakao_map(selected_area_codes, df_areas)
 
+    # 서울 전체 행정동 지도는 필터와 무관하고 무거우므로 선택 시에만 렌더링
+    render_lazy_sections("all_charts_sections", {
+        # 지도는 캐시된 HTML 이라 섹션 데이터 컨텍스트를 쓰지 않음
+        "🗺️ 행정동 지도": (lambda ctx: render_dong_choropleth(), ()),
+    })
+
 
 def _render_sales_chart(selected_area_codes, sel_cats, all_categories):
     """매출 비교 차트를 렌더링합니다."""
@@ -101,7 +111,13 @@ def _render_population_chart(df_pga, selected_area_codes, df_sales):
 def _render_expenditure_chart(df_income, selected_area_codes, df_areas):
     """지출 차트를 렌더링합니다."""
     st.subheader("5. 상권 소속 동의 연간 총지출 · 음식지출")
-    
+
+    # 상권이 여럿이면 소속 동을 볼 상권 하나를 고름
+    pick = df_areas[df_areas["commercial_area_code"].isin(selected_area_codes or [])]
+    if len(pick) > 1:
+        pick_name = st.selectbox("어느 상권의 소속 동을 보시겠습니까?", options=pick["area_name"].tolist())
+        selected_area_codes = pick.loc[pick["area_name"] == pick_name, "commercial_area_code"].head(1).tolist()
+
     fig, title = create_expenditure_chart(df_income, selected_area_codes, df_areas)
     if fig:
         st.plotly_chart(fig, use_container_width=True)
@@ -121,8 +137,20 @@ def _render_kakao_map(selected_area_codes, df_areas):
     if not selected_area_codes:
         st.info("사이드바에서 상권을 1개 선택하면 해당 위치로 지도가 표시됩니다.")
     else:
-        html = create_kakao_map(selected_area_codes, df_areas)
+        html = create_kakao_map(get_area_registry().get(selected_area_codes[0]))
         if html:
             components.html(html, height=350)
         else:
             st.warning("선택한 상권의 좌표(lat/lon)를 찾을 수 없습니다.")
+
+
+def render_dong_choropleth():
+    """서울시 행정동 단계구분도를 렌더링합니다. (지표 전환은 지도 안 버튼으로 처리)"""
+    st.subheader("서울시 행정동별 외식업 매출 · 음식 지출 · 유동인구")
+
+    try:
+        html = create_dong_choropleth()
+    except FileNotFoundError:
+        st.info("행정동 경계 파일이 없어 지도를 표시할 수 없습니다.")
+        return
+    components.html(html, height=MAP_HEIGHT + 20)
@@ -6,21 +6,15 @@ Recommendation UI functions
 import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
-from config import TIME_X_VALS, TIME_LABELS, DAY_LABELS, GENDER_LABELS
-from data.query import (
-    fetch_commercial_area_analysis,
-    fetch_business_category_analysis,
-    fetch_customer_demographics,
-    fetch_category_demographics,
-    fetch_population_patterns,
-    fetch_time_patterns
-)
+from config import TIME_X_VALS, TIME_LABELS, DAY_LABELS, GENDER_LABELS, SIMILAR_RADIUS_KM
 from charts.map import create_kakao_map
+from charts.figure_cache import cached_figure
 from charts import create_sales_comparison_chart, create_population_chart, create_expenditure_chart
+from data.context import DataContext
 
 
-def display_area_analysis_results(area_name, area_info, area_analysis, demographics, population_patterns, time_patterns, population_chart=None):
-    """상권 분석 결과를 표시합니다."""
+def display_area_analysis_results(area_name, area_info, area_analysis, similar_areas=None):
+    """상권 분석 결과(기본 정보, 추천 업종, 유사 상권)를 표시합니다. 무거운 섹션은 render_lazy_sections 로 따로 표시합니다."""
     
     st.markdown("---")
     st.subheader(f"📊 '{area_name}' 상권 분석 결과")
@@ -28,28 +22,18 @@ def display_area_analysis_results(area_name, area_info, area_analysis, demograph
     # 기본 정보
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("지역", f"{area_info['gu']} {area_info['dong']}")
+        st.metric("지역", f"{area_info.gu} {area_info.dong}")
     with col2:
-        st.metric("위도", f"{area_info['lat']:.4f}")
+        st.metric("위도", f"{area_info.lat:.4f}")
     with col3:
-        st.metric("경도", f"{area_info['lon']:.4f}")
+        st.metric("경도", f"{area_info.lon:.4f}")
     with col4:
-        # Create a DataFrame for the map function
-        df_area = pd.DataFrame([{
-            'commercial_area_code': area_info['commercial_area_code'],
-            'lat': area_info['lat'],
-            'lon': area_info['lon'],
-            'area_name': area_name,
-            'gu': area_info['gu'],
-            'dong': area_info['dong']
-        }])
-        
         # Create Kakao map
-        map_html = create_kakao_map([area_info['commercial_area_code']], df_area)
+        map_html = create_kakao_map(area_info)
         if map_html:
             components.html(map_html, height=300)
         else:
-            st.metric("상권코드", area_info['commercial_area_code'])
+            st.metric("상권코드", area_info.code)
     
     # 추천 업종
     if not area_analysis.empty:
@@ -76,67 +60,132 @@ def display_area_analysis_results(area_name, area_info, area_analysis, demograph
                 with col2:
                     st.write(f"**업종명**: {category_name}")
                     st.write(f"**점포당 분기별 평균 매출**: {avg_sales:,.0f}원")
-    
-    # 고객 인구통계
-    if not demographics.empty:
-        st.subheader("👥 고객 인구통계")
+                    if 'score' in row:
+                        st.write(f"**추천 점수**: {row['score']:.1f}점")
 
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            gender_data = demographics.groupby('sex')['sales_by_gender'].sum()
-            if not gender_data.empty:
-                st.write("**성별 매출 분포**")
-                fig_gender = create_gender_sales_chart(gender_data)
-                st.plotly_chart(fig_gender, use_container_width=True)
-        
-        with col2:
-            age_data = demographics.groupby('age')['sales_by_age'].sum()
-            if not age_data.empty:
-                st.write("**연령대 매출 분포**")
-                fig_age = create_age_sales_chart(age_data)
-                st.plotly_chart(fig_age, use_container_width=True)
+    # 유사 상권
+    if similar_areas:
+        _display_similar_areas(similar_areas)
+
+
+def display_demographics(demographics):
+    """고객 인구통계(성별/연령대 매출 분포)를 표시합니다. (상권/업종 공용)"""
+    if demographics.empty:
+        st.info("인구통계 데이터가 없습니다.")
+        return
+
+    col1, col2 = st.columns(2)
     
-    # 인구 패턴
-    if not population_patterns.empty:
-        st.subheader("📈 인구 패턴 분석")
-        
-        col1, col2 = st.columns(2)
-        col3, col4 = st.columns(2)
-
-        with col1:
-            st.write("**요일별 유동인구**")
-            # 실제 컬럼명 사용: mon, tue, wed, thu, fri, sat, sun
-            day_columns = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
-            day_data = population_patterns[day_columns].iloc[0]
-            fig_day = create_day_pattern_chart(day_data)
-            st.plotly_chart(fig_day, use_container_width=True)
-        
-        with col2:
-            st.write("**성별 유동인구**")
-            # 실제 컬럼명 사용: male, female
-            gender_columns = ['male', 'female']
-            gender_data = population_patterns[gender_columns].iloc[0]
-            fig_gender = create_gender_population_chart(gender_data)
+    with col1:
+        # 성별 데이터 처리
+        gender_data = demographics.groupby('sex')['sales_by_gender'].sum()
+        if not gender_data.empty:
+            st.write("**성별 매출 분포**")
+            fig_gender = create_gender_sales_chart(gender_data)
             st.plotly_chart(fig_gender, use_container_width=True)
-        
-        with col3:
-            if not time_patterns.empty:
-                st.write("**시간대별 유동인구 패턴**")
-                fig_time = create_time_population_chart(time_patterns)
-                if fig_time:
-                    st.plotly_chart(fig_time, use_container_width=True)
-        
-        with col4:
-            st.write("**상주/직장인구**")
-            if population_chart:
-                st.plotly_chart(population_chart, use_container_width=True, key="population_chart_pattern")
-            else:
-                st.info("인구 데이터를 불러올 수 없습니다.")
     
+    with col2:
+        # 연령대 데이터 처리
+        age_data = demographics.groupby('age')['sales_by_age'].sum()
+        if not age_data.empty:
+            st.write("**연령대 매출 분포**")
+            fig_age = create_age_sales_chart(age_data)
+            st.plotly_chart(fig_age, use_container_width=True)
+
+
+def display_population_patterns(population_patterns, time_patterns, population_chart=None):
+    """상권 인구 패턴(요일별, 성별, 시간대별 유동인구, 상주/직장인구)을 표시합니다."""
+    if population_patterns.empty:
+        st.info("인구 패턴 데이터가 없습니다.")
+        return
+
+    col1, col2 = st.columns(2)
+    col3, col4 = st.columns(2)
+
+    with col1:
+        st.write("**요일별 유동인구**")
+        # 실제 컬럼명 사용: mon, tue, wed, thu, fri, sat, sun
+        day_columns = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+        day_data = population_patterns[day_columns].iloc[0]
+        fig_day = create_day_pattern_chart(day_data)
+        st.plotly_chart(fig_day, use_container_width=True)
+    
+    with col2:
+        st.write("**성별 유동인구**")
+        # 실제 컬럼명 사용: male, female
+        gender_columns = ['male', 'female']
+        gender_data = population_patterns[gender_columns].iloc[0]
+        fig_gender = create_gender_population_chart(gender_data)
+        st.plotly_chart(fig_gender, use_container_width=True)
+    
+    with col3:
+        if not time_patterns.empty:
+            st.write("**시간대별 유동인구 패턴**")
+            fig_time = create_time_population_chart(time_patterns)
+            if fig_time:
+                st.plotly_chart(fig_time, use_container_width=True)
+    
+    with col4:
+        st.write("**상주/직장인구**")
+        if population_chart:
+            st.plotly_chart(population_chart, use_container_width=True, key="population_chart_pattern")
+        else:
+            st.info("인구 데이터를 불러올 수 없습니다.")
+
+
+@st.fragment
+def render_lazy_sections(key, sections):
+    """
+    무거운 섹션을 골라 보는 탭을 렌더링합니다. 선택한 섹션의 데이터만 조회/렌더링합니다.
+    fragment 로 실행되므로 섹션 전환은 이 영역만 다시 실행합니다. (페이지 전체와 사이드바는 그대로)
+    실행마다 새 DataContext(범위 = key)를 만들어 렌더링 함수에 넘기고, 끝나면 요청 기록을 남깁니다.
+
+    Args:
+        key: 섹션 선택 위젯 키
+        sections: {섹션 제목: (렌더링 함수, 인자 튜플)} — 제목 순서대로 표시,
+                  렌더링 함수는 render(*인자, ctx) 로 호출
+    """
+    ctx = DataContext(scope=key)
+    try:
+        choice = st.segmented_control("상세 항목", list(sections), key=key, label_visibility="collapsed")
+        if choice is None:
+            st.caption("보려는 항목을 선택하면 해당 데이터만 불러옵니다.")
+            return
+        st.subheader(choice)
+        render, args = sections[choice]
+        render(*args, ctx)
+    finally:
+        ctx.publish()
 
-def display_category_analysis_results(category_name, category_analysis, category_demographics, category_time_patterns):
-    """업종 분석 결과를 표시합니다."""
+
+def _display_similar_areas(similar_areas):
+    """유사 상권 목록을 표시합니다. (서울 전체 / 반경 이내 탭)"""
+    st.subheader("🧭 유사 상권")
+    st.caption("요일·시간대 유동인구 비중, 성비, 상주/직장 인구, 외식 업종 매출 구성이 비슷한 상권")
+
+    tab_all, tab_near = st.tabs(["서울 전체", f"반경 {SIMILAR_RADIUS_KM:g}km 이내"])
+    for tab, key in ((tab_all, "all"), (tab_near, "nearby")):
+        with tab:
+            df = similar_areas.get(key)
+            if df is None or df.empty:
+                st.info("비교할 수 있는 상권이 없습니다.")
+                continue
+            st.dataframe(
+                df.assign(region=df["gu"].fillna("") + " " + df["dong"].fillna(""))[
+                    ["commercial_area_name", "region", "similarity", "distance_km"]],
+                column_config={
+                    "commercial_area_name": "상권명",
+                    "region": "지역",
+                    "similarity": st.column_config.ProgressColumn("유사도", format="%.1f", min_value=0, max_value=100),
+                    "distance_km": st.column_config.NumberColumn("거리", format="%.1f km"),
+                },
+                hide_index=True,
+                use_container_width=True,
+            )
+
+
+def display_category_analysis_results(category_name, category_analysis):
+    """업종 분석 결과(추천 상권)를 표시합니다. 무거운 섹션은 render_lazy_sections 로 따로 표시합니다."""
     
     st.markdown("---")
     st.subheader(f"📊 '{category_name}' 업종 분석 결과")
@@ -170,38 +219,68 @@ def display_category_analysis_results(category_name, category_analysis, category
                     st.write(f"**점포 수**: {int(shop_count)}개")
                     if shop_count > 0:
                         st.write(f"**점포당 분기별 평균 매출**: {avg_sales:,.2f}원")
-    
-    # 업종별 고객 특성
-    if not category_demographics.empty:
-        st.subheader("👥 업종별 고객 특성")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # 성별 데이터 처리
-            gender_data = category_demographics.groupby('sex')['sales_by_gender'].sum()
-            if not gender_data.empty:
-                st.write("**성별 매출 분포**")
-                fig_gender = create_gender_sales_chart(gender_data)
-                st.plotly_chart(fig_gender, use_container_width=True)
-        
-        with col2:
-            # 연령대 데이터 처리
-            age_data = category_demographics.groupby('age')['sales_by_age'].sum()
-            if not age_data.empty:
-                st.write("**연령대 매출 분포**")
-                fig_age = create_age_sales_chart(age_data)
-                st.plotly_chart(fig_age, use_container_width=True)
-        
-    # 시간대별 유동인구 패턴
-    if not category_time_patterns.empty:
-        st.subheader("⏰ 시간대별 유동인구 패턴")
-        st.write("**상위 상권들의 시간대별 유동인구 분석**")
-        fig_time = create_time_population_chart(category_time_patterns)
-        if fig_time:
-            st.plotly_chart(fig_time, use_container_width=True)
+                    if 'score' in row:
+                        st.write(f"**추천 점수**: {row['score']:.1f}점")
+
+
+def display_category_time_patterns(category_time_patterns):
+    """업종 매출 상위 상권의 시간대별 유동인구 패턴을 표시합니다."""
+    if category_time_patterns.empty:
+        st.info("시간대별 유동인구 데이터가 없습니다.")
+        return
+    st.write(f"**매출 상위 {len(category_time_patterns)}개 상권의 시간대별 유동인구 분석**")
+    fig_time = create_time_population_chart(category_time_patterns)
+    if fig_time:
+        st.plotly_chart(fig_time, use_container_width=True)
+
+
+def display_category_ranking(category_name, load_page):
+    """
+    업종의 전체 상권 순위를 페이지 단위로 표시합니다. (이전/다음 — 현재 페이지만 조회)
+
+    Args:
+        category_name: 업종명
+        load_page: 커서 → (순위 페이지 DataFrame, 다음 페이지 유무) 를 반환하는 함수
+    """
+    # 지나온 페이지의 시작 커서 스택 (첫 페이지는 None)
+    key = f"category_ranking_cursors_{category_name}"
+    cursors = st.session_state.setdefault(key, [None])
+    page, has_next = load_page(cursors[-1])
+    if page.empty:
+        st.info("순위 데이터가 없습니다.")
+    else:
+        n_areas = int(page["n_areas"].iloc[0])
+        st.caption(f"전체 {n_areas:,}개 상권 중 {int(page['sales_rank'].iloc[0]):,}~"
+                   f"{int(page['sales_rank'].iloc[-1]):,}위 (점포당 분기별 매출 순)")
+        st.dataframe(
+            page.assign(region=page["gu"].astype(str) + " " + page["dong"].astype(str),
+                        top_pct=page["sales_rank"] / n_areas * 100)[
+                ["sales_rank", "commercial_area_name", "region", "avg_sales", "shop_count", "top_pct"]],
+            column_config={
+                "sales_rank": "순위",
+                "commercial_area_name": "상권명",
+                "region": "지역",
+                "avg_sales": st.column_config.NumberColumn("점포당 분기 매출", format="%d원"),
+                "shop_count": "점포 수",
+                "top_pct": st.column_config.NumberColumn("상위", format="%.1f%%"),
+            },
+            hide_index=True,
+            use_container_width=True,
+        )
+
+    # 빈 페이지여도 이전 버튼은 표시 (커서 스택은 세션 동안 유지되므로 되돌아갈 수 있어야 함)
+    # 커서 스택은 클릭 콜백에서 바꿈 → 다시 실행될 때 바로 새 페이지를 조회
+    next_cursor = (int(page["sales_rank"].iloc[-1]), int(page["commercial_area_code"].iloc[-1])) if has_next else None
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("◀ 이전", key=f"{key}_prev", disabled=len(cursors) == 1, use_container_width=True,
+                  on_click=cursors.pop)
+    with col2:
+        st.button("다음 ▶", key=f"{key}_next", disabled=not has_next, use_container_width=True,
+                  on_click=cursors.append, args=(next_cursor,))
 
 
+@cached_figure
 def create_gender_sales_chart(gender_data):
     """성별 매출 분포 파이 차트를 생성합니다."""
     import plotly.express as px
@@ -227,6 +306,7 @@ def create_gender_sales_chart(gender_data):
     return fig
 
 
+@cached_figure
 def create_age_sales_chart(age_data):
     """연령대 매출 분포 차트를 생성합니다."""
     import plotly.graph_objects as go
@@ -269,6 +349,7 @@ def create_age_sales_chart(age_data):
     return fig
 
 
+@cached_figure
 def create_gender_population_chart(gender_data):
     """성별 유동인구 파이 차트를 생성합니다."""
     import plotly.express as px
@@ -291,6 +372,7 @@ def create_gender_population_chart(gender_data):
     return fig
 
 
+@cached_figure
 def create_day_pattern_chart(day_data):
     """요일별 패턴 차트를 생성합니다."""
     import plotly.graph_objects as go
@@ -302,6 +384,7 @@ def create_day_pattern_chart(day_data):
     return fig
 
 
+@cached_figure
 def create_time_population_chart(time_data):
     """시간대별 유동인구 차트를 생성합니다."""
     import plotly.graph_objects as go
@@ -5,6 +5,20 @@ Sidebar functions for the dashboard
 
 import streamlit as st
 from data import fetch_areas_and_categories, fetch_dong_map_for_areas
+from data.areas import get_area_registry, get_area_search_index
+from data.context import DataContext, published_log
+from data.reference import clear_reference_data, get_reference_data
+from data.schema import get_schema_stats
+from data.cube import get_sales_cube
+from data.demographics import clear_demographic_aggregates
+from data.geo import get_area_dong_index
+from charts.choropleth import create_dong_choropleth
+from analyzer.scoring import get_score_index
+from analyzer.similarity import get_similarity_index
+from charts.figure_cache import get_figure_cache
+from data.result_cache import get_result_cache
+from data.metrics import get_fetch_metrics
+from config import RESULT_CACHE_ENABLED, AREA_SEARCH_TOP_K
 
 
 def render_sidebar():
@@ -37,84 +51,131 @@ def render_sidebar():
     )
 
     # 캐시/디버그 섹션
-    _render_debug_section()
+    with st.sidebar:
+        _render_debug_section()
 
     return selected_area_codes, sel_cats, areas_key, cats_key, df_areas, all_categories
 
 def render_sidebar_for_recommand():
     """
     추천 시스템용 사이드바를 렌더링합니다.
-    
+    사이드바는 fragment 로 실행되므로 검색/선택 위젯을 바꿔도 사이드바만 다시 실행합니다.
+    분석 시작 버튼만 전체 페이지를 다시 실행합니다.
+        
     Returns:
         tuple: (recommend_type, selected_area, selected_category, df_areas, categories)
     """
-    st.sidebar.header("🎯 추천 시스템")
+    with st.sidebar:
+        return _recommend_sidebar()
+
+
+@st.fragment
+def _recommend_sidebar():
+    """
+    추천 시스템 사이드바 본문 (fragment — st.sidebar 컨텍스트 안에서 호출)
+    실행마다 새 DataContext(범위 "sidebar")를 쓰고 끝나면 요청 기록을 남깁니다.
+    """
+    ctx = DataContext(scope="sidebar")
+    try:
+        return _recommend_sidebar_body(ctx)
+    finally:
+        ctx.publish()
+
+
+def _recommend_sidebar_body(ctx):
+    """사이드바 위젯과 데이터 조회"""
+    st.header("🎯 추천 시스템")
     
     # 추천 타입 선택
-    st.sidebar.subheader("📊 추천 유형 선택")
-    recommend_type = st.sidebar.radio(
+    st.subheader("📊 추천 유형 선택")
+    recommend_type = st.radio(
         "어떤 추천을 받고 싶으신가요?",
         ["상권명 기반 분석", "업종 기반 추천"]
     )
     
     # 데이터 로드
     with st.spinner("데이터 로딩 중..."):
-        df_areas, categories = fetch_areas_and_categories()
+        df_areas, categories = ctx.resolve("areas_and_categories", fetch_areas_and_categories,
+                                           consumer="render_sidebar_for_recommand")
     
     selected_area = None
     selected_category = None
     
     if recommend_type == "상권명 기반 분석":
-        st.sidebar.subheader("📍 상권 선택")
+        st.subheader("📍 상권 선택")
 
-        df_areas["display_name"] = df_areas["area_name"] + " (" + df_areas["dong"] + ")"
-
-        selected_area = st.sidebar.selectbox(
+        # 검색 결과 상위 k 개만 선택지로 전달 (표시명은 색인에 미리 계산된 "상권명 (동)")
+        registry = get_area_registry()
+        results = _search_areas("recommend_area_query")
+        selected_area = st.selectbox(
             "추천받을 상권을 선택하세요:",
-            options=df_areas["area_name"].tolist(),
-        format_func=lambda x: f"{x} ({df_areas.loc[df_areas['area_name'] == x, 'dong'].values[0]})",
+            options=[r.code for r in results],
+            format_func=registry.label_of,
         )
         
-        if st.sidebar.button("🔍 상권 분석 시작", type="primary"):
+        if st.button("🔍 상권 분석 시작", type="primary", disabled=selected_area is None):
             st.session_state['analyze_area'] = True
             st.session_state['selected_area'] = selected_area
+            st.rerun()
     else:
-        st.sidebar.subheader("🍽️ 업종 선택")
-        selected_category = st.sidebar.selectbox(
+        st.subheader("🍽️ 업종 선택")
+        selected_category = st.selectbox(
             "추천받을 업종을 선택하세요:",
             options=categories,
         )
         
-        if st.sidebar.button("🔍 업종 분석 시작", type="primary"):
+        if st.button("🔍 업종 분석 시작", type="primary"):
             st.session_state['analyze_category'] = True
             st.session_state['selected_category'] = selected_category
+            st.rerun()
+
+    # 캐시/디버그 섹션
+    _render_debug_section()
     
     return recommend_type, selected_area, selected_category, df_areas, categories
 
 
 def _render_area_selector(df_areas):
     """상권 선택 UI를 렌더링합니다."""
-    # Area select (single) — "상권이름 (구 동)" 형식
-    df_areas = df_areas.copy()
-    df_areas["gu"] = df_areas["gu"].fillna("")
-    df_areas["dong"] = df_areas["dong"].fillna("")
-    df_areas["area_label"] = df_areas["area_name"] + " (" + df_areas["gu"] + " " + df_areas["dong"] + ")"
-
+    # Area select (single) — "상권이름 (구 동)" 형식, 검색 결과 상위 k 개만 선택지로 사용
+    registry = get_area_registry()
+    with st.sidebar:
+        results = _search_areas("area_query")
     sel_area_label = st.sidebar.selectbox(
         "상권 선택 (1개만 선택 가능)",
-        options=["(선택 안 함)"] + sorted(df_areas["area_label"].unique().tolist())
+        options=["(선택 안 함)"] + [r.full_label for r in results]
     )
 
     if sel_area_label == "(선택 안 함)":
         selected_area_codes = []
     else:
-        selected_area_codes = df_areas.loc[
-            df_areas["area_label"] == sel_area_label, "commercial_area_code"
-        ].astype(int).head(1).tolist()
+        selected_area_codes = [registry.by_label[sel_area_label].code]
     
     return selected_area_codes
 
 
+def _search_areas(key):
+    """
+    상권 검색 입력을 렌더링하고 검색 결과를 반환합니다.
+
+    Args:
+        key: 검색 입력 위젯 키
+
+    Returns:
+        list[AreaRecord]: 순위순 상권 레코드 (빈 검색어면 매출 상위 상권)
+    """
+    query = st.text_input(
+        "상권 검색",
+        key=key,
+        placeholder="상권명 · 구 · 동 또는 초성 (예: ㄱㄴ)",
+        help=f"검색어가 없으면 매출 상위 {AREA_SEARCH_TOP_K}개 상권을 보여줍니다.",
+    )
+    results = get_area_search_index().search(query, k=AREA_SEARCH_TOP_K)
+    if query and not results:
+        st.caption("검색 결과가 없습니다.")
+    return results
+
+
 def _render_category_selector(all_categories):
     """업종 선택 UI를 렌더링합니다."""
     cat_options = ["(전체 10종)"] + list(all_categories)
@@ -134,10 +195,69 @@ def _render_category_selector(all_categories):
 
 def _render_debug_section():
     """디버그/캐시 섹션을 렌더링합니다."""
-    with st.sidebar.expander("⚙️ 캐시 / 디버그"):
+    with st.expander("⚙️ 캐시 / 디버그"):
         if st.button("캐시 비우기 & 새로고침", use_container_width=True):
             st.cache_data.clear()
+            clear_reference_data()
+            get_sales_cube.clear()
+            # 매출/인구에서 만든 메모리 색인 (추천 점수, 유사 상권, 검색 동순위)
+            get_score_index.clear()
+            get_similarity_index.clear()
+            get_area_search_index.clear()
+            clear_demographic_aggregates()
+            # 행정동 배정과 완성된 단계구분도 HTML (get_choropleth_layer 는 cache_data 로 함께 비워짐)
+            get_area_dong_index.clear()
+            create_dong_choropleth.clear()
+            get_figure_cache().clear()
+            get_schema_stats().reset()
+            if RESULT_CACHE_ENABLED:
+                get_result_cache().clear()
             if hasattr(st, "rerun"):
                 st.rerun()
             else:
                 st.experimental_rerun()
+
+        # 공유 디스크 캐시 카운터 (모든 워커 프로세스 합계)
+        if RESULT_CACHE_ENABLED:
+            s = get_result_cache().stats()
+            st.caption(
+                f"공유 캐시 — hit {s['hits']:,} / miss {s['misses']:,} / eviction {s['evictions']:,} / "
+                f"채우기 대기 {s['fill_waits']:,} · "
+                f"{s['entries']:,}개, {s['bytes'] / 1024 / 1024:.1f}MB"
+            )
+
+        # 프로세스 공유 참조 데이터 (세션별 사본 없음)
+        ref = get_reference_data()
+        st.caption(f"공유 참조 데이터 — 테이블 {len(ref.tables)}개, {ref.nbytes / 1024 / 1024:.1f}MB (프로세스당 1벌)")
+        schema_stats = get_schema_stats()
+        st.caption(f"컴팩트 dtype 스키마 — 캐시 프레임 {len(schema_stats.frames):,}벌, "
+                   f"{schema_stats.saved_bytes / 1024 / 1024:.1f}MB 절감 (python -m data.schema report)")
+
+        # 차트 스펙 캐시 (입력이 같으면 figure 를 다시 만들지 않음)
+        fc = get_figure_cache().summary()
+        if fc["hits"] or fc["misses"]:
+            st.caption(
+                f"차트 캐시 — hit {fc['hits']:,} / miss {fc['misses']:,} · {fc['entries']:,}개, "
+                f"{fc['bytes'] / 1024 / 1024:.1f}MB · 빌드 {fc['saved_s'] * 1000:,.0f}ms 절약 "
+                f"(해시/복원 {fc['overhead_s'] * 1000:,.0f}ms)"
+            )
+
+        # 조회 함수별 누적 계측 (프로세스 단위, hit = DB 조회 없이 캐시에서 처리)
+        metrics = get_fetch_metrics()
+        table = metrics.to_frame()
+        if not table.empty:
+            st.caption(f"조회 계측 — 동시 SQL 최대 {metrics.db_inflight_peak}개")
+            st.dataframe(table, use_container_width=True, hide_index=True)
+            if st.button("계측 초기화", use_container_width=True):
+                metrics.reset()
+
+        # 최근 병렬 조회 타이밍 (합계 = 직렬 실행 시 예상 시간)
+        timings = st.session_state.get("fetch_timings", {})
+        for name, t in timings.items():
+            st.caption(f"**{name}** — wall {t['wall'] * 1000:.0f}ms / 합계 {t['sum'] * 1000:.0f}ms")
+            st.caption(", ".join(f"{k} {v * 1000:.0f}ms" for k, v in t["queries"].items()))
+
+        # 직전 rerun 의 데이터셋 요청 기록 (reused=True 는 중복 조회가 제거된 요청)
+        log = published_log()
+        if not log.empty:
+            st.dataframe(log, use_container_width=True, hide_index=True)
@@ -5,8 +5,6 @@ Utility functions for the dashboard
 
 import os
 import re
-import pandas as pd
-import geopandas as gpd
 import streamlit as st
 
 
@@ -28,30 +26,29 @@ def norm_txt(x: str) -> str:
     return s
 
 
-@st.cache_data(show_spinner=False)
-def load_geojson(path: str):
+@st.cache_resource(show_spinner=False)
+def _shared_boundaries(path: str, level: str):
+    from data.geo import load_boundaries
+    return load_boundaries(path, level)
+
+
+def load_geojson(path: str, level: str = "full"):
     """
-    GeoJSON 파일을 로드하고 전처리합니다.
+    전처리된 행정동 경계를 로드합니다. (data/geo.py 의 GeoParquet 캐시, 없으면 한 번 전처리)
+    경계는 프로세스당 한 벌을 공유하고 호출마다 독립된 사본을 반환합니다. (세션별 unpickle 사본 없음)
+    사본의 컬럼 배열은 새로 만들고 shapely 도형 객체(불변)만 공유하므로, 호출자가 값을 바꿔도 공유 경계는 그대로입니다.
+
+    컬럼은 data/geo.py ATTR_COLUMNS(adm_cd, adm_nm, gu, dong_geo, gu_n, dong_geo_n)와 geometry 뿐이며,
+    원본 GeoJSON 의 그 밖의 속성은 포함되지 않습니다.
     
     Args:
         path: GeoJSON 파일 경로
+        level: 경계 단순화 단계 ("full", "medium", "low")
         
     Returns:
         geopandas.GeoDataFrame: 전처리된 GeoDataFrame
     """
-    gdf = gpd.read_file(path)
-    gdf = gdf.copy()
-    gdf["adm_cd"] = gdf["adm_cd"].astype(str)
-    # split adm_nm → [시, 구, 동]
-    def split_gu_dong(adm_nm: str):
-        toks = str(adm_nm).split()
-        gu = toks[1] if len(toks) >= 2 else None
-        dong = toks[2] if len(toks) >= 3 else None
-        return pd.Series({"gu": gu, "dong_geo": dong})
-    gdf[["gu", "dong_geo"]] = gdf["adm_nm"].apply(split_gu_dong)
-    gdf["gu_n"] = gdf["gu"].apply(norm_txt)
-    gdf["dong_geo_n"] = gdf["dong_geo"].apply(norm_txt)
-    return gdf
+    return _shared_boundaries(path, level).copy(deep=True)
 
 
 def ensure_list(x, fallback_all):